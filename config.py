@@ -5,6 +5,7 @@ BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "Data"
 METADATA_DIR = DATA_DIR / "Metadata"
 VIDEOS_DIR = DATA_DIR / "Videos" # <-- NEW: Videos directory
+BACKUPS_DIR = DATA_DIR / "Backups"
 
 # Asset Paths
 ASSETS_DIR = BASE_DIR / "assets"
@@ -15,6 +16,7 @@ ICONS_DIR = ASSETS_DIR / "icons"
 DB_PATH = DATA_DIR / "database.db"
 SETTINGS_PATH = DATA_DIR / "settings.json"
 ACCOUNT_PATH = DATA_DIR / "account.json"
+HTTP_CACHE_PATH = DATA_DIR / "http_cache.json"
 DATABASE_ICON_PATH = ICONS_DIR / "database.ico"
 
 # YouTube Data API v3 Key
@@ -24,6 +26,7 @@ YOUTUBE_API_KEY = ""
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 METADATA_DIR.mkdir(parents=True, exist_ok=True)
 VIDEOS_DIR.mkdir(parents=True, exist_ok=True) # <-- NEW
+BACKUPS_DIR.mkdir(parents=True, exist_ok=True)
 ASSETS_DIR.mkdir(parents=True, exist_ok=True)
 FONTS_DIR.mkdir(parents=True, exist_ok=True)
 ICONS_DIR.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
@@ -6,6 +6,7 @@ import webbrowser
 from PIL import Image
 from config import METADATA_DIR, VIDEOS_DIR
 from gui.components.responsive_image import ResponsiveImage
+from gui.dialogs.description_history_dialog import DescriptionHistoryDialog
 
 
 def format_number(num):
@@ -23,11 +24,16 @@ def format_number(num):
 
 
 class ChannelCard(ttk.Frame):
-    def __init__(self, parent, channel_info, add_channel_service, has_icon_font, open_dir_callback, **kwargs):
+    def __init__(self, parent, channel_info, channel_stats, add_channel_service, has_icon_font, open_dir_callback,
+                 **kwargs):
         super().__init__(parent, bootstyle="light", **kwargs)
         self.add_channel_service = add_channel_service
+        self.channel_pk = channel_info.get("id")
         self.channel_name = channel_info.get("name")
+        self.channel_url = channel_info.get("url")
+        self.group_name = channel_info.get("group_name")
         self.sync_btn = None
+        self.task_buttons = []
 
         card = ttk.Frame(self, bootstyle="dark", padding=10)
         card.pack(fill=BOTH, expand=True, padx=1, pady=1)
@@ -35,7 +41,7 @@ class ChannelCard(ttk.Frame):
         card.columnconfigure(0, weight=2, uniform="card_cols")
         card.columnconfigure(1, weight=12, uniform="card_cols")
 
-        cid = channel_info.get("channel_id")
+        cid = channel_info.get("channel_id") or "Unknown_ID"
         handle = channel_info.get("handle", "")
         safe_handle = handle if handle.startswith('@') else f"@{handle}"
 
@@ -95,10 +101,13 @@ class ChannelCard(ttk.Frame):
         url = channel_info.get("url", "")
         subs_formatted = format_number(channel_info.get("follower_count", 0))
 
-        videos = add_channel_service.get_videos_by_channel(self.channel_name)
-        v_count = sum(1 for v in videos if v.get("video_type") == "Videos")
-        s_count = sum(1 for v in videos if v.get("video_type") == "Shorts")
-        l_count = sum(1 for v in videos if v.get("video_type") == "Lives")
+        # Counts come from the trigger-maintained channel_stats row instead of loading every video
+        v_count = channel_stats.get("video_count", 0)
+        s_count = channel_stats.get("short_count", 0)
+        l_count = channel_stats.get("live_count", 0)
+        downloaded_count = channel_stats.get("downloaded_count", 0)
+        lost_count = channel_stats.get("lost_count", 0)
+        size_gb = channel_stats.get("total_bytes", 0) / (1024 ** 3)
 
         creation_date = channel_info.get("creation_date") or ""
         date_str = "Unknown"
@@ -141,6 +150,8 @@ class ChannelCard(ttk.Frame):
         ttk.Label(stats_frame, text=f"{subs_formatted} subs • {v_count} Videos • {s_count} Shorts • {l_count} Lives",
                   font=("Segoe UI", 9), bootstyle="light").pack(anchor=W, pady=(2, 0))
         ttk.Label(stats_frame, text=f"Since {date_str} • {country} • {views_formatted} views",
+                  font=("Segoe UI", 8), bootstyle="secondary").pack(anchor=W)
+        ttk.Label(stats_frame, text=f"{downloaded_count} downloaded ({size_gb:.1f} GB) • {lost_count} lost",
                   font=("Segoe UI", 8), bootstyle="secondary").pack(anchor=W, pady=(0, 10))
 
         btn_frame = ttk.Frame(stats_frame, bootstyle="dark")
@@ -153,7 +164,13 @@ class ChannelCard(ttk.Frame):
                        command=lambda p=local_videos_path: open_dir_callback(p)).pack(side=LEFT, padx=(0, 5))
             self.sync_btn = ttk.Button(btn_frame, text="sync", style="Icon.TButton", bootstyle="outline-success",
                                        command=self.start_sync)
-            self.sync_btn.pack(side=LEFT)
+            self.sync_btn.pack(side=LEFT, padx=(0, 5))
+            quick_btn = ttk.Button(btn_frame, text="update", style="Icon.TButton", bootstyle="outline-info",
+                                   command=self.start_quick_refresh)
+            quick_btn.pack(side=LEFT, padx=(0, 5))
+            full_btn = ttk.Button(btn_frame, text="refresh", style="Icon.TButton", bootstyle="outline-warning",
+                                  command=self.start_full_refresh)
+            full_btn.pack(side=LEFT)
         else:
             ttk.Button(btn_frame, text="Web", bootstyle="outline-light", command=lambda u=url: webbrowser.open(u)).pack(
                 side=LEFT, padx=(0, 5))
@@ -161,14 +178,28 @@ class ChannelCard(ttk.Frame):
                        command=lambda p=local_videos_path: open_dir_callback(p)).pack(side=LEFT, padx=(0, 5))
             self.sync_btn = ttk.Button(btn_frame, text="Update Metadata", bootstyle="outline-success",
                                        command=self.start_sync)
-            self.sync_btn.pack(side=LEFT)
+            self.sync_btn.pack(side=LEFT, padx=(0, 5))
+            quick_btn = ttk.Button(btn_frame, text="Quick Refresh", bootstyle="outline-info",
+                                   command=self.start_quick_refresh)
+            quick_btn.pack(side=LEFT, padx=(0, 5))
+            full_btn = ttk.Button(btn_frame, text="Full Refresh", bootstyle="outline-warning",
+                                  command=self.start_full_refresh)
+            full_btn.pack(side=LEFT)
+        self.task_buttons = [self.sync_btn, quick_btn, full_btn]
 
         # ====== COLUMN 2: DESCRIPTION ======
         desc_frame = ttk.Frame(content_frame, bootstyle="dark")
         desc_frame.grid(row=0, column=1, sticky="nsew", padx=(10, 0))
 
-        ttk.Label(desc_frame, text="Description:", font=("Segoe UI", 9, "bold"), bootstyle="light").pack(anchor=W,
-                                                                                                         pady=(0, 2))
+        desc_header = ttk.Frame(desc_frame, bootstyle="dark")
+        desc_header.pack(fill=X, pady=(0, 2))
+        ttk.Label(desc_header, text="Description:", font=("Segoe UI", 9, "bold"), bootstyle="light").pack(side=LEFT)
+        if has_icon_font:
+            ttk.Button(desc_header, text="history", style="Icon.TButton", bootstyle="outline-secondary",
+                       command=self.show_description_history).pack(side=RIGHT)
+        else:
+            ttk.Button(desc_header, text="History", bootstyle="outline-secondary",
+                       command=self.show_description_history).pack(side=RIGHT)
 
         desc_str = channel_info.get("description") or "No description available."
         desc_text = ttk.Text(desc_frame, height=4, wrap="word", font=("Segoe UI", 8), background="#222",
@@ -177,12 +208,32 @@ class ChannelCard(ttk.Frame):
         desc_text.insert("1.0", desc_str)
         desc_text.configure(state="disabled")
 
+    def show_description_history(self):
+        versions = self.add_channel_service.get_description_history(self.channel_pk)
+        if not versions:
+            Messagebox.show_info("The description has not changed since the channel was added.",
+                                 "Description History")
+            return
+        DescriptionHistoryDialog(self.winfo_toplevel(), self.channel_name, versions)
+
     def start_sync(self):
-        self.sync_btn.config(state="disabled")
-        threading.Thread(target=self._run_sync, daemon=True).start()
+        self._start_task(lambda: self.add_channel_service.update_channel_metadata(self.channel_pk))
+
+    def start_quick_refresh(self):
+        """Only looks for videos newer than the ones already in the library."""
+        self._start_task(lambda: self.add_channel_service.quick_refresh_channel(self.channel_pk))
+
+    def start_full_refresh(self):
+        """Re-enumerates every video on the channel."""
+        self._start_task(lambda: self.add_channel_service.fetch_channel_info(self.channel_url, self.group_name))
+
+    def _start_task(self, task):
+        for btn in self.task_buttons:
+            btn.config(state="disabled")
+        threading.Thread(target=self._run_task, args=(task,), daemon=True).start()
 
-    def _run_sync(self):
-        success, message = self.add_channel_service.update_channel_metadata(self.channel_name)
+    def _run_task(self, task):
+        success, message = task()
         # Safely interact with Tkinter UI from thread via .after
         self.after(0, self._finish_sync, success, message)  # type: ignore
 
@@ -193,5 +244,6 @@ class ChannelCard(ttk.Frame):
             self.winfo_toplevel().event_generate("<<DataUpdated>>")
         else:
             Messagebox.show_error(message, "Sync Failed")
-            if self.sync_btn and self.sync_btn.winfo_exists():
-                self.sync_btn.config(state="normal")
\ No newline at end of file
+            for btn in self.task_buttons:
+                if btn.winfo_exists():
+                    btn.config(state="normal")
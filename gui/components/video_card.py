@@ -2,10 +2,12 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from pathlib import Path
 import webbrowser
+from services.directory_index import DirectoryIndex
 
 
 class VideoCard(ttk.Frame):
-    def __init__(self, parent, video, thumb_dir, has_icon_font, image_queue, play_cb, reveal_cb, **kwargs):
+    def __init__(self, parent, video, thumb_dir, has_icon_font, image_queue, play_cb, reveal_cb, history_cb=None,
+                 **kwargs):
         super().__init__(parent, bootstyle="light", **kwargs)
 
         card = ttk.Frame(self, padding=10, bootstyle="dark")
@@ -23,11 +25,13 @@ class VideoCard(ttk.Frame):
             candidates.append(Path(f"{filepath_str}.webp"))
             candidates.append(Path(f"{filepath_str}.jpg"))
 
-        candidates.append(thumb_dir / f"{video['video_id']}.webp")
-        candidates.append(thumb_dir / f"{video['video_id']}.jpg")
+        # Library-wide search results span several channels, so there is no single thumbnail folder
+        if thumb_dir:
+            candidates.append(thumb_dir / f"{video['video_id']}.webp")
+            candidates.append(thumb_dir / f"{video['video_id']}.jpg")
 
         for cand in candidates:
-            if cand.exists():
+            if DirectoryIndex.exists(cand):
                 thumb_path = cand
                 break
 
@@ -74,6 +78,8 @@ class VideoCard(ttk.Frame):
 
             if is_lost == 1:
                 online_status_label.config(text="cloud_alert", bootstyle="danger")
+            elif is_lost == 0 and video.get("is_restricted"):
+                online_status_label.config(text="lock", bootstyle="warning")
             elif is_lost == 0:
                 online_status_label.config(text="cloud_done", bootstyle="success")
             else:
@@ -81,6 +87,8 @@ class VideoCard(ttk.Frame):
         else:
             if is_lost == 1:
                 online_status_label.config(text="[Lost]", bootstyle="danger")
+            elif is_lost == 0 and video.get("is_restricted"):
+                online_status_label.config(text="[Restricted]", bootstyle="warning")
             elif is_lost == 0:
                 online_status_label.config(text="[Online]", bootstyle="success")
             else:
@@ -97,6 +105,9 @@ class VideoCard(ttk.Frame):
                        command=lambda p=filepath_str: reveal_cb(p)).pack(side=LEFT, padx=5)
             ttk.Button(btn_row, text="play_arrow", style="Icon.success.Outline.TButton",
                        command=lambda p=filepath_str: play_cb(p)).pack(side=LEFT, padx=5)
+            if history_cb:
+                ttk.Button(btn_row, text="history", style="Icon.secondary.Outline.TButton",
+                           command=lambda v=video: history_cb(v)).pack(side=LEFT, padx=5)
         else:
             ttk.Button(btn_row, text="Browser", bootstyle="info-outline",
                        command=lambda u=video.get("url"): webbrowser.open(u) if u else None).pack(side=LEFT,
@@ -104,4 +115,7 @@ class VideoCard(ttk.Frame):
             ttk.Button(btn_row, text="Folder", bootstyle="warning-outline",
                        command=lambda p=filepath_str: reveal_cb(p)).pack(side=LEFT, padx=5)
             ttk.Button(btn_row, text="Play", bootstyle="success-outline",
-                       command=lambda p=filepath_str: play_cb(p)).pack(side=LEFT, padx=5)
\ No newline at end of file
+                       command=lambda p=filepath_str: play_cb(p)).pack(side=LEFT, padx=5)
+            if history_cb:
+                ttk.Button(btn_row, text="History", bootstyle="secondary-outline",
+                           command=lambda v=video: history_cb(v)).pack(side=LEFT, padx=5)
\ No newline at end of file
@@ -0,0 +1,170 @@
+import threading
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from ttkbootstrap.dialogs import Messagebox
+from tkinter import filedialog, TclError
+
+STATUS_STYLES = {"pending": "secondary", "running": "info", "done": "success", "failed": "danger"}
+
+
+class BulkImportDialog(ttk.Toplevel):
+    """
+    Collects channels from a pasted list, an OPML / Takeout CSV file or the My Account subscriptions, queues them
+    for a group and shows the per-channel import status. Closing the dialog does not stop a running import.
+    """
+
+    def __init__(self, parent, group_names, group_name, bulk_import_service, account_service):
+        super().__init__(parent)
+        self.bulk_import = bulk_import_service
+        self.account = account_service
+
+        self.title("Bulk Import Channels")
+        self.geometry("760x620")
+        self.transient(parent)
+
+        self.group_var = ttk.StringVar(value=group_name or (group_names[0] if group_names else ""))
+        self.workers_var = ttk.IntVar(value=4)
+        self.url_text = None
+        self.tree = None
+        self.summary_label = None
+        self.start_btn = None
+        self._poll_job = None
+        self._was_running = False
+
+        container = ttk.Frame(self, padding=15)
+        container.pack(fill=BOTH, expand=True)
+
+        # --- Sources ---
+        top = ttk.Frame(container)
+        top.pack(fill=X)
+        ttk.Label(top, text="Group:").pack(side=LEFT)
+        ttk.Combobox(top, textvariable=self.group_var, values=group_names, state="readonly", width=20).pack(
+            side=LEFT, padx=(5, 15))
+        ttk.Button(top, text="Load OPML / CSV...", bootstyle="secondary-outline",
+                   command=self.load_file).pack(side=LEFT, padx=(0, 5))
+        ttk.Button(top, text="My Account Subscriptions", bootstyle="secondary-outline",
+                   command=self.load_account_subscriptions).pack(side=LEFT)
+
+        ttk.Label(container, text="Channel URLs, @handles or channel IDs (one per line):").pack(anchor=W,
+                                                                                                pady=(10, 2))
+        self.url_text = ttk.Text(container, height=6, wrap="none")
+        self.url_text.pack(fill=X)
+
+        actions = ttk.Frame(container)
+        actions.pack(fill=X, pady=10)
+        ttk.Button(actions, text="Add to Queue", bootstyle="info-outline", command=self.queue_pasted).pack(side=LEFT)
+        ttk.Label(actions, text="Parallel imports:").pack(side=LEFT, padx=(15, 5))
+        ttk.Spinbox(actions, from_=1, to=8, textvariable=self.workers_var, width=4).pack(side=LEFT)
+        self.start_btn = ttk.Button(actions, text="Start Import", bootstyle="success", command=self.start_import)
+        self.start_btn.pack(side=RIGHT)
+        ttk.Button(actions, text="Stop", bootstyle="danger-outline", command=self.bulk_import.stop).pack(
+            side=RIGHT, padx=5)
+        ttk.Button(actions, text="Clear Finished", bootstyle="secondary-outline",
+                   command=self.clear_finished).pack(side=RIGHT)
+
+        # --- Queue ---
+        columns = ("channel", "group", "status", "message")
+        self.tree = ttk.Treeview(container, columns=columns, show="headings", height=12)
+        for col, width in zip(columns, (260, 100, 80, 280)):
+            self.tree.heading(col, text=col.title(), anchor=W)
+            self.tree.column(col, width=width, anchor=W, stretch=col in ("channel", "message"))
+        for status, style in STATUS_STYLES.items():
+            self.tree.tag_configure(status, foreground=ttk.Style.get_instance().colors.get(style))
+        self.tree.pack(fill=BOTH, expand=True)
+
+        self.summary_label = ttk.Label(container, text="", font=("Segoe UI", 8, "italic"), bootstyle="secondary")
+        self.summary_label.pack(anchor=W, pady=(5, 0))
+
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.refresh()
+
+    # --- Sources ---
+    def _queue(self, entries, source):
+        group = self.group_var.get()
+        if not group:
+            Messagebox.show_error("Select a group first", "Error")
+            return
+        if not entries:
+            Messagebox.show_warning("No channels found in the input.", "Nothing to import")
+            return
+        added = self.bulk_import.enqueue(group, entries, source)
+        self.refresh()
+        self.summary_label.config(text=f"{added} of {len(entries)} channels queued for '{group}'.")
+
+    def queue_pasted(self):
+        entries = self.bulk_import.parse_url_list(self.url_text.get("1.0", END))
+        self._queue(entries, "list")
+        self.url_text.delete("1.0", END)
+
+    def load_file(self):
+        path = filedialog.askopenfilename(
+            parent=self,
+            filetypes=[("Subscription exports", "*.opml *.xml *.csv *.txt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            entries = self.bulk_import.parse_file(path)
+        except Exception as e:
+            Messagebox.show_error(f"Could not read {path}:\n{e}", "Import Failed")
+            return
+        self._queue(entries, "file")
+
+    def load_account_subscriptions(self):
+        channel_id = self.account.get("channel_id")
+
+        def worker():
+            try:
+                entries = self.bulk_import.fetch_account_subscriptions(channel_id)
+            except ValueError as e:
+                self.after(0, lambda: Messagebox.show_error(str(e), "Import Failed"))  # type: ignore
+                return
+            self.after(0, lambda: self._queue(entries, "account"))  # type: ignore
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    # --- Import ---
+    def start_import(self):
+        try:
+            workers = max(1, min(8, self.workers_var.get()))
+        except TclError:
+            workers = 4
+        if self.bulk_import.start(max_workers=workers):
+            self.refresh()
+
+    def clear_finished(self):
+        self.bulk_import.clear_finished()
+        self.refresh()
+
+    def refresh(self):
+        """Redraws the queue from the database, polling while an import is running."""
+        self._poll_job = None
+        if not self.winfo_exists():
+            return
+
+        self.tree.delete(*self.tree.get_children())
+        for item in self.bulk_import.get_items():
+            self.tree.insert("", "end", values=(
+                item["title"] or item["url"], item["group_name"], item["status"], item["message"] or ""
+            ), tags=(item["status"],))
+
+        counts = self.bulk_import.get_counts()
+        running = self.bulk_import.is_running()
+        pending = counts.get("pending", 0) + counts.get("running", 0)
+        self.start_btn.config(state="disabled" if running else "normal")
+        self.summary_label.config(text=(
+            f"{counts.get('done', 0)} done, {counts.get('failed', 0)} failed, {pending} waiting"
+            + ("   (importing...)" if running else "")
+        ))
+
+        if running:
+            self._poll_job = self.after(1000, self.refresh)
+        elif self._was_running:
+            # Let the subscriptions tab pick up the imported channels
+            self.master.event_generate("<<DataUpdated>>")
+        self._was_running = running
+
+    def on_close(self):
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+        self.destroy()
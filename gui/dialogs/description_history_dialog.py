@@ -0,0 +1,47 @@
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+
+class DescriptionHistoryDialog(ttk.Toplevel):
+    """Lists the stored versions of a channel or video description and shows the text of the selected one."""
+
+    def __init__(self, parent, name, versions):
+        super().__init__(parent)
+        self.versions = {str(version["version"]): version for version in versions}
+
+        self.title(f"Description History - {name}")
+        self.geometry("760x420")
+        self.transient(parent)
+
+        container = ttk.Frame(self, padding=15)
+        container.pack(fill=BOTH, expand=True)
+
+        columns = ("version", "recorded")
+        self.tree = ttk.Treeview(container, columns=columns, show="headings", selectmode="browse", width=220)
+        self.tree.heading("version", text="Version", anchor=W)
+        self.tree.heading("recorded", text="Recorded", anchor=W)
+        self.tree.column("version", width=60, stretch=False, anchor=W)
+        self.tree.column("recorded", width=160, anchor=W)
+        self.tree.pack(side=LEFT, fill=Y)
+        self.tree.bind("<<TreeviewSelect>>", self.on_version_selected)
+
+        self.text = ttk.Text(container, wrap="word", font=("Segoe UI", 9))
+        self.text.pack(side=LEFT, fill=BOTH, expand=True, padx=(10, 0))
+
+        # Newest first, that is the one people usually want to compare against
+        for version in reversed(versions):
+            recorded = (version.get("recorded_at") or "Unknown")[:19].replace("T", " ")
+            self.tree.insert("", "end", iid=str(version["version"]), values=(version["version"], recorded))
+
+        children = self.tree.get_children()
+        if children:
+            self.tree.selection_set(children[0])
+
+    def on_version_selected(self, _event=None):
+        selected = self.tree.selection()
+        if not selected:
+            return
+        self.text.configure(state="normal")
+        self.text.delete("1.0", END)
+        self.text.insert("1.0", self.versions[selected[0]].get("text") or "")
+        self.text.configure(state="disabled")
@@ -0,0 +1,125 @@
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from tkinter import TclError
+
+ALL_GROUPS = "All groups"
+
+
+class SyncDialog(ttk.Toplevel):
+    """
+    Syncs descriptions and playlists for every channel or one group and shows the combined progress and the
+    channels that failed. An unfinished sync is picked up again with Resume, also after restarting the app.
+    """
+
+    def __init__(self, parent, group_names, group_name, sync_service):
+        super().__init__(parent)
+        self.sync = sync_service
+
+        self.title("Sync Channels")
+        self.geometry("620x480")
+        self.transient(parent)
+
+        self.group_var = ttk.StringVar(value=group_name or ALL_GROUPS)
+        self.workers_var = ttk.IntVar(value=3)
+        self.progress = None
+        self.summary_label = None
+        self.start_btn = None
+        self.resume_btn = None
+        self.retry_btn = None
+        self.tree = None
+        self._poll_job = None
+        self._was_running = False
+
+        container = ttk.Frame(self, padding=15)
+        container.pack(fill=BOTH, expand=True)
+
+        top = ttk.Frame(container)
+        top.pack(fill=X)
+        ttk.Label(top, text="Channels:").pack(side=LEFT)
+        ttk.Combobox(top, textvariable=self.group_var, values=[ALL_GROUPS] + list(group_names), state="readonly",
+                     width=20).pack(side=LEFT, padx=(5, 15))
+        ttk.Label(top, text="Parallel:").pack(side=LEFT, padx=(0, 5))
+        ttk.Spinbox(top, from_=1, to=8, textvariable=self.workers_var, width=4).pack(side=LEFT)
+
+        actions = ttk.Frame(container)
+        actions.pack(fill=X, pady=10)
+        self.start_btn = ttk.Button(actions, text="Start New Sync", bootstyle="success", command=self.start_sync)
+        self.start_btn.pack(side=LEFT)
+        self.resume_btn = ttk.Button(actions, text="Resume", bootstyle="info-outline", command=self.resume_sync)
+        self.resume_btn.pack(side=LEFT, padx=5)
+        self.retry_btn = ttk.Button(actions, text="Retry Failed", bootstyle="warning-outline", command=self.retry_failed)
+        self.retry_btn.pack(side=LEFT)
+        ttk.Button(actions, text="Stop", bootstyle="danger-outline", command=self.sync.stop).pack(side=RIGHT)
+
+        self.progress = ttk.Progressbar(container, mode="determinate", bootstyle="success-striped")
+        self.progress.pack(fill=X)
+        self.summary_label = ttk.Label(container, text="", font=("Segoe UI", 8, "italic"), bootstyle="secondary")
+        self.summary_label.pack(anchor=W, pady=(5, 10))
+
+        ttk.Label(container, text="Failed channels:", font=("Segoe UI", 9, "bold")).pack(anchor=W)
+        columns = ("channel", "attempts", "message")
+        self.tree = ttk.Treeview(container, columns=columns, show="headings", height=10)
+        for col, width in zip(columns, (180, 70, 320)):
+            self.tree.heading(col, text=col.title(), anchor=W)
+            self.tree.column(col, width=width, anchor=W, stretch=col != "attempts")
+        self.tree.pack(fill=BOTH, expand=True)
+
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.refresh()
+
+    def _workers(self):
+        try:
+            return max(1, min(8, self.workers_var.get()))
+        except TclError:
+            return 3
+
+    def start_sync(self):
+        group = self.group_var.get()
+        if self.sync.is_running():
+            return
+        self.sync.prepare(None if group == ALL_GROUPS else group)
+        self.resume_sync()
+
+    def resume_sync(self):
+        if self.sync.start(max_workers=self._workers()):
+            self.refresh()
+
+    def retry_failed(self):
+        if self.sync.retry_failed():
+            self.resume_sync()
+
+    def refresh(self):
+        """Redraws the progress from the sync checkpoint, polling while a sync is running."""
+        self._poll_job = None
+        if not self.winfo_exists():
+            return
+
+        counts = self.sync.get_counts()
+        running = self.sync.is_running()
+        total = sum(counts.values())
+        finished = counts.get("done", 0) + counts.get("failed", 0)
+        pending = counts.get("pending", 0) + counts.get("running", 0)
+
+        self.progress.config(maximum=max(total, 1), value=finished)
+        self.summary_label.config(text=(
+            f"{counts.get('done', 0)} of {total} synced, {counts.get('failed', 0)} failed, {pending} waiting"
+            + ("   (syncing...)" if running else "")
+        ) if total else "No sync started yet.")
+        self.start_btn.config(state="disabled" if running else "normal")
+        self.resume_btn.config(state="normal" if pending and not running else "disabled")
+        self.retry_btn.config(state="normal" if counts.get("failed") and not running else "disabled")
+
+        self.tree.delete(*self.tree.get_children())
+        for failure in self.sync.get_failures():
+            self.tree.insert("", "end", values=(failure["name"], failure["attempts"], failure["message"] or ""))
+
+        if running:
+            self._poll_job = self.after(1000, self.refresh)
+        elif self._was_running:
+            self.master.event_generate("<<DataUpdated>>")
+        self._was_running = running
+
+    def on_close(self):
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+        self.destroy()
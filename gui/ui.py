@@ -107,7 +107,8 @@ class MainUI:
         self.views["settings"] = SettingsView(
             self.content,
             settings_service=self.services.settings,
-            theme_changer=self.services.change_theme
+            theme_changer=self.services.change_theme,
+            database_service=self.services.database
         )
 
         for view in self.views.values():
@@ -4,7 +4,9 @@ class DashboardView(ttk.Notebook):
     def __init__(self, parent, services):
         super().__init__(parent)
         self.services = services
+        self.summary_label = None
         self.build()
+        self.winfo_toplevel().bind("<<DataUpdated>>", self.refresh_totals, add="+")
 
     def build(self):
         overview = ttk.Frame(self)
@@ -14,4 +16,20 @@ class DashboardView(ttk.Notebook):
         self.add(details, text="Details")
 
         ttk.Label(overview, text="Library Overview").pack(pady=20)
-        ttk.Label(details, text="Library Details").pack(pady=20)
\ No newline at end of file
+        self.summary_label = ttk.Label(overview, text="", justify="center")
+        self.summary_label.pack()
+        ttk.Label(details, text="Library Details").pack(pady=20)
+        self.refresh_totals()
+
+    def refresh_totals(self, _event=None):
+        # Read from the trigger-maintained channel_stats table, so this stays instant for any library size
+        totals = self.services.library.get_library_totals()
+        hours = totals["total_duration"] // 3600
+        size_gb = totals["total_bytes"] / (1024 ** 3)
+        summary = (
+            f"{totals['channel_count']} channels • {totals['video_count']} Videos • {totals['short_count']} Shorts • "
+            f"{totals['live_count']} Lives\n"
+            f"{totals['downloaded_count']} downloaded ({size_gb:.1f} GB) • {totals['metadata_count']} with metadata • "
+            f"{totals['lost_count']} lost • {hours:,} hours of content"
+        )
+        self.summary_label.config(text=summary)
\ No newline at end of file
@@ -13,7 +13,7 @@ class DatabaseView(ttk.Notebook):
 
     def build(self):
         # FIXED: Changed self.services.add_channel to self.services.add_channel_service
-        self.tree_tab = DbTreeviewTab(self, self.services.add_channel_service)
+        self.tree_tab = DbTreeviewTab(self, self.services.add_channel_service, self.services.library)
         self.manage_tab = ttk.Frame(self)
 
         # Add tabs to the notebook
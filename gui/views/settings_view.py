@@ -1,12 +1,15 @@
+import sqlite3
+import threading
 import ttkbootstrap as ttk
 from ttkbootstrap.dialogs import Messagebox
 
 
 class SettingsView(ttk.Notebook):
-    def __init__(self, parent, settings_service, theme_changer):
+    def __init__(self, parent, settings_service, theme_changer, database_service):
         super().__init__(parent)
 
         self.settings = settings_service
+        self.database_service = database_service
         self.change_theme_func = theme_changer
         self.style = ttk.Style.get_instance()
 
@@ -24,10 +27,26 @@ class SettingsView(ttk.Notebook):
         self.theme_var = None
         self.api_var = None
         self.quota_label = None
+        self.liveness_workers_var = None
+        self.liveness_timeout_var = None
+        self.liveness_budget_var = None
 
         self.ig_user_var = None  # NEW
         self.ig_pass_var = None  # NEW
 
+        self.profiling_var = None
+        self.slow_ms_var = None
+        self.top_tree = None
+        self.slow_tree = None
+        self.tables_tree = None
+        self.db_stats_label = None
+        self.maintenance_label = None
+        self.maintenance_progress = None
+        self.maintenance_buttons = []
+        self.wal_limit_var = None
+        self.backup_hours_var = None
+        self.backup_keep_var = None
+
         self.close_to_tray_var = ttk.BooleanVar(
             value=self.settings.get_close_to_tray()
         )
@@ -110,9 +129,39 @@ class SettingsView(ttk.Notebook):
         )
         self.quota_label.pack(anchor="w", padx=22, pady=(0, 5))
 
+        ttk.Label(self.ytdlp, text="Online Status Check:").pack(anchor="w", padx=20, pady=(15, 0))
+        liveness_frame = ttk.Frame(self.ytdlp)
+        liveness_frame.pack(fill="x", padx=20, pady=5)
+
+        ttk.Label(liveness_frame, text="Parallel requests:").pack(side="left")
+        self.liveness_workers_var = ttk.StringVar(value=str(self.settings.get_liveness_workers()))
+        ttk.Spinbox(liveness_frame, from_=1, to=32, textvariable=self.liveness_workers_var, width=5).pack(
+            side="left", padx=(5, 15))
+        ttk.Label(liveness_frame, text="Timeout (s):").pack(side="left")
+        self.liveness_timeout_var = ttk.StringVar(value=str(self.settings.get_liveness_timeout()))
+        ttk.Spinbox(liveness_frame, from_=2, to=60, textvariable=self.liveness_timeout_var, width=5).pack(
+            side="left", padx=(5, 15))
+        # Requests per hour for the library-wide background check, 0 turns it off
+        ttk.Label(liveness_frame, text="Background requests/hour:").pack(side="left")
+        self.liveness_budget_var = ttk.StringVar(value=str(self.settings.get_liveness_hourly_budget()))
+        ttk.Spinbox(liveness_frame, from_=0, to=10000, increment=100, textvariable=self.liveness_budget_var,
+                    width=7).pack(side="left", padx=(5, 15))
+        ttk.Button(liveness_frame, text="Save", bootstyle="success", command=self.on_liveness_saved).pack(side="left")
+
     def on_api_key_saved(self):
         self.settings.set_youtube_api_key(self.api_var.get())
-        Messagebox.show_info("Settings Saved", "YouTube API Key saved successfully.")
+        Messagebox.show_info("YouTube API Key saved successfully.", "Settings Saved")
+
+    def on_liveness_saved(self):
+        try:
+            workers = max(1, min(32, int(self.liveness_workers_var.get())))
+            timeout = max(2, min(60, int(self.liveness_timeout_var.get())))
+            hourly_budget = max(0, int(self.liveness_budget_var.get()))
+        except ValueError:
+            Messagebox.show_error("Online check options must be whole numbers.", "Invalid value")
+            return
+        self.settings.set_liveness_options(workers, timeout, hourly_budget)
+        Messagebox.show_info("Online status check options saved.", "Settings Saved")
 
     # --- NEW: Instaloader Tab ---
     def build_instaloader_tab(self):
@@ -141,7 +190,208 @@ class SettingsView(ttk.Notebook):
     def on_ig_creds_saved(self):
         self.settings.set_ig_username(self.ig_user_var.get())
         self.settings.set_ig_password(self.ig_pass_var.get())
-        Messagebox.show_info("Settings Saved", "Instagram credentials saved successfully.")
+        Messagebox.show_info("Instagram credentials saved successfully.", "Settings Saved")
 
     def build_database_tab(self):
-        pass
\ No newline at end of file
+        self.build_maintenance_section()
+
+        # --- Profiler controls ---
+        controls = ttk.Frame(self.database)
+        controls.pack(fill="x", padx=20, pady=(10, 5))
+
+        self.profiling_var = ttk.BooleanVar(value=self.database_service.is_profiling())
+        ttk.Checkbutton(
+            controls, text="Profile queries", variable=self.profiling_var, command=self.on_profiling_change
+        ).pack(side="left")
+
+        ttk.Label(controls, text="Slow query threshold (ms):").pack(side="left", padx=(20, 5))
+        self.slow_ms_var = ttk.StringVar(value=f"{self.database_service.get_slow_query_ms():g}")
+        slow_entry = ttk.Entry(controls, textvariable=self.slow_ms_var, width=8)
+        slow_entry.pack(side="left")
+        slow_entry.bind("<Return>", lambda e: self.on_profiling_change())
+
+        ttk.Button(controls, text="Refresh", bootstyle="secondary-outline",
+                   command=self.refresh_database_tab).pack(side="right")
+        ttk.Button(controls, text="Reset", bootstyle="danger-outline",
+                   command=self.on_profiler_reset).pack(side="right", padx=5)
+
+        self.db_stats_label = ttk.Label(self.database, text="", font=("Segoe UI", 8, "italic"), bootstyle="secondary")
+        self.db_stats_label.pack(anchor="w", padx=22, pady=(0, 5))
+
+        # --- Top statements by total time ---
+        ttk.Label(self.database, text="Top statements", font=("Segoe UI", 10, "bold")).pack(anchor="w", padx=20)
+        self.top_tree = self._build_stats_tree(
+            (("sql", "Statement", 420), ("calls", "Calls", 60), ("total_ms", "Total ms", 80),
+             ("avg_ms", "Avg ms", 70), ("max_ms", "Max ms", 70), ("rows", "Rows", 70)),
+            height=6
+        )
+
+        # --- Slow query log ---
+        ttk.Label(self.database, text="Slow queries", font=("Segoe UI", 10, "bold")).pack(anchor="w", padx=20)
+        self.slow_tree = self._build_stats_tree(
+            (("timestamp", "When", 130), ("elapsed_ms", "ms", 60), ("rows", "Rows", 60),
+             ("sql", "Statement", 300), ("plan", "Query plan", 300)),
+            height=6
+        )
+
+        # --- Table sizes ---
+        ttk.Label(self.database, text="Tables", font=("Segoe UI", 10, "bold")).pack(anchor="w", padx=20)
+        self.tables_tree = self._build_stats_tree(
+            (("name", "Table", 200), ("rows", "Rows", 100), ("size", "Size", 100)),
+            height=5
+        )
+
+        self.refresh_database_tab()
+
+    def build_maintenance_section(self):
+        lf = ttk.Labelframe(self.database, text="Maintenance", padding=10)
+        lf.pack(fill="x", padx=20, pady=(10, 5))
+
+        options = self.database_service.get_maintenance_settings()
+        self.wal_limit_var = ttk.StringVar(value=str(options["wal_limit_mb"]))
+        self.backup_hours_var = ttk.StringVar(value=str(options["backup_hours"]))
+        self.backup_keep_var = ttk.StringVar(value=str(options["backup_keep"]))
+
+        options_frame = ttk.Frame(lf)
+        options_frame.pack(fill="x")
+        for text, var in (("Checkpoint WAL above (MB):", self.wal_limit_var),
+                          ("Backup every (hours, 0 = off):", self.backup_hours_var),
+                          ("Backups to keep:", self.backup_keep_var)):
+            ttk.Label(options_frame, text=text).pack(side="left", padx=(0, 5))
+            ttk.Entry(options_frame, textvariable=var, width=6).pack(side="left", padx=(0, 15))
+        ttk.Button(options_frame, text="Save", bootstyle="success",
+                   command=self.on_maintenance_saved).pack(side="left")
+
+        actions = ttk.Frame(lf)
+        actions.pack(fill="x", pady=(10, 0))
+        for text, task, with_progress in (("Backup now", self.database_service.backup, True),
+                                          ("Checkpoint WAL", self.database_service.checkpoint, False),
+                                          ("Optimize", self.database_service.optimize, False),
+                                          ("Vacuum", self.database_service.vacuum, False)):
+            btn = ttk.Button(actions, text=text, bootstyle="secondary-outline",
+                             command=lambda n=text, t=task, p=with_progress: self.run_maintenance_task(n, t, p))
+            btn.pack(side="left", padx=(0, 5))
+            self.maintenance_buttons.append(btn)
+
+        self.maintenance_progress = ttk.Progressbar(actions, mode="determinate", bootstyle="success-striped")
+        self.maintenance_progress.pack(side="left", fill="x", expand=True, padx=(10, 0))
+
+        self.maintenance_label = ttk.Label(lf, text="", font=("Segoe UI", 8, "italic"), bootstyle="secondary")
+        self.maintenance_label.pack(anchor="w", pady=(5, 0))
+
+    def on_maintenance_saved(self):
+        try:
+            wal_limit = int(self.wal_limit_var.get())
+            backup_hours = int(self.backup_hours_var.get())
+            backup_keep = int(self.backup_keep_var.get())
+        except ValueError:
+            Messagebox.show_error("Maintenance options must be whole numbers.", "Invalid value")
+            return
+        self.database_service.set_maintenance_settings(wal_limit, backup_hours, backup_keep)
+        Messagebox.show_info("Maintenance settings saved successfully.", "Settings Saved")
+
+    def run_maintenance_task(self, name, task, with_progress=False):
+        for btn in self.maintenance_buttons:
+            btn.config(state="disabled")
+        self.maintenance_progress.config(value=0)
+        self.maintenance_label.config(text=f"{name}...")
+
+        def on_progress(done, total):
+            self.after(0, lambda: self.maintenance_progress.config(maximum=max(total, 1), value=done))
+
+        def worker():
+            try:
+                result = task(on_progress) if with_progress else task()
+                message = f"{name} finished" + (f": {result}" if result else "")
+            except Exception as e:
+                message = f"{name} failed: {e}"
+            self.after(0, lambda: self.on_maintenance_task_done(message))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def on_maintenance_task_done(self, message):
+        for btn in self.maintenance_buttons:
+            btn.config(state="normal")
+        self.refresh_database_tab()
+        self.maintenance_label.config(text=f"{message}\n{self.maintenance_label.cget('text')}")
+
+    def _build_stats_tree(self, columns, height):
+        frame = ttk.Frame(self.database)
+        frame.pack(fill="both", expand=True, padx=20, pady=(2, 10))
+
+        tree = ttk.Treeview(frame, columns=[c[0] for c in columns], show="headings", height=height)
+        for key, title, width in columns:
+            tree.heading(key, text=title, anchor="w")
+            tree.column(key, width=width, anchor="w", stretch=key in ("sql", "plan"))
+
+        v_scroll = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=v_scroll.set)
+        tree.pack(side="left", fill="both", expand=True)
+        v_scroll.pack(side="right", fill="y")
+        return tree
+
+    def on_profiling_change(self):
+        try:
+            threshold = float(self.slow_ms_var.get())
+        except ValueError:
+            Messagebox.show_error("Threshold must be a number of milliseconds.", "Invalid threshold")
+            return
+        self.database_service.set_profiling(self.profiling_var.get(), threshold)
+        self.refresh_database_tab()
+
+    def on_profiler_reset(self):
+        self.database_service.reset_profiler()
+        self.refresh_database_tab()
+
+    def _show_table_sizes(self, tables):
+        if not self.tables_tree.winfo_exists():
+            return
+        self.tables_tree.delete(*self.tables_tree.get_children())
+        for table in tables:
+            size = "n/a" if table["bytes"] is None else f"{table['bytes'] / (1024 * 1024):.2f} MB"
+            rows = f"~{table['rows']:,}" if table["estimated"] else f"{table['rows']:,}"
+            self.tables_tree.insert("", "end", values=(table["name"], rows, size))
+
+    def refresh_database_tab(self):
+        for tree in (self.top_tree, self.slow_tree):
+            tree.delete(*tree.get_children())
+
+        for stat in self.database_service.get_top_statements():
+            self.top_tree.insert("", "end", values=(
+                stat["sql"], stat["calls"], f"{stat['total_ms']:.1f}",
+                f"{stat['total_ms'] / stat['calls']:.2f}", f"{stat['max_ms']:.1f}", stat["rows"]
+            ))
+
+        for entry in self.database_service.get_slow_queries():
+            self.slow_tree.insert("", "end", values=(
+                entry["timestamp"], f"{entry['elapsed_ms']:.1f}", entry["rows"], entry["sql"], entry["plan"]
+            ))
+
+        # Table sizes read every page of the file, so they are gathered on a worker thread
+        def load_table_sizes():
+            try:
+                tables = self.database_service.get_table_sizes()
+            except sqlite3.Error as e:
+                print(f"Could not read table sizes: {e}")
+                return
+            self.after(0, lambda: self._show_table_sizes(tables))
+
+        threading.Thread(target=load_table_sizes, daemon=True).start()
+
+        status = self.database_service.get_maintenance_status()
+        last_runs = status["last_runs"]
+        self.maintenance_label.config(text=(
+            f"Database {status['db_bytes'] / (1024 * 1024):.1f} MB, WAL {status['wal_bytes'] / (1024 * 1024):.1f} MB, "
+            f"{len(status['backups'])} backups   |   Last backup: {last_runs['backup'] or 'never'}, "
+            f"checkpoint: {last_runs['checkpoint'] or 'never'}, optimize: {last_runs['optimize'] or 'never'}, "
+            f"analyze: {last_runs['analyze'] or 'never'}"
+        ))
+
+        pool = self.database_service.get_pool_stats()
+        writer = self.database_service.get_writer_stats()
+        self.db_stats_label.config(text=(
+            f"Connections: {pool['open']} open, {pool['idle']} idle, {pool['reused']} reused   |   "
+            f"Writer: {writer['statements']:,} statements in {writer['commits']:,} commits, "
+            f"avg {writer['avg_commit_ms']:.1f} ms, max {writer['max_commit_ms']:.1f} ms, "
+            f"{writer['queue_depth']} queued"
+        ))
\ No newline at end of file
@@ -2,11 +2,17 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from ttkbootstrap.widgets.scrolled import ScrolledFrame
 
+PAGE_SIZE = 500
+
+# The next page is read once the view is scrolled past this fraction of the rows loaded so far
+LOAD_MORE_AT = 0.9
+
 
 class DbTreeviewTab(ttk.Frame):
-    def __init__(self, parent, add_channel_service):
+    def __init__(self, parent, add_channel_service, library_service):
         super().__init__(parent)
         self.add_channel_service = add_channel_service
+        self.library_service = library_service
 
         # Define all columns based on your database schema
         self.columns = (
@@ -17,6 +23,9 @@ class DbTreeviewTab(ttk.Frame):
         )
 
         self.tree = None
+        self.v_scroll = None
+        self._load_job = None
+        self._next_cursor = None
         self.build_ui()
         self.load_data()
 
@@ -34,9 +43,9 @@ class DbTreeviewTab(ttk.Frame):
         )
 
         # Scrollbars
-        v_scroll = ttk.Scrollbar(container, orient=VERTICAL, command=self.tree.yview)
+        self.v_scroll = ttk.Scrollbar(container, orient=VERTICAL, command=self.tree.yview)
         h_scroll = ttk.Scrollbar(container, orient=HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=v_scroll.set, xscrollcommand=h_scroll.set)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll, xscrollcommand=h_scroll.set)
 
         # Configure columns and headings
         for col in self.columns:
@@ -50,7 +59,7 @@ class DbTreeviewTab(ttk.Frame):
 
         # Layout using grid to accommodate scrollbars
         self.tree.grid(row=0, column=0, sticky="nsew")
-        v_scroll.grid(row=0, column=1, sticky="ns")
+        self.v_scroll.grid(row=0, column=1, sticky="ns")
         h_scroll.grid(row=1, column=0, sticky="ew")
 
         container.grid_rowconfigure(0, weight=1)
@@ -65,18 +74,27 @@ class DbTreeviewTab(ttk.Frame):
         ).pack(pady=10)
 
     def load_data(self):
-        """Clears the tree and reloads all video data from all channels."""
+        """Clears the tree and loads the first page. Further pages are read as the user scrolls down to them."""
+        if self._load_job is not None:
+            self.after_cancel(self._load_job)
+            self._load_job = None
+
         for item in self.tree.get_children():
             self.tree.delete(item)
 
-        # Get all channels to iterate through their videos
-        groups = self.add_channel_service.get_all_groups()
-
-        for group in groups:
-            channels = self.add_channel_service.get_channels_by_group(group)
-            for channel in channels:
-                videos = self.add_channel_service.get_videos_by_channel(channel)
-                for video in videos:
-                    # Extract values in the correct order defined in self.columns
-                    values = [video.get(col, "") for col in self.columns]
-                    self.tree.insert("", "end", values=values)
\ No newline at end of file
+        self.load_page(None)
+
+    def on_tree_scroll(self, first, last):
+        self.v_scroll.set(first, last)
+        if self._next_cursor is not None and self._load_job is None and float(last) >= LOAD_MORE_AT:
+            self._load_job = self.after_idle(self.load_page, self._next_cursor)  # type: ignore
+
+    def load_page(self, cursor):
+        self._load_job = None
+        page, self._next_cursor = self.library_service.query_videos(
+            columns=self.columns, sort="id", descending=False, cursor=cursor, limit=PAGE_SIZE
+        )
+        for video in page:
+            # Extract values in the correct order defined in self.columns
+            values = [video.get(col, "") for col in self.columns]
+            self.tree.insert("", "end", values=values)
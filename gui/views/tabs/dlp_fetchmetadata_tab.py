@@ -9,11 +9,12 @@ from gui.components.worker_card import WorkerCard
 
 
 class DlpFetchMetadataTab(ttk.Frame):
-    def __init__(self, parent, add_group_service, add_channel_service, fetch_metadata_service):
+    def __init__(self, parent, add_group_service, add_channel_service, fetch_metadata_service, library_service):
         super().__init__(parent)
         self.add_group_service = add_group_service
         self.add_channel_service = add_channel_service
         self.fetch_metadata_service = fetch_metadata_service
+        self.library_service = library_service
 
         self.main_scroll = ScrolledFrame(self, autohide=True)
         self.main_scroll.pack(fill=BOTH, expand=True)
@@ -24,6 +25,7 @@ class DlpFetchMetadataTab(ttk.Frame):
         self.start_btn = None
         self.mode_var = None
         self.cookie_var = None
+        self.fast_api_var = None
         self.skip_mode_var = None
         self.selected_items_list = []
         self.params = {}
@@ -94,6 +96,10 @@ class DlpFetchMetadataTab(ttk.Frame):
         self.cookie_var = ttk.BooleanVar(value=True)
         ttk.Checkbutton(left_params, text="Use Firefox Cookies", variable=self.cookie_var).pack(anchor=W, padx=5,
                                                                                                 pady=(5, 5))
+        # Needs a YouTube Data API key; videos the API can't describe still go through yt-dlp
+        self.fast_api_var = ttk.BooleanVar(value=False)
+        ttk.Checkbutton(left_params, text="Fast mode (YouTube API, no files)",
+                        variable=self.fast_api_var).pack(anchor=W, padx=5)
 
         # --- NEW: Re-fetch Policy Combobox ---
         ttk.Label(left_params, text="Re-Fetch Policy:", font=("Segoe UI", 9, "bold")).pack(anchor=W, pady=(15, 5))
@@ -143,21 +149,22 @@ class DlpFetchMetadataTab(ttk.Frame):
         selected = self.tree.selection()
         if not selected: return
         item_id = selected[0]
-        item_text = self.tree.item(item_id, "text")
         if "channel" not in self.tree.item(item_id, "tags"): return
-        if item_text in self.selected_items_list: return
-        self.selected_items_list.append(item_text)
-        self.render_selection_row(item_text)
+        # Queue entries are (channel_pk, display name) pairs
+        item = (int(self.tree.item(item_id, "values")[0]), self.tree.item(item_id, "text"))
+        if item in self.selected_items_list: return
+        self.selected_items_list.append(item)
+        self.render_selection_row(item)
 
-    def render_selection_row(self, text):
+    def render_selection_row(self, item):
         row = ttk.Frame(self.queue_scroll, padding=2)
         row.pack(fill=X)
-        ttk.Label(row, text=text, font=("Segoe UI", 9)).pack(side=LEFT, padx=5)
+        ttk.Label(row, text=item[1], font=("Segoe UI", 9)).pack(side=LEFT, padx=5)
         ttk.Button(row, text="✕", bootstyle="danger-link",
-                   command=lambda r=row, t=text: self.remove_from_selection(r, t)).pack(side=RIGHT)
+                   command=lambda r=row, i=item: self.remove_from_selection(r, i)).pack(side=RIGHT)
 
-    def remove_from_selection(self, row_widget, text):
-        if text in self.selected_items_list: self.selected_items_list.remove(text)
+    def remove_from_selection(self, row_widget, item):
+        if item in self.selected_items_list: self.selected_items_list.remove(item)
         row_widget.destroy()
 
     def apply_speed_preset(self, _event):
@@ -176,7 +183,7 @@ class DlpFetchMetadataTab(ttk.Frame):
         for group in self.add_group_service.get_all_groups():
             gid = self.tree.insert("", "end", text=group, tags=("group",), open=True)
             for chan in self.add_channel_service.get_channels_by_group(group):
-                self.tree.insert(gid, "end", text=chan, tags=("channel",))
+                self.tree.insert(gid, "end", text=chan["name"], values=(chan["id"],), tags=("channel",))
 
     def start_process(self):
         if not self.selected_items_list: return
@@ -202,25 +209,26 @@ class DlpFetchMetadataTab(ttk.Frame):
                 break
 
             try:
-                item_name = self.task_queue.get_nowait()
+                channel_pk, item_name = self.task_queue.get_nowait()
             except queue.Empty:
                 break
 
-            channel_info = self.add_channel_service.get_channel_details(item_name)
+            channel_info = self.add_channel_service.get_channel_details(channel_pk)
             if not channel_info:
                 # Fixed parameter warning
                 self.after(0, lambda c, n: c.update_log(f"Error: {n} not found in DB"), card, item_name)
                 self.task_queue.task_done()
                 continue
 
-            videos = self.add_channel_service.get_videos_by_channel(item_name)
+            # Lightweight projection, the workers never need descriptions or thumbnail JSON
+            videos = self.library_service.get_channel_videos(channel_pk)
             if not videos:
                 # Fixed parameter warning
                 self.after(0, lambda c, n: c.update_log(f"No videos found in DB for {n}"), card, item_name)
                 self.task_queue.task_done()
                 continue
 
-            cid = channel_info.get("channel_id", "Unknown_ID")
+            cid = channel_info.get("channel_id") or "Unknown_ID"
             handle = channel_info.get("handle", "Unknown_Handle")
 
             if handle and handle != "Unknown_Handle" and handle != cid:
@@ -248,7 +256,8 @@ class DlpFetchMetadataTab(ttk.Frame):
                 "--sleep-subtitles": self.params["--sleep-subtitles"].get(),
                 "--retries": self.params["--retries"].get(),
                 "--fragment-retries": self.params["--fragment-retries"].get(),
-                "use_cookies": self.cookie_var.get()
+                "use_cookies": self.cookie_var.get(),
+                "fast_metadata": self.fast_api_var.get()
             }
 
             def log_cb(msg):
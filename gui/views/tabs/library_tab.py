@@ -8,15 +8,23 @@ import os
 import sys
 import subprocess
 import threading
+import webbrowser
 from config import METADATA_DIR, FONTS_DIR
 from gui.components.video_card import VideoCard
+from gui.dialogs.description_history_dialog import DescriptionHistoryDialog
+from services.directory_index import DirectoryIndex, MEDIA_EXTENSIONS
+
+# Library sort labels -> LibraryService sort keys
+SORT_KEYS = {"Date": "date", "Views": "views", "Title": "title", "Duration": "duration", "Likes": "likes"}
 
 
 class LibraryTab(ttk.Frame):
-    def __init__(self, parent, add_group_service, add_channel_service):
+    def __init__(self, parent, add_group_service, add_channel_service, library_service, liveness_service):
         super().__init__(parent)
         self.add_group_service = add_group_service
         self.add_channel_service = add_channel_service
+        self.library_service = library_service
+        self.liveness_service = liveness_service
         self.tree = None
         self.notebook = None
         self.tab_frames = {}
@@ -24,11 +32,22 @@ class LibraryTab(ttk.Frame):
         self.check_progress_var = None
         self.check_progress = None
         self.check_status_btn = None
-
-        self.current_videos = []
+        self.check_status_label = None
+        self.check_stop_event = None
+        self.load_more_btns = {}
+        self.page_cursors = {}
+        self.card_counts = {}
+        self.playlist_tree = None
+        self.playlist_items_tree = None
+        self.playlist_item_paths = {}
+
+        self.current_channel = None
         self.search_var = ttk.StringVar()
+        self.search_all_var = ttk.BooleanVar(value=False)
         self.sort_by_var = ttk.StringVar(value="Date")
         self.sort_order_var = ttk.StringVar(value="Descending")
+        self.downloaded_filter_var = ttk.StringVar(value="Any")
+        self.online_filter_var = ttk.StringVar(value="Any")
         self.image_queue = []
         self.is_loading_images = False
         self.current_thumb_dir = None
@@ -66,20 +85,35 @@ class LibraryTab(ttk.Frame):
 
         ttk.Label(controls_frame, text="Search:").pack(anchor=W)
         search_entry = ttk.Entry(controls_frame, textvariable=self.search_var)
-        search_entry.pack(fill=X, pady=(0, 10))
+        search_entry.pack(fill=X, pady=(0, 5))
         search_entry.bind("<KeyRelease>", self.on_search_typing)
 
+        ttk.Checkbutton(controls_frame, text="Search all channels", variable=self.search_all_var,
+                        command=self.on_sort_changed).pack(anchor=W, pady=(0, 10))
+
         ttk.Label(controls_frame, text="Sort by:").pack(anchor=W)
-        sort_cb = ttk.Combobox(controls_frame, textvariable=self.sort_by_var, values=["Date", "Views", "Title"],
-                               state="readonly")
+        sort_cb = ttk.Combobox(controls_frame, textvariable=self.sort_by_var,
+                               values=["Relevance"] + list(SORT_KEYS), state="readonly")
         sort_cb.pack(fill=X, pady=(0, 5))
         sort_cb.bind("<<ComboboxSelected>>", self.on_sort_changed)
 
         order_cb = ttk.Combobox(controls_frame, textvariable=self.sort_order_var, values=["Ascending", "Descending"],
                                 state="readonly")
-        order_cb.pack(fill=X)
+        order_cb.pack(fill=X, pady=(0, 10))
         order_cb.bind("<<ComboboxSelected>>", self.on_sort_changed)
 
+        ttk.Label(controls_frame, text="Downloaded:").pack(anchor=W)
+        downloaded_cb = ttk.Combobox(controls_frame, textvariable=self.downloaded_filter_var,
+                                     values=["Any", "Downloaded", "Not downloaded"], state="readonly")
+        downloaded_cb.pack(fill=X, pady=(0, 5))
+        downloaded_cb.bind("<<ComboboxSelected>>", self.on_sort_changed)
+
+        ttk.Label(controls_frame, text="Online status:").pack(anchor=W)
+        online_cb = ttk.Combobox(controls_frame, textvariable=self.online_filter_var,
+                                 values=["Any", "Online", "Lost"], state="readonly")
+        online_cb.pack(fill=X)
+        online_cb.bind("<<ComboboxSelected>>", self.on_sort_changed)
+
         self.check_status_btn = ttk.Button(controls_frame, text="Check online status", bootstyle="info",
                                            command=self.start_online_check)
         self.check_status_btn.pack(fill=X, pady=(15, 0))
@@ -87,6 +121,8 @@ class LibraryTab(ttk.Frame):
         self.check_progress_var = ttk.DoubleVar()
         self.check_progress = ttk.Progressbar(controls_frame, variable=self.check_progress_var, maximum=100,
                                               bootstyle="success")
+        self.check_status_label = ttk.Label(controls_frame, text="", font=("Segoe UI", 8, "italic"),
+                                            bootstyle="secondary")
 
         main_content = ttk.Frame(self)
         main_content.pack(side=RIGHT, fill=BOTH, expand=True)
@@ -103,6 +139,73 @@ class LibraryTab(ttk.Frame):
                 sf.columnconfigure(i, weight=1)
             self.tab_frames[tab_name] = sf
 
+        self.build_playlists_tab()
+
+    def build_playlists_tab(self):
+        """Playlists stored by the channel sync, browsed straight from the database."""
+        tab_frame = ttk.Frame(self.notebook)
+        self.notebook.add(tab_frame, text="Playlists")
+        panes = ttk.Panedwindow(tab_frame, orient=HORIZONTAL)
+        panes.pack(fill=BOTH, expand=True, padx=5, pady=5)
+
+        self.playlist_tree = ttk.Treeview(panes, columns=("count",), show="tree headings")
+        self.playlist_tree.heading("#0", text="Playlist", anchor=W)
+        self.playlist_tree.heading("count", text="Videos", anchor=W)
+        self.playlist_tree.column("count", width=70, stretch=False)
+        self.playlist_tree.bind("<<TreeviewSelect>>", self.on_playlist_selected)
+        panes.add(self.playlist_tree, weight=1)
+
+        items_frame = ttk.Frame(panes)
+        columns = ("position", "title", "uploader", "status")
+        self.playlist_items_tree = ttk.Treeview(items_frame, columns=columns, show="headings")
+        for col, width in zip(columns, (50, 320, 160, 110)):
+            self.playlist_items_tree.heading(col, text="#" if col == "position" else col.title(), anchor=W)
+            self.playlist_items_tree.column(col, width=width, anchor=W, stretch=col == "title")
+        items_scroll = ttk.Scrollbar(items_frame, orient=VERTICAL, command=self.playlist_items_tree.yview)
+        self.playlist_items_tree.config(yscrollcommand=items_scroll.set)
+        items_scroll.pack(side=RIGHT, fill=Y)
+        self.playlist_items_tree.pack(side=LEFT, fill=BOTH, expand=True)
+        self.playlist_items_tree.bind("<Double-1>", self.on_playlist_item_open)
+        panes.add(items_frame, weight=3)
+
+    def load_playlists(self):
+        self.playlist_tree.delete(*self.playlist_tree.get_children())
+        self.playlist_items_tree.delete(*self.playlist_items_tree.get_children())
+        if not self.current_channel:
+            return
+        for playlist in self.library_service.get_channel_playlists(self.current_channel):
+            count = playlist["item_count"] if playlist["item_count"] is not None else playlist["stored_count"]
+            self.playlist_tree.insert("", "end", iid=str(playlist["id"]), text=playlist["title"] or
+                                      playlist["playlist_id"], values=(count,))
+
+    def on_playlist_selected(self, _event=None):
+        selected = self.playlist_tree.selection()
+        self.playlist_items_tree.delete(*self.playlist_items_tree.get_children())
+        self.playlist_item_paths.clear()
+        if not selected:
+            return
+
+        for item in self.library_service.get_playlist_items(int(selected[0])):
+            if item["id"] is None:
+                status = "Not in library"
+            elif item["is_lost_media"]:
+                status = "Lost"
+            else:
+                status = "Downloaded" if item["is_downloaded"] else "In library"
+            iid = self.playlist_items_tree.insert("", "end", values=(
+                item["position"], item["title"] or item["video_id"], item["uploader"] or "", status))
+            self.playlist_item_paths[iid] = (item["video_id"], item["filepath"] if item["is_downloaded"] else None)
+
+    def on_playlist_item_open(self, _event=None):
+        selected = self.playlist_items_tree.selection()
+        if not selected or selected[0] not in self.playlist_item_paths:
+            return
+        video_id, filepath = self.playlist_item_paths[selected[0]]
+        if filepath:
+            self.play_video(filepath)
+        else:
+            webbrowser.open(f"https://www.youtube.com/watch?v={video_id}")
+
     def refresh_tree(self, _event=None):
         for item in self.tree.get_children():
             self.tree.delete(item)
@@ -114,7 +217,8 @@ class LibraryTab(ttk.Frame):
             group_id = self.tree.insert("", "end", text=group, tags=("group",), open=True)
             channels = self.add_channel_service.get_channels_by_group(group)
             for channel in channels:
-                self.tree.insert(group_id, "end", text=channel, tags=("channel",))
+                # The channel's primary key rides along in the item values
+                self.tree.insert(group_id, "end", text=channel["name"], values=(channel["id"],), tags=("channel",))
 
     def on_channel_selected(self, _event):
         selected = self.tree.selection()
@@ -122,15 +226,16 @@ class LibraryTab(ttk.Frame):
         item = self.tree.item(selected[0])
         if "channel" not in item["tags"]: return
 
-        channel_name = item["text"]
-        self.current_videos = self.add_channel_service.get_videos_by_channel(channel_name)
+        channel_pk = int(item["values"][0])
+        self.current_channel = channel_pk
 
-        channel_info = self.add_channel_service.get_channel_details(channel_name)
-        cid = channel_info.get("channel_id")
+        channel_info = self.add_channel_service.get_channel_details(channel_pk)
+        cid = channel_info.get("channel_id") or "Unknown_ID"
         handle = channel_info.get("handle")
         folder_name = f"{cid} ({handle})" if handle and handle != cid else cid
         self.current_thumb_dir = METADATA_DIR / folder_name / "Videos"
 
+        self.load_playlists()
         self.apply_filters_and_render()
 
     def on_search_typing(self, _event=None):
@@ -139,9 +244,14 @@ class LibraryTab(ttk.Frame):
         self._search_timer = self.after(1000, lambda: self.apply_filters_and_render()) # type: ignore
 
     def on_sort_changed(self, _event=None):
-        if self.current_videos:
+        if self.current_channel or self.search_var.get().strip():
             self.apply_filters_and_render()
 
+    def get_active_filters(self):
+        downloaded = {"Downloaded": True, "Not downloaded": False}.get(self.downloaded_filter_var.get())
+        lost = {"Lost": True, "Online": False}.get(self.online_filter_var.get())
+        return {"downloaded": downloaded, "lost": lost}
+
     def apply_filters_and_render(self):
         for sf in self.tab_frames.values():
             for child in sf.winfo_children():
@@ -149,62 +259,137 @@ class LibraryTab(ttk.Frame):
             sf.update_idletasks()
             sf.container.event_generate("<Configure>")
 
-        query = self.search_var.get().lower()
-        filtered_videos = [v for v in self.current_videos if query in v.get("title", "").lower()]
+        self.load_more_btns.clear()
+        self.page_cursors.clear()
+        self.card_counts = {tab_name: 0 for tab_name in self.tab_frames}
+
+        query = self.search_var.get().strip()
+        if query:
+            self.render_search_results(query)
+        elif self.current_channel:
+            # Filtering and sorting happen in SQL, one page per tab at a time
+            for tab_name in self.tab_frames:
+                self.load_next_page(tab_name)
+
+        if not self.is_loading_images:
+            self.process_image_queue()
+
+    def render_search_results(self, query):
+        # Ranked full-text search over titles, descriptions and tags
+        channel = None if self.search_all_var.get() else self.current_channel
+        results = self.library_service.search_videos(query, channel_pk=channel, **self.get_active_filters())
 
         sort_key = self.sort_by_var.get()
         reverse_order = (self.sort_order_var.get() == "Descending")
 
+        # Search results are capped, so re-sorting them here is cheap
         if sort_key == "Views":
-            filtered_videos.sort(key=lambda x: x.get("view_count") or 0, reverse=reverse_order)
+            results.sort(key=lambda x: x.get("view_count") or 0, reverse=reverse_order)
         elif sort_key == "Title":
-            filtered_videos.sort(key=lambda x: x.get("title", "").lower(), reverse=reverse_order)
-        else:
-            filtered_videos.sort(key=lambda x: x.get("upload_date") or "00000000", reverse=reverse_order)
+            results.sort(key=lambda x: (x.get("title") or "").lower(), reverse=reverse_order)
+        elif sort_key == "Date":
+            results.sort(key=lambda x: x.get("upload_date") or "00000000", reverse=reverse_order)
 
-        counters = {"Videos": 0, "Shorts": 0, "Lives": 0}
-
-        for video in filtered_videos:
+        thumb_dir = None if self.search_all_var.get() else self.current_thumb_dir
+        for video in results:
             v_type = video.get("video_type", "Videos")
             if v_type not in self.tab_frames: v_type = "Videos"
-            row, col = divmod(counters[v_type], 3)
+            self.add_video_card(v_type, video, thumb_dir)
+
+    def load_next_page(self, tab_name):
+        sort_key = SORT_KEYS.get(self.sort_by_var.get(), "date")
+        page, cursor = self.library_service.query_videos(
+            sort=sort_key,
+            descending=(self.sort_order_var.get() == "Descending"),
+            cursor=self.page_cursors.get(tab_name),
+            channel_pk=self.current_channel,
+            video_type=tab_name,
+            **self.get_active_filters()
+        )
+        self.page_cursors[tab_name] = cursor
+
+        old_btn = self.load_more_btns.pop(tab_name, None)
+        if old_btn:
+            old_btn.destroy()
+
+        for video in page:
+            self.add_video_card(tab_name, video, self.current_thumb_dir)
+
+        if cursor is not None:
+            row = (self.card_counts[tab_name] + 2) // 3
+            btn = ttk.Button(self.tab_frames[tab_name], text="Load more", bootstyle="secondary-outline",
+                             command=lambda t=tab_name: self.on_load_more(t))
+            btn.grid(row=row, column=0, columnspan=3, pady=10)
+            self.load_more_btns[tab_name] = btn
+
+    def on_load_more(self, tab_name):
+        self.load_next_page(tab_name)
+        if not self.is_loading_images:
+            self.process_image_queue()
 
-            # Use the new Component!
-            card = VideoCard(self.tab_frames[v_type], video, self.current_thumb_dir, self.has_icon_font,
-                             self.image_queue, self.play_video, self.reveal_file)
-            card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
+    def add_video_card(self, tab_name, video, thumb_dir):
+        row, col = divmod(self.card_counts[tab_name], 3)
 
-            counters[v_type] += 1
+        # Use the new Component!
+        card = VideoCard(self.tab_frames[tab_name], video, thumb_dir, self.has_icon_font,
+                         self.image_queue, self.play_video, self.reveal_file, self.show_description_history)
+        card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
 
-        if not self.is_loading_images:
-            self.process_image_queue()
+        self.card_counts[tab_name] += 1
+
+    def show_description_history(self, video):
+        versions = self.library_service.get_description_history(video["video_id"])
+        if not versions:
+            Messagebox.show_info("The description has not changed since the metadata was first fetched.",
+                                 "Description History")
+            return
+        DescriptionHistoryDialog(self.winfo_toplevel(), video.get("title") or video["video_id"], versions)
 
     def start_online_check(self):
-        if not self.current_videos:
+        # The same button cancels a running check
+        if self.check_stop_event is not None:
+            self.check_stop_event.set()
+            self.check_status_btn.config(state="disabled", text="Cancelling...")
+            return
+        if not self.current_channel:
             return
 
-        self.check_status_btn.config(state="disabled", text="Checking...")
+        self.check_stop_event = threading.Event()
+        self.check_status_btn.config(text="Cancel check", bootstyle="danger")
         self.check_progress.pack(fill=X, pady=(5, 0))
+        self.check_status_label.pack(anchor=W)
+        self.check_status_label.config(text="")
         self.check_progress_var.set(0)
 
-        threading.Thread(target=self._run_online_check, daemon=True).start()
+        threading.Thread(target=self._run_online_check, args=(self.current_channel, self.check_stop_event),
+                         daemon=True).start()
 
-    def _run_online_check(self):
+    def _run_online_check(self, channel_pk, stop_event):
         def update_progress(current, total):
             pct = (current / total) * 100
-            self.winfo_toplevel().after(0, self.check_progress_var.set, pct)
+            self.winfo_toplevel().after(0, self._update_online_check, pct, f"{current:,} / {total:,} checked")
 
-        self.add_channel_service.check_videos_online_status(self.current_videos, progress_callback=update_progress)
-        self.winfo_toplevel().after(0, self._finish_online_check) # type: ignore
+        videos = self.library_service.get_channel_videos(channel_pk, columns=("video_id", "url"))
+        result = self.liveness_service.check_videos_online_status(videos, progress_callback=update_progress,
+                                                                  stop_event=stop_event)
+        self.winfo_toplevel().after(0, self._finish_online_check, result) # type: ignore
 
-    def _finish_online_check(self):
-        self.check_progress.pack_forget()
-        self.check_status_btn.config(state="normal", text="Check online status")
+    def _update_online_check(self, pct, text):
+        self.check_progress_var.set(pct)
+        self.check_status_label.config(text=text)
 
-        selected = self.tree.selection()
-        if selected:
-            channel_name = self.tree.item(selected[0])["text"]
-            self.current_videos = self.add_channel_service.get_videos_by_channel(channel_name)
+    def _finish_online_check(self, result):
+        self.check_stop_event = None
+        self.check_progress.pack_forget()
+        self.check_status_btn.config(state="normal", text="Check online status", bootstyle="info")
+        self.check_status_label.config(text=(
+            f"{result['online']:,} online, {result['lost']:,} lost, {result['restricted']:,} restricted, "
+            f"{result['unknown']:,} unknown"
+            + (f" ({result['api']:,} via API)" if result["api"] else "")
+            + (" (cancelled)" if result["cancelled"] else "")
+        ))
+
+        if self.current_channel:
             self.apply_filters_and_render()
 
     @staticmethod
@@ -213,11 +398,7 @@ class LibraryTab(ttk.Frame):
             Messagebox.show_warning("Not Found", "Video file not found in database.")
             return
 
-        target = Path(f"{filepath_str}.info.json")
-        if not target.exists():
-            target = Path(f"{filepath_str}.webp")
-            if not target.exists():
-                target = Path(filepath_str).parent
+        target = DirectoryIndex.find(filepath_str, ('.info.json', '.webp')) or Path(filepath_str).parent
 
         if not target.exists():
             Messagebox.show_warning("Not Found", "Files have not been downloaded yet.")
@@ -253,15 +434,10 @@ class LibraryTab(ttk.Frame):
             Messagebox.show_warning("Not Found", "Video file not found in database.")
             return
 
-        base_path = Path(base_path_str)
-        dir_path = base_path.parent
-        name_pattern = base_path.name + ".*"
-
-        if dir_path.exists():
-            for file in dir_path.glob(name_pattern):
-                if file.suffix.lower() in ['.mp4', '.mkv', '.webm', '.avi', '.mov']:
-                    self.open_local_path(file)
-                    return
+        media_file = DirectoryIndex.find(base_path_str, MEDIA_EXTENSIONS)
+        if media_file:
+            self.open_local_path(media_file)
+            return
 
         Messagebox.show_warning("Not Found", "Video media file not found on disk.\nHave you downloaded it yet?")
 
@@ -4,17 +4,25 @@ from ttkbootstrap.widgets.scrolled import ScrolledFrame
 import os
 import sys
 import subprocess
+import threading
 from gui.dialogs.add_group_dialog import AddGroupDialog
 from gui.dialogs.add_channel_dialog import AddChannelDialog
+from gui.dialogs.bulk_import_dialog import BulkImportDialog
+from gui.dialogs.sync_dialog import SyncDialog
 from config import FONTS_DIR
 from gui.components.channel_card import ChannelCard
 
 
 class ManageSubsTab(ttk.Frame):
-    def __init__(self, parent, add_group_service, add_channel_service):
+    def __init__(self, parent, add_group_service, add_channel_service, library_service, bulk_import_service,
+                 account_service, sync_service):
         super().__init__(parent)
         self.add_group_service = add_group_service
         self.add_channel_service = add_channel_service
+        self.library_service = library_service
+        self.bulk_import_service = bulk_import_service
+        self.account_service = account_service
+        self.sync_service = sync_service
 
         self.has_icon_font = (FONTS_DIR / "MaterialSymbolsRounded.ttf").exists()
         if self.has_icon_font:
@@ -23,6 +31,7 @@ class ManageSubsTab(ttk.Frame):
 
         self.tree = None
         self.cards_frame = None
+        self.stats_btn = None
 
         self.build_ui()
         self.load_data()
@@ -46,13 +55,14 @@ class ManageSubsTab(ttk.Frame):
             group_lf.columnconfigure(0, weight=1)
 
             card_idx = 0
-            for channel_name in channels:
-                self.tree.insert(group_id, "end", text=channel_name, tags=("channel",))
-                channel_info = self.add_channel_service.get_channel_details(channel_name)
+            for channel in channels:
+                self.tree.insert(group_id, "end", text=channel["name"], values=(channel["id"],), tags=("channel",))
+                channel_info = self.add_channel_service.get_channel_details(channel["id"])
+                channel_stats = self.library_service.get_channel_stats(channel["id"])
 
                 # Use the new external Component
-                card = ChannelCard(group_lf, channel_info, self.add_channel_service, self.has_icon_font,
-                                   self.open_local_path)
+                card = ChannelCard(group_lf, channel_info, channel_stats, self.add_channel_service,
+                                   self.has_icon_font, self.open_local_path)
                 card.grid(row=card_idx, column=0, padx=10, pady=(10, 10), sticky="nsew")
                 card_idx += 1
 
@@ -70,6 +80,11 @@ class ManageSubsTab(ttk.Frame):
 
         ttk.Button(buttons, text="+ Group", command=self.add_group).pack(fill="x", pady=5)
         ttk.Button(buttons, text="+ Channel", command=self.add_channel).pack(fill="x", pady=5)
+        ttk.Button(buttons, text="Bulk Import", command=self.bulk_import).pack(fill="x", pady=5)
+        ttk.Button(buttons, text="Sync All", bootstyle="info-outline", command=self.sync_all).pack(fill="x", pady=5)
+        self.stats_btn = ttk.Button(buttons, text="Refresh Stats", bootstyle="info-outline",
+                                    command=self.refresh_statistics)
+        self.stats_btn.pack(fill="x", pady=5)
         ttk.Button(buttons, text="Delete", bootstyle="danger", command=self.delete_selected).pack(fill="x", pady=5)
 
         self.cards_frame = ScrolledFrame(self, autohide=True)
@@ -115,11 +130,55 @@ class ManageSubsTab(ttk.Frame):
         if not dialog.result:
             return
 
+        threading.Thread(target=self._add_channel_worker, args=(group_name, dialog.result), daemon=True).start()
+
+    def _add_channel_worker(self, group_name, url):
         try:
-            self.add_channel_service.add_channel(group_name, dialog.result)
-            self.winfo_toplevel().event_generate("<<DataUpdated>>")
+            self.add_channel_service.add_channel(group_name, url)
+            self.after(0, lambda: self.winfo_toplevel().event_generate("<<DataUpdated>>"))  # type: ignore
         except Exception as e:
-            Messagebox.show_error("Error", str(e))
+            message = str(e)
+            self.after(0, lambda: Messagebox.show_error("Error", message))  # type: ignore
+
+    def _selected_group_name(self):
+        selected = self.tree.selection()
+        if not selected:
+            return None
+        iid = selected[0]
+        if "channel" in self.tree.item(iid, "tags"):
+            iid = self.tree.parent(iid)
+        return self.tree.item(iid, "text")
+
+    def bulk_import(self):
+        group_name = self._selected_group_name()
+        groups = self.add_group_service.get_all_groups()
+        if not groups:
+            Messagebox.show_error("Error", "Create a group first")
+            return
+        BulkImportDialog(self.winfo_toplevel(), groups, group_name, self.bulk_import_service, self.account_service)
+
+    def sync_all(self):
+        """Descriptions and playlists for every channel, or the selected group, on a small worker pool."""
+        groups = self.add_group_service.get_all_groups()
+        SyncDialog(self.winfo_toplevel(), groups, self._selected_group_name(), self.sync_service)
+
+    def refresh_statistics(self):
+        """Follower, view and video counts for the whole library through the Data API, 50 channels per call."""
+        self.stats_btn.config(state="disabled", text="Refreshing...")
+
+        def worker():
+            success, message = self.add_channel_service.refresh_channel_statistics()
+            self.after(0, lambda: self._finish_refresh_statistics(success, message))  # type: ignore
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _finish_refresh_statistics(self, success, message):
+        self.stats_btn.config(state="normal", text="Refresh Stats")
+        if success:
+            Messagebox.show_info(message, "Statistics Refreshed")
+            self.winfo_toplevel().event_generate("<<DataUpdated>>")
+        else:
+            Messagebox.show_error(message, "Refresh Failed")
 
     def delete_selected(self):
         selected = self.tree.selection()
@@ -134,7 +193,7 @@ class ManageSubsTab(ttk.Frame):
                 if "group" in tags:
                     self.add_group_service.delete_group(text)
                 else:
-                    self.add_channel_service.delete_channel(text)
+                    self.add_channel_service.delete_channel(int(self.tree.item(iid, "values")[0]))
             except Exception as e:
                 Messagebox.show_error("Error", str(e))
 
@@ -12,27 +12,35 @@ class YtDlpView(ttk.Notebook):
         self.library_tab = LibraryTab(
             self,
             add_group_service=services.add_group,
-            add_channel_service=services.add_channel_service  # <-- FIXED: Added _service
+            add_channel_service=services.add_channel_service,  # <-- FIXED: Added _service
+            library_service=services.library,
+            liveness_service=services.liveness
         )
 
         self.fetch_tab = DlpFetchMetadataTab(
             self,
             add_group_service=services.add_group,
             add_channel_service=services.add_channel_service, # <-- FIXED
-            fetch_metadata_service=services.fetch_metadata
+            fetch_metadata_service=services.fetch_metadata,
+            library_service=services.library
         )
 
         self.download_tab = DlpDownloadTab(
             self,
             add_group_service=services.add_group,
             add_channel_service=services.add_channel_service, # <-- FIXED
-            dlp_download_service=services.dlp_download_service
+            dlp_download_service=services.dlp_download_service,
+            library_service=services.library
         )
 
         self.managesubs_tab = ManageSubsTab(
             self,
             add_group_service=services.add_group,
-            add_channel_service=services.add_channel_service  # <-- FIXED
+            add_channel_service=services.add_channel_service,  # <-- FIXED
+            library_service=services.library,
+            bulk_import_service=services.bulk_import,
+            account_service=services.account,
+            sync_service=services.sync
         )
 
         self.myaccount_tab = MyAccountTab(
@@ -63,6 +63,7 @@ def main():
 
     MainUI(root, services)
     root.mainloop()
+    services.shutdown()
 
 
 if __name__ == "__main__":
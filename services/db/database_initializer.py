@@ -1,5 +1,614 @@
+import re
 import sqlite3
-from config import DB_PATH
+from datetime import datetime
+from config import DB_PATH, METADATA_DIR
+from services.description_history import DescriptionHistory
+
+# "(@handle) description_2024-05-01T12-30-45-123456.txt", the backups older builds wrote before a description changed
+LEGACY_DESCRIPTION_RE = re.compile(r" description_(\d{4}-\d{2}-\d{2})T(\d{2})-(\d{2})-(\d{2})(?:-(\d+))?\.txt$")
+
+
+def _column_names(cursor, table):
+    return {row[1] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+def _add_column(cursor, table, column, definition):
+    if column not in _column_names(cursor, table):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _migration_1(cursor):
+    """Adds columns that older databases are missing and indexes the hot lookup paths."""
+    _add_column(cursor, "videos", "last_download_date", "TEXT DEFAULT NULL")
+
+    # Older builds could insert the same video twice for a channel; keep the first row so the unique index applies
+    cursor.execute("""
+        DELETE FROM videos WHERE id NOT IN (
+            SELECT MIN(id) FROM videos GROUP BY channel_name, video_id
+        )
+    """)
+
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_videos_channel_video ON videos(channel_name, video_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_video_id ON videos(video_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_metadata_fetch ON videos(last_metadata_fetch_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_download_date ON videos(last_download_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_channels_group ON channels(group_name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_channels_fetch_date ON channels(last_fetch_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_playlists_channel ON playlists(channel_name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ig_posts_account ON ig_posts(account_id)")
+
+
+def _migration_2(cursor):
+    """Full-text index over video titles, descriptions and tags, kept in sync with triggers."""
+    _ensure_fts(cursor)
+
+
+def _ensure_fts(cursor):
+    """
+    Creates the full-text index and its triggers when they are missing. Also run on every startup, because a
+    database migrated by an SQLite build without FTS5 has to get the index once a build with FTS5 opens it.
+    """
+    if _table_exists(cursor, "videos_fts"):
+        return False
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE videos_fts USING fts5(
+                title, description, tags,
+                content='videos', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        # SQLite builds without FTS5 fall back to LIKE searches in LibraryService
+        print(f"FTS5 unavailable, full-text search disabled: {e}")
+        return False
+
+    _create_fts_triggers(cursor)
+    cursor.execute("INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')")
+    return True
+
+
+def _table_exists(cursor, name):
+    return cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def _create_fts_triggers(cursor):
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS videos_fts_ai AFTER INSERT ON videos BEGIN
+            INSERT INTO videos_fts(rowid, title, description, tags)
+            VALUES (new.id, new.title, new.description, new.tags);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS videos_fts_ad AFTER DELETE ON videos BEGIN
+            INSERT INTO videos_fts(videos_fts, rowid, title, description, tags)
+            VALUES ('delete', old.id, old.title, old.description, old.tags);
+        END
+    """)
+    # Only fires for the indexed columns, so status flag updates from the workers don't touch the index
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS videos_fts_au AFTER UPDATE OF title, description, tags ON videos BEGIN
+            INSERT INTO videos_fts(videos_fts, rowid, title, description, tags)
+            VALUES ('delete', old.id, old.title, old.description, old.tags);
+            INSERT INTO videos_fts(rowid, title, description, tags)
+            VALUES (new.id, new.title, new.description, new.tags);
+        END
+    """)
+
+
+def _migration_3(cursor):
+    """
+    Replaces the TEXT name foreign keys with integer surrogate keys: videos/playlists.channel_pk -> channels.id and
+    channels.group_pk -> groups.id. Channels become unique on their immutable YouTube channel_id instead of the
+    display name. SQLite can't alter foreign keys, so the three tables are rebuilt.
+    """
+    # A renamed channel used to be stored twice. Keep the newest row per channel_id and point the old rows' videos
+    # and playlists at it. Channels stored without an ID (the old "Unknown_ID" placeholder) are unrelated to each
+    # other, so they keep their own rows and get a NULL channel_id.
+    cursor.execute("""
+        CREATE TEMP TABLE channel_pk_map AS
+        SELECT c.id AS old_id, c.name AS old_name,
+               CASE WHEN IFNULL(c.channel_id, 'Unknown_ID') = 'Unknown_ID' THEN c.id
+                    ELSE (SELECT MAX(c2.id) FROM channels c2 WHERE c2.channel_id = c.channel_id) END AS new_id
+        FROM channels c
+    """)
+
+    cursor.execute("""
+        CREATE TABLE channels_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            group_pk INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            handle TEXT,
+            channel_id TEXT UNIQUE,
+            url TEXT,
+            title TEXT,
+            follower_count INTEGER,
+            description TEXT,
+            tags TEXT,
+            thumbnails TEXT,
+            creation_date TEXT,
+            country TEXT,
+            view_count INTEGER,
+            links TEXT,
+            is_lost_media INTEGER DEFAULT 2,
+            last_fetch_date TEXT DEFAULT NULL,
+            FOREIGN KEY(group_pk) REFERENCES groups(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO channels_new (id, group_pk, name, handle, channel_id, url, title, follower_count, description,
+                                  tags, thumbnails, creation_date, country, view_count, links, is_lost_media,
+                                  last_fetch_date)
+        SELECT c.id, g.id, c.name, c.handle, NULLIF(c.channel_id, 'Unknown_ID'), c.url, c.title, c.follower_count,
+               c.description, c.tags, c.thumbnails, c.creation_date, c.country, c.view_count, c.links, c.is_lost_media,
+               c.last_fetch_date
+        FROM channels c
+        JOIN groups g ON g.name = c.group_name
+        WHERE c.id IN (SELECT new_id FROM channel_pk_map)
+    """)
+
+    cursor.execute("""
+        CREATE TABLE videos_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            channel_pk INTEGER NOT NULL,
+            video_id TEXT NOT NULL,
+            title TEXT,
+            url TEXT,
+            view_count INTEGER,
+            thumbnails TEXT,
+            is_downloaded INTEGER DEFAULT 0,
+            is_metadata_downloaded INTEGER DEFAULT 0,
+            video_type TEXT,
+            upload_date TEXT,
+            duration INTEGER,
+            description TEXT,
+            tags TEXT,
+            like_count INTEGER,
+            comment_count INTEGER,
+            filepath TEXT,
+            thumb_filepath TEXT,
+            is_lost_media INTEGER DEFAULT NULL,
+            last_metadata_fetch_date TEXT DEFAULT NULL,
+            last_download_date TEXT DEFAULT NULL,
+            FOREIGN KEY(channel_pk) REFERENCES channels(id) ON DELETE CASCADE
+        )
+    """)
+    # When two old channel rows merged, keep the newest copy of each video
+    cursor.execute("""
+        INSERT INTO videos_new (id, channel_pk, video_id, title, url, view_count, thumbnails, is_downloaded,
+                                is_metadata_downloaded, video_type, upload_date, duration, description, tags,
+                                like_count, comment_count, filepath, thumb_filepath, is_lost_media,
+                                last_metadata_fetch_date, last_download_date)
+        SELECT v.id, m.new_id, v.video_id, v.title, v.url, v.view_count, v.thumbnails, v.is_downloaded,
+               v.is_metadata_downloaded, v.video_type, v.upload_date, v.duration, v.description, v.tags,
+               v.like_count, v.comment_count, v.filepath, v.thumb_filepath, v.is_lost_media,
+               v.last_metadata_fetch_date, v.last_download_date
+        FROM videos v
+        JOIN channel_pk_map m ON m.old_name = v.channel_name
+        WHERE m.new_id IN (SELECT id FROM channels_new)
+          AND v.id IN (
+              SELECT MAX(v2.id) FROM videos v2
+              JOIN channel_pk_map m2 ON m2.old_name = v2.channel_name
+              GROUP BY m2.new_id, v2.video_id
+          )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE playlists_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            channel_pk INTEGER NOT NULL,
+            playlist_id TEXT UNIQUE NOT NULL,
+            title TEXT,
+            url TEXT,
+            last_updated TEXT,
+            FOREIGN KEY(channel_pk) REFERENCES channels(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO playlists_new (id, channel_pk, playlist_id, title, url, last_updated)
+        SELECT p.id, m.new_id, p.playlist_id, p.title, p.url, p.last_updated
+        FROM playlists p
+        JOIN channel_pk_map m ON m.old_name = p.channel_name
+        WHERE m.new_id IN (SELECT id FROM channels_new)
+    """)
+
+    cursor.execute("DROP TABLE channel_pk_map")
+    cursor.execute("DROP TABLE playlists")
+    cursor.execute("DROP TABLE videos")
+    cursor.execute("DROP TABLE channels")
+    cursor.execute("ALTER TABLE channels_new RENAME TO channels")
+    cursor.execute("ALTER TABLE videos_new RENAME TO videos")
+    cursor.execute("ALTER TABLE playlists_new RENAME TO playlists")
+
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_videos_channel_video ON videos(channel_pk, video_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_video_id ON videos(video_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_metadata_fetch ON videos(last_metadata_fetch_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_download_date ON videos(last_download_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_channels_group ON channels(group_pk)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_channels_name ON channels(name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_channels_fetch_date ON channels(last_fetch_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_playlists_channel ON playlists(channel_pk)")
+
+    # Dropping the old videos table took the FTS triggers with it
+    if _table_exists(cursor, "videos_fts"):
+        _create_fts_triggers(cursor)
+        cursor.execute("INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')")
+
+
+# Sort key -> indexed columns after channel_pk, mirroring library_service.SORT_EXPRESSIONS plus the id tie-breaker
+KEYSET_SORT_INDEXES = {
+    "date": "IFNULL(upload_date, ''), id",
+    "views": "IFNULL(view_count, 0), id",
+    "title": "IFNULL(title, '') COLLATE NOCASE, id",
+    "duration": "IFNULL(duration, 0), id",
+    "likes": "IFNULL(like_count, 0), id",
+    "id": "id",
+}
+
+# What counts towards channel_stats.metadata_count, written against the trigger's "new" row
+STATS_HAS_METADATA_V4 = "new.is_metadata_downloaded IS 1"
+STATS_HAS_METADATA = "(new.is_metadata_downloaded IS 1 OR new.metadata_source IS 'api')"
+STATS_WATCHED_COLUMNS = ("channel_pk, video_type, is_downloaded, is_metadata_downloaded, is_lost_media, duration, "
+                         "file_size")
+
+
+def _create_channel_stats_triggers(cursor, has_metadata, watched_columns):
+    """(Re)creates the triggers that keep channel_stats in step with videos and recounts every channel."""
+    for trigger in ("channel_stats_video_ai", "channel_stats_video_ad", "channel_stats_video_au"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+    # "x IS y" is never NULL, so each comparison adds exactly 0 or 1
+    add_row = f"""
+        UPDATE channel_stats SET
+            video_count = video_count + (new.video_type IS 'Videos'),
+            short_count = short_count + (new.video_type IS 'Shorts'),
+            live_count = live_count + (new.video_type IS 'Lives'),
+            downloaded_count = downloaded_count + (new.is_downloaded IS 1),
+            metadata_count = metadata_count + {has_metadata},
+            lost_count = lost_count + (new.is_lost_media IS 1),
+            total_duration = total_duration + IFNULL(new.duration, 0),
+            total_bytes = total_bytes + IFNULL(new.file_size, 0)
+        WHERE channel_pk = new.channel_pk;
+    """
+    remove_row = add_row.replace("new.", "old.").replace(" + ", " - ")
+    # Not "INSERT OR IGNORE": a trigger's conflict clause is overridden by the outer statement's, so inside an
+    # upsert of an existing video the ignore turns into an abort
+    ensure_row = """
+        INSERT INTO channel_stats(channel_pk) SELECT new.channel_pk
+        WHERE NOT EXISTS (SELECT 1 FROM channel_stats WHERE channel_pk = new.channel_pk);
+    """
+
+    cursor.execute(f"""
+        CREATE TRIGGER channel_stats_video_ai AFTER INSERT ON videos BEGIN
+            {ensure_row}
+            {add_row}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER channel_stats_video_ad AFTER DELETE ON videos BEGIN
+            {remove_row}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER channel_stats_video_au AFTER UPDATE OF {watched_columns} ON videos BEGIN
+            {remove_row}
+            {ensure_row}
+            {add_row}
+        END
+    """)
+
+    cursor.execute("DELETE FROM channel_stats")
+    cursor.execute(f"""
+        INSERT INTO channel_stats (channel_pk, video_count, short_count, live_count, downloaded_count,
+                                   metadata_count, lost_count, total_duration, total_bytes)
+        SELECT c.id,
+               TOTAL(v.video_type IS 'Videos'), TOTAL(v.video_type IS 'Shorts'), TOTAL(v.video_type IS 'Lives'),
+               TOTAL(v.is_downloaded IS 1), TOTAL({has_metadata.replace("new.", "v.")}), TOTAL(v.is_lost_media IS 1),
+               TOTAL(IFNULL(v.duration, 0)), TOTAL(IFNULL(v.file_size, 0))
+        FROM channels c
+        LEFT JOIN videos v ON v.channel_pk = c.id
+        GROUP BY c.id
+    """)
+
+
+def _migration_4(cursor):
+    """Per-channel summary counters kept current by triggers on videos, so cards never have to count rows."""
+    _add_column(cursor, "videos", "file_size", "INTEGER DEFAULT 0")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS channel_stats (
+            channel_pk INTEGER PRIMARY KEY,
+            video_count INTEGER NOT NULL DEFAULT 0,
+            short_count INTEGER NOT NULL DEFAULT 0,
+            live_count INTEGER NOT NULL DEFAULT 0,
+            downloaded_count INTEGER NOT NULL DEFAULT 0,
+            metadata_count INTEGER NOT NULL DEFAULT 0,
+            lost_count INTEGER NOT NULL DEFAULT 0,
+            total_duration INTEGER NOT NULL DEFAULT 0,
+            total_bytes INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY(channel_pk) REFERENCES channels(id) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS channel_stats_channel_ai AFTER INSERT ON channels BEGIN
+            INSERT OR IGNORE INTO channel_stats(channel_pk) VALUES (new.id);
+        END
+    """)
+
+    _create_channel_stats_triggers(cursor, STATS_HAS_METADATA_V4, STATS_WATCHED_COLUMNS)
+
+
+def _migration_5(cursor):
+    """Persistent queue for bulk channel imports, so an import interrupted by closing the app can be resumed."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS import_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            group_pk INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            title TEXT,
+            source TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            message TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT,
+            updated_at TEXT,
+            UNIQUE(group_pk, url),
+            FOREIGN KEY(group_pk) REFERENCES groups(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_import_queue_status ON import_queue(status)")
+
+
+def _migration_6(cursor):
+    """Channel statistics refreshed in batches through the Data API."""
+    _add_column(cursor, "channels", "video_count", "INTEGER DEFAULT NULL")
+    _add_column(cursor, "channels", "last_stats_date", "TEXT DEFAULT NULL")
+
+
+def _migration_7(cursor):
+    """Checkpoint of the library-wide channel sync, one row per channel still to do or already done."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_queue (
+            channel_pk INTEGER PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'pending',
+            message TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT,
+            FOREIGN KEY(channel_pk) REFERENCES channels(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sync_queue_status ON sync_queue(status)")
+
+
+def _migration_8(cursor):
+    """Playlist contents, plus the reported size and modification date used to skip unchanged playlists."""
+    _add_column(cursor, "playlists", "item_count", "INTEGER DEFAULT NULL")
+    _add_column(cursor, "playlists", "modified_date", "TEXT DEFAULT NULL")
+    _add_column(cursor, "playlists", "items_fetched_date", "TEXT DEFAULT NULL")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS playlist_items (
+            playlist_pk INTEGER NOT NULL,
+            video_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            title TEXT,
+            uploader TEXT,
+            fetched_at TEXT,
+            PRIMARY KEY(playlist_pk, video_id),
+            FOREIGN KEY(playlist_pk) REFERENCES playlists(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_playlist_items_video ON playlist_items(video_id)")
+
+
+def _migration_9(cursor):
+    """
+    Description history for channels and videos. kind is 'key' (full text), 'delta' (line diff against the
+    keyframe in base_version) or 'same' (identical to base_version); data is zlib compressed.
+    """
+    for table in ("channel_description_versions", "video_description_versions"):
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                owner_id TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                base_version INTEGER,
+                content_hash TEXT NOT NULL,
+                data BLOB,
+                recorded_at TEXT,
+                PRIMARY KEY(owner_id, version)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_hash ON {table}(owner_id, content_hash)")
+
+
+def _migration_10(cursor):
+    """
+    Online status scheduling: when each video was last checked, since when its status has been unchanged and when
+    it is due again. Status changes are logged to video_status_history by a trigger, whoever made the change.
+    """
+    _add_column(cursor, "videos", "last_status_check", "TEXT DEFAULT NULL")
+    _add_column(cursor, "videos", "status_stable_since", "TEXT DEFAULT NULL")
+    _add_column(cursor, "videos", "next_status_check", "TEXT DEFAULT NULL")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_next_status_check ON videos(next_status_check)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS video_status_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_pk INTEGER NOT NULL,
+            changed_at TEXT NOT NULL,
+            is_lost_media INTEGER,
+            FOREIGN KEY(video_pk) REFERENCES videos(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_video_status_history_video ON video_status_history(video_pk)")
+    # The first check of a video that turns out to be online is not a change worth keeping
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS videos_status_history_au AFTER UPDATE OF is_lost_media ON videos
+        WHEN old.is_lost_media IS NOT new.is_lost_media AND (old.is_lost_media IS NOT NULL OR new.is_lost_media IS 1)
+        BEGIN
+            INSERT INTO video_status_history (video_pk, changed_at, is_lost_media)
+            VALUES (new.id, IFNULL(new.last_status_check, strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime')),
+                    new.is_lost_media);
+        END
+    """)
+
+
+def _migration_11(cursor):
+    """When each video first and last appeared in its channel's listing, so a full refresh can spot removals."""
+    _add_column(cursor, "videos", "first_seen", "TEXT DEFAULT NULL")
+    _add_column(cursor, "videos", "last_seen", "TEXT DEFAULT NULL")
+
+
+def _migration_12(cursor):
+    """
+    Where a video's metadata came from: 'file' when yt-dlp wrote the info.json, 'api' for the fast mode that
+    only fills the database from videos.list. API metadata counts towards channel_stats.metadata_count as well.
+    """
+    _add_column(cursor, "videos", "metadata_source", "TEXT DEFAULT NULL")
+    cursor.execute("UPDATE videos SET metadata_source = 'file' WHERE is_metadata_downloaded = 1")
+    _create_channel_stats_triggers(cursor, STATS_HAS_METADATA, STATS_WATCHED_COLUMNS + ", metadata_source")
+
+
+def _migration_13(cursor):
+    """
+    Moves the description_<date>.txt backups that older builds wrote into each channel's metadata folder into the
+    channel description history. The files themselves are left where they are.
+    """
+    history = DescriptionHistory("channel")
+    channels = cursor.execute("""
+        SELECT channel_id, description, last_fetch_date FROM channels WHERE channel_id IS NOT NULL
+    """).fetchall()
+    for channel_id, description, last_fetch_date in channels:
+        folder = METADATA_DIR / channel_id
+        if not folder.is_dir():
+            continue
+
+        older = []
+        for path in folder.glob("* description_*.txt"):
+            try:
+                text = path.read_text(encoding="utf-8")
+                match = LEGACY_DESCRIPTION_RE.search(path.name)
+                if match:
+                    date, hour, minute, second, fraction = match.groups()
+                    recorded_at = f"{date}T{hour}:{minute}:{second}" + (f".{fraction}" if fraction else "")
+                else:
+                    # Written when the previous fetch date was unknown
+                    recorded_at = datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+            except OSError:
+                continue
+            older.append((recorded_at, text))
+
+        if older:
+            older.sort()
+            history.import_older_versions(cursor, channel_id, [(text, recorded_at) for recorded_at, text in older],
+                                          description, last_fetch_date)
+
+
+def _migration_14(cursor):
+    """Recreates the channel_stats triggers, whose "INSERT OR IGNORE" made upserts of existing videos fail."""
+    cursor.execute("DROP TRIGGER IF EXISTS channel_stats_channel_ai")
+    cursor.execute("""
+        CREATE TRIGGER channel_stats_channel_ai AFTER INSERT ON channels BEGIN
+            INSERT INTO channel_stats(channel_pk) SELECT new.id
+            WHERE NOT EXISTS (SELECT 1 FROM channel_stats WHERE channel_pk = new.id);
+        END
+    """)
+    _create_channel_stats_triggers(cursor, STATS_HAS_METADATA, STATS_WATCHED_COLUMNS + ", metadata_source")
+
+
+def _migration_15(cursor):
+    """Videos that exist but are private or can't be embedded, settled by the status check like online ones."""
+    _add_column(cursor, "videos", "is_restricted", "INTEGER DEFAULT 0")
+
+
+def _migration_16(cursor):
+    """
+    Indexes matching the keyset pages of LibraryService.query_videos, one per sort key, so a page inside a
+    channel is read straight off the index in order instead of sorting the whole channel. The expressions must
+    stay identical to SORT_EXPRESSIONS for SQLite to use them.
+    """
+    for name, columns in KEYSET_SORT_INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_videos_channel_{name} ON videos(channel_pk, {columns})")
+
+
+def _migration_17(cursor):
+    """
+    Index matching both queries of the background status check: never checked videos (next_status_check IS NULL)
+    newest upload first, and overdue ones by due date. It replaces the plain next_status_check index.
+    """
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_videos_status_due ON videos(next_status_check, IFNULL(upload_date, ''))
+    """)
+    cursor.execute("DROP INDEX IF EXISTS idx_videos_next_status_check")
+
+
+# Ordered list of schema migrations. The position in this list (1-based) is the value stored in PRAGMA user_version
+# once the migration has been applied, so new migrations must only ever be appended.
+MIGRATIONS = [
+    _migration_1,
+    _migration_2,
+    _migration_3,
+    _migration_4,
+    _migration_5,
+    _migration_6,
+    _migration_7,
+    _migration_8,
+    _migration_9,
+    _migration_10,
+    _migration_11,
+    _migration_12,
+    _migration_13,
+    _migration_14,
+    _migration_15,
+    _migration_16,
+    _migration_17,
+]
+
+
+def run_migrations(conn):
+    """Applies every migration newer than the database's user_version, each in its own transaction."""
+    current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if current_version >= len(MIGRATIONS):
+        return _ensure_fts_on_startup(conn)
+
+    # Table rebuilds must not trigger cascades while the old and new tables coexist
+    conn.execute("PRAGMA foreign_keys = OFF")
+
+    for version, migration in enumerate(MIGRATIONS, start=1):
+        if version <= current_version:
+            continue
+
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {version}")
+            cursor.execute("COMMIT")
+        except sqlite3.Error:
+            cursor.execute("ROLLBACK")
+            raise
+
+    _ensure_fts_on_startup(conn)
+
+    # Refresh the query planner statistics so the new indexes are actually picked
+    conn.execute("ANALYZE")
+    conn.commit()
+    return True
+
+
+def _ensure_fts_on_startup(conn):
+    """The FTS step of _migration_2 is not tied to user_version, so it is retried until it succeeds."""
+    cursor = conn.cursor()
+    cursor.execute("BEGIN")
+    try:
+        created = _ensure_fts(cursor)
+        cursor.execute("COMMIT")
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK")
+        raise
+    return created
+
 
 def initialize_database():
     conn = sqlite3.connect(DB_PATH)
@@ -57,6 +666,7 @@ def initialize_database():
             thumb_filepath TEXT,
             is_lost_media INTEGER DEFAULT NULL,
             last_metadata_fetch_date TEXT DEFAULT NULL,
+            last_download_date TEXT DEFAULT NULL,
             FOREIGN KEY(channel_name) REFERENCES channels(name) ON DELETE CASCADE
         )
     """)
@@ -105,4 +715,6 @@ def initialize_database():
         """)
 
     conn.commit()
+
+    run_migrations(conn)
     conn.close()
\ No newline at end of file
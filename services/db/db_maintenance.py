@@ -0,0 +1,164 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from config import DB_PATH, BACKUPS_DIR
+from services.db.db_manager import DatabaseManager
+
+BACKUP_PREFIX = "database-"
+
+
+class DatabaseMaintenance:
+    """
+    Background housekeeping for the SQLite file: truncates the WAL once it grows past a limit, runs
+    PRAGMA optimize and ANALYZE on a schedule and takes online backups with the sqlite3 backup API.
+    Every task can also be run by hand from Settings -> Database.
+    """
+
+    def __init__(self, settings_service, check_interval=60):
+        self.settings = settings_service
+        self.check_interval = check_interval
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        # Scheduled and manual runs never overlap
+        self._task_lock = threading.Lock()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="DatabaseMaintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop_event.wait(self.check_interval):
+            try:
+                self.run_scheduled()
+            except (sqlite3.Error, OSError) as e:
+                print(f"DB MAINTENANCE ERROR: {e}")
+
+    def run_scheduled(self):
+        """Runs whatever is due right now."""
+        if self.get_wal_size() > self.settings.get_db_wal_limit_mb() * 1024 * 1024:
+            self.checkpoint()
+        if self._is_due("optimize", self.settings.get_db_optimize_hours()):
+            self.optimize()
+        if self._is_due("analyze", self.settings.get_db_analyze_hours()):
+            self.analyze()
+        if self._is_due("backup", self.settings.get_db_backup_hours()):
+            self.backup()
+
+    def _is_due(self, task, interval_hours):
+        if not interval_hours:
+            return False
+        last_run = self.settings.get_db_last_run(task)
+        if not last_run:
+            return True
+        return datetime.now() - datetime.fromisoformat(last_run) >= timedelta(hours=interval_hours)
+
+    def _mark_done(self, task):
+        self.settings.set_db_last_run(task, datetime.now().isoformat(timespec="seconds"))
+
+    # --- Tasks ---
+    @staticmethod
+    def get_wal_size():
+        try:
+            return os.path.getsize(f"{DB_PATH}-wal")
+        except OSError:
+            return 0
+
+    def checkpoint(self):
+        """Copies the WAL back into the database and truncates it. Returns (busy, wal_pages, checkpointed_pages)."""
+        with self._task_lock:
+            conn = DatabaseManager.get_connection()
+            result = tuple(conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone())
+            self._mark_done("checkpoint")
+            return result
+
+    def optimize(self):
+        with self._task_lock:
+            DatabaseManager.get_connection().execute("PRAGMA optimize")
+            self._mark_done("optimize")
+
+    def analyze(self):
+        with self._task_lock:
+            conn = DatabaseManager.get_connection()
+            conn.execute("ANALYZE")
+            conn.commit()
+            self._mark_done("analyze")
+
+    def vacuum(self):
+        """Rewrites the whole file to give free pages back. Blocks writers while it runs."""
+        with self._task_lock:
+            conn = DatabaseManager.get_connection()
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._mark_done("vacuum")
+
+    def backup(self, progress_callback=None):
+        """
+        Copies the live database to BACKUPS_DIR and returns the new file's path. progress_callback(copied_pages,
+        total_pages) is called once the copy is done.
+
+        The copy is a single step: a stepped backup restarts from the first page whenever another connection
+        commits, which the DatabaseWriter does every second while workers run, so it could loop forever. In WAL mode
+        the single step only holds a read snapshot, so the writer keeps committing meanwhile.
+        """
+        with self._task_lock:
+            target = BACKUPS_DIR / f"{BACKUP_PREFIX}{datetime.now().strftime('%Y%m%d-%H%M%S')}.db"
+            partial = target.with_name(target.name + ".partial")
+
+            def on_progress(_status, remaining, total):
+                if progress_callback:
+                    progress_callback(total - remaining, total)
+
+            src = DatabaseManager.get_connection()
+            dst = sqlite3.connect(partial)
+            try:
+                src.backup(dst, pages=-1, progress=on_progress)
+            finally:
+                dst.close()
+
+            # Only complete copies get the real name
+            partial.replace(target)
+            self._prune_backups()
+            self._mark_done("backup")
+            return target
+
+    def _prune_backups(self):
+        keep = self.settings.get_db_backup_keep()
+        for old in self.list_backups()[keep:]:
+            try:
+                old["path"].unlink()
+            except OSError as e:
+                print(f"Could not delete old backup {old['path']}: {e}")
+
+    @staticmethod
+    def list_backups():
+        """Newest first."""
+        backups = []
+        for path in BACKUPS_DIR.glob(f"{BACKUP_PREFIX}*.db"):
+            stat = path.stat()
+            backups.append({"path": path, "bytes": stat.st_size, "modified": stat.st_mtime})
+        backups.sort(key=lambda b: b["modified"], reverse=True)
+        return backups
+
+    def get_status(self):
+        try:
+            db_bytes = os.path.getsize(DB_PATH)
+        except OSError:
+            db_bytes = 0
+        return {
+            "db_bytes": db_bytes,
+            "wal_bytes": self.get_wal_size(),
+            "last_runs": {task: self.settings.get_db_last_run(task)
+                          for task in ("checkpoint", "optimize", "analyze", "vacuum", "backup")},
+            "backups": self.list_backups(),
+            "busy": self._task_lock.locked(),
+        }
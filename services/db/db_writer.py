@@ -0,0 +1,181 @@
+import queue
+import sqlite3
+import threading
+import time
+from services.db.db_manager import DatabaseManager
+
+_STOP = object()
+
+# How often a waiting flush() checks that the writer thread is still there to answer it
+FLUSH_POLL_INTERVAL = 0.5
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class DatabaseWriter:
+    """
+    Single background thread that owns all high-frequency row updates coming from the worker threads.
+    Statements are queued without touching SQLite and committed together, either once a batch fills up or
+    after flush_interval seconds, so workers never wait on the database lock.
+    """
+
+    def __init__(self, batch_size=200, flush_interval=1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "statements": 0,
+            "commits": 0,
+            "errors": 0,
+            "last_commit_ms": 0.0,
+            "max_commit_ms": 0.0,
+            "total_commit_ms": 0.0,
+        }
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="DatabaseWriter", daemon=True)
+                self._thread.start()
+
+    def submit(self, sql, params=()):
+        """Queues a write statement. Returns immediately."""
+        self._ensure_started()
+        self._queue.put((sql, params))
+
+    def submit_call(self, job):
+        """
+        Queues job(conn), run on the writer's connection inside the next batch, for writes that need to read the
+        row first. The job must not commit. Returns immediately.
+        """
+        self._ensure_started()
+        self._queue.put((job, None))
+
+    def flush(self, timeout=30):
+        """
+        Blocks until everything queued so far has been committed. Returns False on timeout. When the writer thread
+        was stopped or died, the queued statements are committed on the calling thread instead of waiting for it.
+        """
+        if self._thread is None:
+            return True
+        request = _FlushRequest()
+        self._queue.put(request)
+
+        deadline = time.monotonic() + timeout
+        while not request.done.wait(min(FLUSH_POLL_INTERVAL, max(0.0, deadline - time.monotonic()))):
+            if not self._thread.is_alive():
+                self._drain_inline()
+                return True
+            if time.monotonic() >= deadline:
+                return False
+        return True
+
+    def _drain_inline(self):
+        pending = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _FlushRequest):
+                item.done.set()
+            elif item is not _STOP:
+                pending.append(item)
+        self._commit(DatabaseManager.get_connection(), pending)
+
+    def stop(self, timeout=30):
+        """Commits whatever is still queued and ends the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_commit_ms"] = stats["total_commit_ms"] / stats["commits"] if stats["commits"] else 0.0
+        return stats
+
+    def _run(self):
+        conn = DatabaseManager.get_connection()
+        pending = []
+        deadline = None
+
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # Time based flush
+                self._commit(conn, pending)
+                pending = []
+                continue
+
+            if item is _STOP:
+                self._commit(conn, pending)
+                return
+
+            if isinstance(item, _FlushRequest):
+                self._commit(conn, pending)
+                pending = []
+                item.done.set()
+                continue
+
+            if not pending:
+                deadline = time.monotonic() + self.flush_interval
+            pending.append(item)
+
+            if len(pending) >= self.batch_size:
+                self._commit(conn, pending)
+                pending = []
+
+    @staticmethod
+    def _run_job(conn, job):
+        # A failing job is rolled back on its own, like a single failing statement
+        conn.execute("SAVEPOINT writer_job")
+        try:
+            job(conn)
+        except sqlite3.Error:
+            conn.execute("ROLLBACK TO writer_job")
+            raise
+        finally:
+            conn.execute("RELEASE writer_job")
+
+    def _commit(self, conn, pending):
+        if not pending:
+            return
+
+        started = time.perf_counter()
+        errors = 0
+        try:
+            with conn:
+                for sql, params in pending:
+                    try:
+                        if callable(sql):
+                            self._run_job(conn, sql)
+                        else:
+                            conn.execute(sql, params)
+                    except sqlite3.Error as e:
+                        # A single bad statement must not throw away the rest of the batch
+                        errors += 1
+                        print(f"DB WRITER ERROR: {e}")
+        except sqlite3.Error as e:
+            errors = len(pending)
+            print(f"DB WRITER COMMIT FAILED ({len(pending)} statements lost): {e}")
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self._stats["statements"] += len(pending) - errors
+            self._stats["errors"] += errors
+            self._stats["commits"] += 1
+            self._stats["last_commit_ms"] = elapsed_ms
+            self._stats["total_commit_ms"] += elapsed_ms
+            self._stats["max_commit_ms"] = max(self._stats["max_commit_ms"], elapsed_ms)
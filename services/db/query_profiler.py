@@ -0,0 +1,198 @@
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# Statements worth asking the planner about when they turn out slow
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+def normalize_sql(sql):
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+class QueryProfiler:
+    """
+    Optional per-statement instrumentation for every pooled connection. While enabled, each statement's time and
+    row count is added to a per-statement aggregate, and anything slower than the threshold is kept in a ring
+    buffer together with its EXPLAIN QUERY PLAN output. When disabled the only cost is a flag check.
+    """
+    enabled = False
+    threshold_ms = 50.0
+
+    _lock = threading.Lock()
+    _slow_queries = deque(maxlen=200)
+    _aggregates = {}
+
+    @classmethod
+    def configure(cls, enabled, threshold_ms=None):
+        cls.enabled = bool(enabled)
+        if threshold_ms is not None:
+            cls.threshold_ms = float(threshold_ms)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._slow_queries.clear()
+            cls._aggregates.clear()
+
+    @classmethod
+    def record(cls, conn, sql, params, elapsed_ms, rows):
+        key = normalize_sql(sql)
+        with cls._lock:
+            agg = cls._aggregates.get(key)
+            if agg is None:
+                agg = cls._aggregates[key] = {"sql": key, "calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+            agg["calls"] += 1
+            agg["total_ms"] += elapsed_ms
+            agg["max_ms"] = max(agg["max_ms"], elapsed_ms)
+            agg["rows"] += max(rows, 0)
+
+        if elapsed_ms < cls.threshold_ms:
+            return
+
+        entry = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "thread": threading.current_thread().name,
+            "sql": key,
+            "elapsed_ms": elapsed_ms,
+            "rows": rows,
+            "plan": cls._explain(conn, sql, params),
+        }
+        with cls._lock:
+            cls._slow_queries.append(entry)
+
+    @staticmethod
+    def _explain(conn, sql, params):
+        if params is None or not normalize_sql(sql).upper().startswith(_EXPLAINABLE):
+            return ""
+        try:
+            # A plain cursor, so the EXPLAIN itself isn't profiled
+            rows = sqlite3.Cursor(conn).execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            return " | ".join(str(row[-1]) for row in rows)
+        except sqlite3.Error as e:
+            return f"(plan unavailable: {e})"
+
+    @classmethod
+    def get_top_statements(cls, limit=20, order_by="total_ms"):
+        with cls._lock:
+            stats = [dict(agg) for agg in cls._aggregates.values()]
+        stats.sort(key=lambda agg: agg[order_by], reverse=True)
+        return stats[:limit]
+
+    @classmethod
+    def get_slow_queries(cls):
+        """Most recent first."""
+        with cls._lock:
+            return list(reversed(cls._slow_queries))
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    Times execute() and the fetch that follows it. A SELECT does most of its work while rows are fetched, so
+    queries that return rows are recorded once they have been fetched (through fetch*() or by iterating the
+    cursor), writes right after execute(). A query whose rows are never read is recorded with the execute() time
+    when the cursor runs its next statement or is closed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = None
+
+    def _flush_pending(self, extra_ms=0.0, rows=-1):
+        if self._pending is not None:
+            sql, params, elapsed_ms = self._pending
+            self._pending = None
+            QueryProfiler.record(self.connection, sql, params, elapsed_ms + extra_ms, rows)
+
+    def execute(self, sql, parameters=()):
+        if not QueryProfiler.enabled:
+            return super().execute(sql, parameters)
+
+        self._flush_pending()
+        started = time.perf_counter()
+        super().execute(sql, parameters)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if self.description is not None:
+            self._pending = (sql, parameters, elapsed_ms)
+        else:
+            QueryProfiler.record(self.connection, sql, parameters, elapsed_ms, self.rowcount)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        if not QueryProfiler.enabled:
+            return super().executemany(sql, seq_of_parameters)
+
+        self._flush_pending()
+        started = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        # Parameters may have been a one-shot iterator, so there is nothing to EXPLAIN with
+        QueryProfiler.record(self.connection, sql, None, elapsed_ms, self.rowcount)
+        return self
+
+    def __iter__(self):
+        # Only wrapped while a profiled query is pending, so unprofiled iteration stays in C
+        if self._pending is None:
+            return self
+        return self._iter_profiled()
+
+    def _iter_profiled(self):
+        fetchone = super().fetchone
+        elapsed_ms, rows = 0.0, 0
+        try:
+            while True:
+                started = time.perf_counter()
+                row = fetchone()
+                elapsed_ms += (time.perf_counter() - started) * 1000
+                if row is None:
+                    return
+                rows += 1
+                yield row
+        finally:
+            # Also runs when the loop breaks early and the generator is closed
+            self._flush_pending(elapsed_ms, rows)
+
+    def close(self):
+        self._flush_pending()
+        super().close()
+
+    def fetchall(self):
+        if self._pending is None:
+            return super().fetchall()
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._flush_pending((time.perf_counter() - started) * 1000, len(rows))
+        return rows
+
+    def fetchmany(self, size=None):
+        if self._pending is None:
+            return super().fetchmany(size if size is not None else self.arraysize)
+        started = time.perf_counter()
+        rows = super().fetchmany(size if size is not None else self.arraysize)
+        self._flush_pending((time.perf_counter() - started) * 1000, len(rows))
+        return rows
+
+    def fetchone(self):
+        if self._pending is None:
+            return super().fetchone()
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._flush_pending((time.perf_counter() - started) * 1000, 0 if row is None else 1)
+        return row
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors (including the ones made by execute()) are ProfiledCursors."""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,163 @@
+import difflib
+import hashlib
+import json
+import zlib
+from datetime import datetime
+
+# Owner kind -> version table. Owners are identified by their YouTube channel_id / video_id.
+HISTORY_TABLES = {
+    "channel": "channel_description_versions",
+    "video": "video_description_versions",
+}
+
+# A new keyframe is stored after this many deltas, or when a delta would not be much smaller than the full text
+KEYFRAME_INTERVAL = 10
+MAX_DELTA_RATIO = 0.6
+
+
+def content_hash(text):
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+
+def _compress(obj):
+    return zlib.compress(json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), 9)
+
+
+def _decompress(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def make_delta(base, text):
+    """Line based edit script turning base into text: ["=", start, end] copies base lines, ["+", lines] inserts."""
+    base_lines = base.splitlines(keepends=True)
+    new_lines = text.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, base_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["=", i1, i2])
+        elif j2 > j1:
+            ops.append(["+", new_lines[j1:j2]])
+    return ops
+
+
+def apply_delta(base, ops):
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in ops:
+        if op[0] == "=":
+            parts.extend(base_lines[op[1]:op[2]])
+        else:
+            parts.extend(op[1])
+    return "".join(parts)
+
+
+class DescriptionHistory:
+    """
+    Version store for channel or video descriptions. Every distinct text is stored once per owner: a text that
+    was seen before is recorded as a pointer to that version, new texts are stored as a zlib-compressed line delta
+    against the owner's latest keyframe, and a fresh keyframe is written every few versions so rebuilding any
+    version needs at most one delta. Owners are keyed on the immutable YouTube ID.
+
+    Nothing is stored for descriptions that never change: the first version is only written once a second,
+    different text comes in.
+    """
+
+    def __init__(self, kind):
+        self.table = HISTORY_TABLES[kind]
+
+    def _latest(self, conn, owner_id):
+        return conn.execute(f"""
+            SELECT version, content_hash FROM {self.table} WHERE owner_id = ? ORDER BY version DESC LIMIT 1
+        """, (owner_id,)).fetchone()
+
+    def _insert(self, conn, owner_id, version, text, recorded_at):
+        digest = content_hash(text)
+
+        # Seen before: just point at the earlier version
+        same = conn.execute(f"""
+            SELECT version FROM {self.table} WHERE owner_id = ? AND content_hash = ? AND kind != 'same'
+            ORDER BY version DESC LIMIT 1
+        """, (owner_id, digest)).fetchone()
+        if same:
+            kind, base_version, data = "same", same[0], None
+        else:
+            keyframe = conn.execute(f"""
+                SELECT version, data FROM {self.table} WHERE owner_id = ? AND kind = 'key'
+                ORDER BY version DESC LIMIT 1
+            """, (owner_id,)).fetchone()
+            full = _compress(text)
+            kind, base_version, data = "key", None, full
+            if keyframe and version - keyframe[0] < KEYFRAME_INTERVAL:
+                delta = _compress(make_delta(_decompress(keyframe[1]), text))
+                if len(delta) < len(full) * MAX_DELTA_RATIO:
+                    kind, base_version, data = "delta", keyframe[0], delta
+
+        conn.execute(f"""
+            INSERT INTO {self.table} (owner_id, version, kind, base_version, content_hash, data, recorded_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (owner_id, version, kind, base_version, digest, data, recorded_at))
+        return version
+
+    def record_change(self, conn, owner_id, old_text, new_text, old_date=None, new_date=None):
+        """
+        Records new_text as the owner's latest description, with old_text (observed at old_date) as the version
+        before it if the owner has no history yet. Returns the new version number, or None if nothing changed.
+        The caller commits.
+        """
+        old_text, new_text = old_text or "", new_text or ""
+        if not owner_id or old_text.strip() == new_text.strip():
+            return None
+
+        latest = self._latest(conn, owner_id)
+        if latest is None:
+            if not old_text.strip():
+                return None  # First description ever seen, nothing to version yet
+            self._insert(conn, owner_id, 1, old_text, old_date)
+            latest = (1, content_hash(old_text))
+        if latest[1] == content_hash(new_text):
+            return None
+        return self._insert(conn, owner_id, latest[0] + 1, new_text, new_date or datetime.now().isoformat())
+
+    def import_older_versions(self, conn, owner_id, older, current_text=None, current_date=None):
+        """
+        Puts older texts, [(text, recorded_at)] oldest first, in front of the owner's history and rewrites it in
+        order, dropping consecutive duplicates. current_text (observed at current_date) is the newest version when
+        the owner has no history yet. Returns the number of versions stored. The caller commits.
+        """
+        newer = [(self.get_text(conn, owner_id, version["version"]), version["recorded_at"])
+                 for version in self.get_versions(conn, owner_id)]
+        if not newer and current_text:
+            newer = [(current_text, current_date)]
+
+        conn.execute(f"DELETE FROM {self.table} WHERE owner_id = ?", (owner_id,))
+        version, last_hash = 0, None
+        for text, recorded_at in list(older) + newer:
+            if text is None or content_hash(text) == last_hash:
+                continue
+            version += 1
+            self._insert(conn, owner_id, version, text, recorded_at)
+            last_hash = content_hash(text)
+        return version
+
+    def get_versions(self, conn, owner_id):
+        """[{version, kind, content_hash, recorded_at, size}] oldest first; size is the stored bytes."""
+        rows = conn.execute(f"""
+            SELECT version, kind, content_hash, recorded_at, LENGTH(data) AS size FROM {self.table}
+            WHERE owner_id = ? ORDER BY version
+        """, (owner_id,)).fetchall()
+        return [dict(zip(("version", "kind", "content_hash", "recorded_at", "size"), row)) for row in rows]
+
+    def get_text(self, conn, owner_id, version):
+        """Rebuilds one version of a description. Returns None if it doesn't exist."""
+        row = conn.execute(f"SELECT kind, base_version, data FROM {self.table} WHERE owner_id = ? AND version = ?",
+                           (owner_id, version)).fetchone()
+        if row is None:
+            return None
+        kind, base_version, data = row
+        if kind == "key":
+            return _decompress(data)
+        base = self.get_text(conn, owner_id, base_version)
+        if base is None:
+            return None
+        return base if kind == "same" else apply_delta(base, _decompress(data))
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+MEDIA_EXTENSIONS = ('.mp4', '.mkv', '.webm', '.avi', '.mov')
+
+# How long a listing is trusted before the directory's mtime is checked again
+REVALIDATE_SECONDS = 2.0
+
+# Coarsest directory mtime resolution around (FAT). A folder changed this recently can change again without its
+# mtime moving, so a listing scanned in that window is never trusted on its mtime alone.
+MTIME_GRANULARITY_NS = 2_000_000_000
+
+# Folders kept, least recently used ones are dropped first
+MAX_LISTINGS = 1024
+
+
+class _Listing:
+    def __init__(self, mtime_ns, stems, sizes):
+        self.mtime_ns = mtime_ns
+        self.stems = stems
+        self.sizes = sizes
+        self.checked_at = time.monotonic()
+        self.racy = mtime_ns is not None and time.time_ns() - mtime_ns < MTIME_GRANULARITY_NS
+
+
+class DirectoryIndex:
+    """
+    Process-wide cache of folder listings. A folder is read with a single os.scandir and every file in it is
+    filed under each of its dotted stems ("a.info.json" under "a" and "a.info"), so checking whether
+    "<base>.<ext>" exists is a dict lookup instead of a stat call. Listings are re-read when the folder's mtime
+    changes, which happens whenever a file is added, removed or renamed in it. File sizes come from the same
+    scan (free on Windows, where scandir already returns them). At most MAX_LISTINGS folders are kept.
+    """
+    _lock = threading.Lock()
+    _listings = OrderedDict()
+
+    @classmethod
+    def _scan(cls, directory):
+        stems = {}
+        sizes = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    name = entry.name
+                    try:
+                        sizes[name] = entry.stat().st_size
+                    except OSError:
+                        pass
+                    dot = name.find(".")
+                    while dot > 0:
+                        stems.setdefault(name[:dot], []).append(name)
+                        dot = name.find(".", dot + 1)
+                    stems.setdefault(name, []).append(name)
+        except OSError:
+            pass
+        return stems, sizes
+
+    @classmethod
+    def _get_listing(cls, directory):
+        key = os.fspath(directory)
+        with cls._lock:
+            listing = cls._listings.get(key)
+            if listing is not None:
+                cls._listings.move_to_end(key)
+        if listing is not None and listing.racy:
+            listing = None
+        if listing is not None and time.monotonic() - listing.checked_at < REVALIDATE_SECONDS:
+            return listing
+
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        if listing is not None and listing.mtime_ns == mtime_ns:
+            listing.checked_at = time.monotonic()
+            return listing
+
+        listing = _Listing(mtime_ns, *(cls._scan(key) if mtime_ns is not None else ({}, {})))
+        with cls._lock:
+            cls._listings[key] = listing
+            cls._listings.move_to_end(key)
+            while len(cls._listings) > MAX_LISTINGS:
+                cls._listings.popitem(last=False)
+        return listing
+
+    @classmethod
+    def get_stems(cls, directory):
+        """Returns {stem: [file names]} for a folder. Missing folders are empty."""
+        return cls._get_listing(directory).stems
+
+    @classmethod
+    def size(cls, path):
+        """Size in bytes of a file as of the last scan of its folder, 0 if it isn't there."""
+        path = Path(path)
+        return cls._get_listing(path.parent).sizes.get(path.name, 0)
+
+    @classmethod
+    def exists(cls, path):
+        path = Path(path)
+        return path.name in cls.get_stems(path.parent)
+
+    @classmethod
+    def find(cls, base_path, suffixes):
+        """First existing "<base_path><suffix>" in the order given, or None. Suffixes match case-insensitively."""
+        base_path = Path(base_path)
+        names = cls.get_stems(base_path.parent).get(base_path.name, ())
+        by_suffix = {name[len(base_path.name):].lower(): name for name in names}
+        for suffix in suffixes:
+            name = by_suffix.get(suffix.lower())
+            if name is not None:
+                return base_path.parent / name
+        return None
+
+    @classmethod
+    def invalidate(cls, directory=None):
+        with cls._lock:
+            if directory is None:
+                cls._listings.clear()
+            else:
+                cls._listings.pop(os.fspath(directory), None)
@@ -0,0 +1,247 @@
+import gzip
+import http.client
+import json
+import os
+import threading
+import urllib.parse
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from config import HTTP_CACHE_PATH
+
+DEFAULT_TIMEOUT = 20
+USER_AGENT = "Mozilla/5.0"
+
+# Idle keep-alive connections kept per host
+MAX_IDLE_PER_HOST = 8
+MAX_REDIRECTS = 5
+# Validators remembered for conditional requests, oldest dropped first
+MAX_CACHE_ENTRIES = 5000
+# Changed validators are written to disk at most this often, and on shutdown
+VALIDATORS_SAVE_DELAY = 10
+
+
+class HttpError(OSError):
+    """The request could not be completed at all (DNS, refused, timeout, broken connection)."""
+
+
+class HttpResponse:
+    def __init__(self, status, headers, body, url):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.url = url
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    @property
+    def not_modified(self):
+        return self.status == 304
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8"))
+
+
+class HttpClient:
+    """
+    Process-wide HTTP transport for the services. Connections are kept alive and pooled per host so repeated calls
+    to the same API or image server skip the TCP and TLS handshake, every request has a timeout, responses are
+    gzip-compressed, and downloads remember ETag / Last-Modified so an unchanged file is answered with a 304
+    instead of being sent again.
+    """
+    _lock = threading.Lock()
+    _idle = {}
+    _validators = None
+    _validators_dirty = False
+    _save_timer = None
+    _save_lock = threading.Lock()
+
+    # --- Connection pool ---
+    @classmethod
+    def _acquire(cls, scheme, netloc, timeout):
+        with cls._lock:
+            idle = cls._idle.get((scheme, netloc))
+            if idle:
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return conn_class(netloc, timeout=timeout), False
+
+    @classmethod
+    def _release(cls, scheme, netloc, conn):
+        with cls._lock:
+            idle = cls._idle.setdefault((scheme, netloc), [])
+            if len(idle) < MAX_IDLE_PER_HOST:
+                idle.append(conn)
+                return
+        conn.close()
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            pools, cls._idle = cls._idle, {}
+        for idle in pools.values():
+            for conn in idle:
+                conn.close()
+
+    # --- Requests ---
+    @classmethod
+    def _send(cls, method, url, headers, timeout):
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        # A pooled connection may have been closed by the server while idle; retry once on a fresh one
+        for attempt in range(2):
+            conn, reused = cls._acquire(parts.scheme, parts.netloc, timeout)
+            try:
+                conn.request(method, path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                if reused and attempt == 0 and not isinstance(e, TimeoutError):
+                    continue
+                raise HttpError(f"{method} {parts.netloc}: {e}") from e
+
+            if resp.will_close:
+                conn.close()
+            else:
+                cls._release(parts.scheme, parts.netloc, conn)
+            return resp, body
+        raise HttpError(f"{method} {parts.netloc}: connection lost")
+
+    @classmethod
+    def request(cls, url, headers=None, timeout=DEFAULT_TIMEOUT, method="GET"):
+        """
+        Sends a request and returns an HttpResponse for any status code, following redirects. Raises HttpError if
+        no response was received.
+        """
+        send_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip", **(headers or {})}
+        for _ in range(MAX_REDIRECTS + 1):
+            resp, body = cls._send(method, url, send_headers, timeout)
+            location = resp.getheader("Location")
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+
+            encoding = (resp.getheader("Content-Encoding") or "").lower()
+            try:
+                if encoding == "gzip":
+                    body = gzip.decompress(body)
+                elif encoding == "deflate":
+                    body = zlib.decompress(body)
+            except (OSError, zlib.error) as e:
+                raise HttpError(f"Bad {encoding} body from {url}: {e}") from e
+            return HttpResponse(resp.status, dict(resp.getheaders()), body, url)
+        raise HttpError(f"Too many redirects for {url}")
+
+    @classmethod
+    def get_json(cls, url, timeout=DEFAULT_TIMEOUT):
+        return cls.request(url, {"Accept": "application/json"}, timeout).json()
+
+    # --- Conditional downloads ---
+    @classmethod
+    def _load_validators(cls):
+        if cls._validators is None:
+            try:
+                with open(HTTP_CACHE_PATH, "r", encoding="utf-8") as f:
+                    cls._validators = json.load(f)
+            except (OSError, ValueError):
+                cls._validators = {}
+        return cls._validators
+
+    @classmethod
+    def _schedule_save(cls):
+        # Called with _lock held
+        cls._validators_dirty = True
+        if cls._save_timer is None:
+            cls._save_timer = threading.Timer(VALIDATORS_SAVE_DELAY, cls.flush_validators)
+            cls._save_timer.daemon = True
+            cls._save_timer.start()
+
+    @classmethod
+    def flush_validators(cls):
+        """Writes the validators to disk if they changed since the last save."""
+        # _save_lock keeps an older snapshot from landing after a newer one; the file is written outside _lock
+        # so downloads carry on meanwhile
+        with cls._save_lock:
+            with cls._lock:
+                if cls._save_timer is not None:
+                    cls._save_timer.cancel()
+                    cls._save_timer = None
+                if not cls._validators_dirty:
+                    return
+                cls._validators_dirty = False
+                snapshot = dict(cls._validators)
+
+            tmp_path = HTTP_CACHE_PATH.with_suffix(".tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, HTTP_CACHE_PATH)
+            except OSError:
+                pass
+
+    @classmethod
+    def download(cls, url, dest, timeout=DEFAULT_TIMEOUT):
+        """
+        Saves url to dest. If dest already exists the request carries the ETag / Last-Modified seen last time, and
+        the file is left untouched when the server answers 304. Returns True if the file was (re)written.
+        """
+        dest = os.fspath(dest)
+        with cls._lock:
+            cached = cls._load_validators().get(url) if os.path.exists(dest) else None
+
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        resp = cls.request(url, headers, timeout)
+        if resp.not_modified:
+            return False
+        if not resp.ok:
+            raise HttpError(f"HTTP {resp.status} for {url}")
+
+        tmp_path = dest + ".part"
+        with open(tmp_path, "wb") as f:
+            f.write(resp.body)
+        os.replace(tmp_path, dest)
+
+        etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        with cls._lock:
+            validators = cls._load_validators()
+            validators.pop(url, None)
+            if etag or last_modified:
+                validators[url] = {"etag": etag, "last_modified": last_modified}
+                while len(validators) > MAX_CACHE_ENTRIES:
+                    del validators[next(iter(validators))]
+            cls._schedule_save()
+        return True
+
+    @classmethod
+    def download_many(cls, jobs, max_workers=4, timeout=DEFAULT_TIMEOUT):
+        """
+        Runs download() for several (url, dest) pairs at once. Returns {dest: True / False / exception} so one
+        failed image doesn't hide the others.
+        """
+        def run(job):
+            url, dest = job
+            try:
+                return dest, cls.download(url, dest, timeout)
+            except OSError as e:
+                return dest, e
+
+        jobs = [job for job in jobs if job[0]]
+        if not jobs:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)), thread_name_prefix="HttpDownload") as pool:
+            return dict(pool.map(run, jobs))
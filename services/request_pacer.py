@@ -0,0 +1,35 @@
+import random
+import threading
+import time
+
+
+class RequestPacer:
+    """
+    Spaces out requests made by many worker threads against the same site. Each wait() reserves the next free
+    slot, at least min_interval (plus up to jitter) seconds after the previous one, then sleeps until it comes up.
+    """
+
+    def __init__(self, min_interval=1.0, jitter=0.5):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self, stop_event=None):
+        """Blocks until this caller may send its request. Returns False if stop_event was set while waiting."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval + random.uniform(0, self.jitter)
+
+        delay = slot - time.monotonic()
+        if delay > 0:
+            if stop_event is not None:
+                return not stop_event.wait(delay)
+            time.sleep(delay)
+        return stop_event is None or not stop_event.is_set()
+
+    def backoff(self, seconds):
+        """Pushes every following request back, e.g. after the site answered 429."""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
@@ -5,8 +5,20 @@ from services.subservices.addgroup_service import AddGroupService
 from services.subservices.addchannel_service import AddChannelService
 from services.subservices.fetchmetadata_service import FetchMetadataService
 from services.db.database_initializer import initialize_database
+from services.db.db_manager import DatabaseManager
+from services.db.db_writer import DatabaseWriter
+from services.db.db_maintenance import DatabaseMaintenance
 from services.subservices.dlp_download_service import DlpDownloadService
 from services.subservices.insta_service import InstaService
+from services.subservices.library_service import LibraryService
+from services.subservices.database_service import DatabaseService
+from services.subservices.bulk_import_service import BulkImportService
+from services.subservices.sync_service import SyncService
+from services.subservices.liveness_service import LivenessService
+from services.subservices.liveness_scheduler import LivenessScheduler
+from services.request_pacer import RequestPacer
+from services.youtube_api import YouTubeApiClient
+from services.http_client import HttpClient
 
 class AppServices:
     def __init__(self, style):
@@ -20,12 +32,37 @@ class AppServices:
         self.ytdlp = YtDlpService()
         self.account = AccountService()
         self.add_group = AddGroupService()
-        self.add_channel_service = AddChannelService(self.ytdlp, self.settings)
-        self.fetch_metadata = FetchMetadataService()
-        self.dlp_download_service = DlpDownloadService()
+        self.youtube_api = YouTubeApiClient(self.settings)
+        # One writer thread shared by every fetch/download worker
+        self.db_writer = DatabaseWriter()
+        self.liveness = LivenessService(self.settings, self.db_writer, self.youtube_api)
+        self.add_channel_service = AddChannelService(self.ytdlp, self.settings, self.youtube_api, self.liveness)
+        # Shared by every background job that talks to YouTube, so they don't add up to a burst
+        self.request_pacer = RequestPacer()
+        self.bulk_import = BulkImportService(self.add_channel_service, self.youtube_api, self.request_pacer)
+        self.sync = SyncService(self.add_channel_service, self.request_pacer)
+        self.library = LibraryService()
+        self.fetch_metadata = FetchMetadataService(self.db_writer, self.youtube_api)
+        self.dlp_download_service = DlpDownloadService(self.db_writer)
+        self.liveness_scheduler = LivenessScheduler(self.settings, self.liveness)
+        self.liveness_scheduler.start()
+        self.db_maintenance = DatabaseMaintenance(self.settings)
+        self.db_maintenance.start()
+        self.database = DatabaseService(self.settings, self.db_writer, self.db_maintenance)
 
         self.insta = InstaService()
 
+    def shutdown(self):
+        # Commit anything the workers queued, then close the pooled SQLite connections
+        self.bulk_import.stop()
+        self.sync.stop()
+        self.liveness_scheduler.stop()
+        self.db_maintenance.stop()
+        self.db_writer.stop()
+        DatabaseManager.close_all()
+        HttpClient.flush_validators()
+        HttpClient.close_all()
+
     def get_available_themes(self):
         return self.style.theme_names()
 
@@ -2,6 +2,7 @@ import json
 import os
 import sys
 import subprocess
+import threading
 import datetime
 from pathlib import Path
 from config import SETTINGS_PATH, DATA_DIR
@@ -11,6 +12,9 @@ class SettingsService:
     def __init__(self, style_instance=None):
         self.settings_path = SETTINGS_PATH
         self.style = style_instance
+        # Settings are saved from the GUI, the quota tracking in API workers and the maintenance thread. Re-entrant
+        # so a read-modify-write can hold it across its save_settings call.
+        self._lock = threading.RLock()
         self.default_settings = {
             "theme": "darkly",
             "close_to_tray": False,
@@ -19,7 +23,18 @@ class SettingsService:
             "quota_date": "",
             "quota_used": 0,
             "ig_username": "",  # NEW
-            "ig_password": ""   # NEW
+            "ig_password": "",  # NEW
+            "db_profiling": False,
+            "db_slow_query_ms": 50,
+            "db_wal_limit_mb": 64,
+            "db_optimize_hours": 6,
+            "db_analyze_hours": 168,
+            "db_backup_hours": 24,
+            "db_backup_keep": 3,
+            "db_last_runs": {},
+            "liveness_workers": 8,
+            "liveness_timeout": 10,
+            "liveness_hourly_budget": 300
         }
         self.settings = self.load_settings()
 
@@ -38,9 +53,10 @@ class SettingsService:
             return self.default_settings
 
     def save_settings(self, settings_data):
-        with open(self.settings_path, 'w') as f:
-            json.dump(settings_data, f, indent=4)
-        self.settings = settings_data
+        with self._lock:
+            with open(self.settings_path, 'w') as f:
+                json.dump(settings_data, f, indent=4)
+            self.settings = settings_data
 
     def get_theme(self):
         return self.settings.get("theme", "darkly")
@@ -93,6 +109,67 @@ class SettingsService:
         self.settings["ig_password"] = password
         self.save_settings(self.settings)
 
+    # --- Database ---
+    def get_db_profiling(self):
+        return self.settings.get("db_profiling", False)
+
+    def set_db_profiling(self, value):
+        self.settings["db_profiling"] = value
+        self.save_settings(self.settings)
+
+    def get_db_slow_query_ms(self):
+        return self.settings.get("db_slow_query_ms", 50)
+
+    def set_db_slow_query_ms(self, value):
+        self.settings["db_slow_query_ms"] = value
+        self.save_settings(self.settings)
+
+    def get_db_wal_limit_mb(self):
+        return self.settings.get("db_wal_limit_mb", 64)
+
+    def get_db_optimize_hours(self):
+        return self.settings.get("db_optimize_hours", 6)
+
+    def get_db_analyze_hours(self):
+        return self.settings.get("db_analyze_hours", 168)
+
+    def get_db_backup_hours(self):
+        return self.settings.get("db_backup_hours", 24)
+
+    def get_db_backup_keep(self):
+        return self.settings.get("db_backup_keep", 3)
+
+    def set_db_maintenance(self, wal_limit_mb, backup_hours, backup_keep):
+        self.settings["db_wal_limit_mb"] = wal_limit_mb
+        self.settings["db_backup_hours"] = backup_hours
+        self.settings["db_backup_keep"] = backup_keep
+        self.save_settings(self.settings)
+
+    def get_db_last_run(self, task):
+        return self.settings.get("db_last_runs", {}).get(task, "")
+
+    def set_db_last_run(self, task, timestamp):
+        # Called from the maintenance thread
+        with self._lock:
+            self.settings.setdefault("db_last_runs", {})[task] = timestamp
+            self.save_settings(self.settings)
+
+    # --- Online Status Checks ---
+    def get_liveness_workers(self):
+        return self.settings.get("liveness_workers", 8)
+
+    def get_liveness_timeout(self):
+        return self.settings.get("liveness_timeout", 10)
+
+    def get_liveness_hourly_budget(self):
+        return self.settings.get("liveness_hourly_budget", 300)
+
+    def set_liveness_options(self, workers, timeout, hourly_budget):
+        self.settings["liveness_workers"] = workers
+        self.settings["liveness_timeout"] = timeout
+        self.settings["liveness_hourly_budget"] = hourly_budget
+        self.save_settings(self.settings)
+
     # --- Quota Tracking Methods ---
     def get_remaining_quota(self):
         today = datetime.date.today().isoformat()
@@ -106,14 +183,16 @@ class SettingsService:
         used = self.settings.get("quota_used", 0)
         return max(0, 10000 - used)
 
-    def increment_quota_usage(self):
-        today = datetime.date.today().isoformat()
-        saved_date = self.settings.get("quota_date", "")
+    def increment_quota_usage(self, amount=1):
+        # API calls are made from worker threads
+        with self._lock:
+            today = datetime.date.today().isoformat()
+            saved_date = self.settings.get("quota_date", "")
 
-        if saved_date != today:
-            self.settings["quota_date"] = today
-            self.settings["quota_used"] = 1
-        else:
-            self.settings["quota_used"] = self.settings.get("quota_used", 0) + 1
+            if saved_date != today:
+                self.settings["quota_date"] = today
+                self.settings["quota_used"] = amount
+            else:
+                self.settings["quota_used"] = self.settings.get("quota_used", 0) + amount
 
-        self.save_settings(self.settings)
\ No newline at end of file
+            self.save_settings(self.settings)
\ No newline at end of file
@@ -0,0 +1,81 @@
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+
+# yt-dlp stamps every extraction with these, so they would make every snapshot look new
+VOLATILE_KEYS = ("epoch", "_version")
+
+
+def _snapshot_paths(base_path):
+    base_path = os.fspath(base_path)
+    return base_path + ".json.gz", base_path + ".sha256", base_path + ".history.jsonl.gz"
+
+
+def _content_hash(data):
+    stable = {k: v for k, v in data.items() if k not in VOLATILE_KEYS}
+    return hashlib.sha256(json.dumps(stable, sort_keys=True, separators=(",", ":"),
+                                     ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def load_snapshot(base_path):
+    """
+    The latest snapshot written for base_path, or None. Falls back to the pretty-printed "<base_path>.json"
+    snapshots used to be saved as, so the first gzipped write still records what it replaces.
+    """
+    snapshot_path = _snapshot_paths(base_path)[0]
+    try:
+        with gzip.open(snapshot_path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(os.fspath(base_path) + ".json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot(base_path, data, keep_history=True):
+    """
+    Saves data as compact gzipped JSON in "<base_path>.json.gz". Nothing is written when the content hash matches
+    the previous snapshot. With keep_history, the top-level keys the new snapshot replaces are appended to
+    "<base_path>.history.jsonl.gz" first, so earlier versions can be rebuilt without storing them in full.
+    Returns True if a new snapshot was written.
+    """
+    snapshot_path, hash_path, history_path = _snapshot_paths(base_path)
+    digest = _content_hash(data)
+    try:
+        with open(hash_path, "r", encoding="ascii") as f:
+            if f.read().strip() == digest and os.path.exists(snapshot_path):
+                return False
+    except OSError:
+        pass
+
+    if keep_history:
+        previous = load_snapshot(base_path)
+        if previous is not None:
+            changed = {k: v for k, v in previous.items() if k not in VOLATILE_KEYS and data.get(k) != v}
+            added = [k for k in data if k not in previous and k not in VOLATILE_KEYS]
+            record = {"replaced_at": datetime.now().isoformat(), "previous": changed, "added": added}
+            # Appending a gzip member keeps the file a valid gzip stream
+            with gzip.open(history_path, "at", encoding="utf-8") as f:
+                f.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+    tmp_path = snapshot_path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp_path, snapshot_path)
+    with open(hash_path, "w", encoding="ascii") as f:
+        f.write(digest)
+
+    # The legacy plain JSON snapshot was folded into the history above
+    legacy_path = os.fspath(base_path) + ".json"
+    if os.path.exists(legacy_path):
+        try:
+            os.remove(legacy_path)
+        except OSError:
+            pass
+    return True
+
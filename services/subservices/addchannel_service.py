@@ -1,28 +1,94 @@
 import json
+import math
 import sqlite3
 import yt_dlp
 import re
 import traceback
 import typing
-import urllib.request
-from urllib.error import HTTPError, URLError
 from datetime import datetime
 from config import METADATA_DIR, VIDEOS_DIR
 from services.db.db_manager import DatabaseManager
+from services.directory_index import DirectoryIndex, MEDIA_EXTENSIONS
+from services.http_client import HttpClient
+from services.snapshot_store import write_snapshot
+from services.description_history import DescriptionHistory
+from services.youtube_api import YouTubeApiClient, YouTubeApiError, MAX_IDS_PER_CALL
 from yt_dlp.utils import DownloadError
 
 
+# Rows per executemany() batch when ingesting a channel's video list
+UPSERT_CHUNK_SIZE = 500
+
+# Quick refresh reads these channel tabs newest first and stops after this many already known videos in a row
+QUICK_REFRESH_TABS = (("videos", "Videos"), ("shorts", "Shorts"), ("streams", "Lives"))
+QUICK_REFRESH_STOP_AFTER = 10
+
+# Channels are keyed on the immutable YouTube channel_id, so an upstream rename updates the existing row
+CHANNEL_UPSERT_SQL = """
+    INSERT INTO channels (group_pk, name, handle, channel_id, url, title, follower_count, description, tags, thumbnails, creation_date, country, view_count, links, is_lost_media, last_fetch_date, video_count, last_stats_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?)
+    ON CONFLICT(channel_id) DO UPDATE SET
+        name=excluded.name, handle=excluded.handle, url=excluded.url, title=excluded.title,
+        follower_count=excluded.follower_count, description=excluded.description, tags=excluded.tags,
+        thumbnails=excluded.thumbnails, creation_date=excluded.creation_date, country=excluded.country,
+        view_count=excluded.view_count, links=excluded.links, last_fetch_date=excluded.last_fetch_date,
+        video_count=IFNULL(excluded.video_count, channels.video_count),
+        last_stats_date=IFNULL(excluded.last_stats_date, channels.last_stats_date)
+"""
+
+# Batched Data API refresh. Hidden subscriber counts come back as NULL and keep the stored value.
+CHANNEL_STATS_UPDATE_SQL = """
+    UPDATE channels SET
+        follower_count = IFNULL(?, follower_count), view_count = ?, video_count = ?,
+        country = IFNULL(?, country), last_stats_date = ?
+    WHERE channel_id = ?
+"""
+
+VIDEO_UPSERT_SQL = """
+    INSERT INTO videos (channel_pk, video_id, title, url, view_count, is_downloaded, is_metadata_downloaded, video_type, upload_date, thumbnails, filepath, first_seen, last_seen, file_size)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(channel_pk, video_id) DO UPDATE SET
+        title=excluded.title, url=excluded.url, view_count=excluded.view_count, video_type=excluded.video_type,
+        upload_date=excluded.upload_date, thumbnails=excluded.thumbnails, filepath=excluded.filepath,
+        is_downloaded=excluded.is_downloaded, is_metadata_downloaded=excluded.is_metadata_downloaded,
+        file_size=excluded.file_size,
+        first_seen=IFNULL(videos.first_seen, excluded.first_seen), last_seen=excluded.last_seen
+"""
+
+# When more videos vanished from a full refresh than this share of the ones it listed, the candidates are left to
+# the background checker instead of being confirmed during the refresh
+MAX_VANISHED_RATIO = 1.0
+
+PLAYLIST_UPSERT_SQL = """
+    INSERT INTO playlists (channel_pk, playlist_id, title, url, last_updated)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(playlist_id) DO UPDATE SET
+        title=excluded.title, url=excluded.url, last_updated=excluded.last_updated
+"""
+
+PLAYLIST_ITEM_UPSERT_SQL = """
+    INSERT INTO playlist_items (playlist_pk, video_id, position, title, uploader, fetched_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(playlist_pk, video_id) DO UPDATE SET
+        position=excluded.position, title=excluded.title, uploader=excluded.uploader,
+        fetched_at=excluded.fetched_at
+"""
+
+
 def sanitize_filename(name):
     """Replaces characters that are invalid in Windows/Linux file paths."""
     return re.sub(r'[\\/*?:"<>|]', '_', name)
 
 
 class AddChannelService:
-    def __init__(self, ytdlp=None, settings=None):
+    def __init__(self, ytdlp=None, settings=None, youtube_api=None, liveness=None):
         self.ytdlp = ytdlp
         self.settings = settings
+        self.youtube_api = youtube_api or YouTubeApiClient(settings)
+        self.liveness = liveness
         self.metadata_folder = METADATA_DIR
         self.videos_folder = VIDEOS_DIR
+        self.description_history = DescriptionHistory("channel")
 
     @staticmethod
     def get_connection():
@@ -35,18 +101,28 @@ class AddChannelService:
             return [row["name"] for row in conn.execute("SELECT name FROM groups").fetchall()]
 
     def get_channels_by_group(self, group):
+        """Returns [{"id": channel_pk, "name": display name}, ...] for every channel in the group."""
         with self.get_connection() as conn:
-            return [row["name"] for row in
-                    conn.execute("SELECT name FROM channels WHERE group_name = ?", (group,)).fetchall()]
+            rows = conn.execute("""
+                SELECT c.id, c.name FROM channels c
+                JOIN groups g ON g.id = c.group_pk
+                WHERE g.name = ?
+                ORDER BY c.name COLLATE NOCASE
+            """, (group,)).fetchall()
+            return [dict(row) for row in rows]
 
-    def get_channel_details(self, name):
+    def get_channel_details(self, channel_pk):
         with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM channels WHERE name = ?", (name,)).fetchone()
+            row = conn.execute("""
+                SELECT c.*, g.name AS group_name FROM channels c
+                JOIN groups g ON g.id = c.group_pk
+                WHERE c.id = ?
+            """, (channel_pk,)).fetchone()
             return dict(row) if row else None
 
-    def get_videos_by_channel(self, name):
+    def get_videos_by_channel(self, channel_pk):
         with self.get_connection() as conn:
-            rows = conn.execute("SELECT * FROM videos WHERE channel_name = ?", (name,)).fetchall()
+            rows = conn.execute("SELECT * FROM videos WHERE channel_pk = ?", (channel_pk,)).fetchall()
             return [dict(row) for row in rows]
 
     def add_channel(self, group_name: str, url: str) -> str:
@@ -55,157 +131,401 @@ class AddChannelService:
             raise Exception(message)
         return message.replace("Successfully added ", "")
 
-    def delete_channel(self, channel_name: str):
+    def delete_channel(self, channel_pk: int):
         with self.get_connection() as conn:
             conn.execute("PRAGMA foreign_keys = ON;")
-            conn.execute("DELETE FROM channels WHERE name = ?", (channel_name,))
+            conn.execute("DELETE FROM channels WHERE id = ?", (channel_pk,))
             conn.commit()
 
-    def check_videos_online_status(self, videos, progress_callback=None):
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            total = len(videos)
-
-            for i, video in enumerate(videos):
-                video_url = video.get("url")
-                video_id = video.get("video_id")
-
-                if not video_url:
-                    if video_id:
-                        video_url = f"https://www.youtube.com/watch?v={video_id}"
-                    else:
-                        continue
-
-                oembed_url = f"https://www.youtube.com/oembed?url={video_url}&format=json"
-                is_lost = 0
-
-                try:
-                    req = urllib.request.Request(oembed_url, headers={'User-Agent': 'Mozilla/5.0'})
-                    urllib.request.urlopen(req)
-                except HTTPError as e:
-                    if e.code in [401, 404]:
-                        is_lost = 1
-                except URLError:  # Fixed broad exception
-                    pass
+    def refresh_channel_statistics(self, only_missing=False, progress_callback=None):
+        """
+        Refreshes follower, view and video counts for every channel in the library through the Data API,
+        50 channels per call, and writes the results back in a single transaction.
+        only_missing limits the refresh to channels that were never refreshed, e.g. right after a bulk import.
+        """
+        if not self.youtube_api.is_available():
+            return False, "Set a YouTube Data API key in Settings first."
 
-                cursor.execute("UPDATE videos SET is_lost_media = ? WHERE video_id = ?", (is_lost, video_id))
+        with self.get_connection() as conn:
+            where = "WHERE channel_id IS NOT NULL" + (" AND last_stats_date IS NULL" if only_missing else "")
+            channel_ids = [row[0] for row in conn.execute(f"SELECT channel_id FROM channels {where}").fetchall()]
+        if not channel_ids:
+            return True, "No channels to refresh."
 
+        now_str = datetime.now().isoformat()
+        updates = []
+        error = None
+        try:
+            for item in self.youtube_api.iter_channels(channel_ids, parts="snippet,statistics"):
+                stats = item.get("statistics", {})
+                followers = None if stats.get("hiddenSubscriberCount") else stats.get("subscriberCount")
+                updates.append((
+                    int(followers) if followers is not None else None,
+                    int(stats.get("viewCount", 0)), int(stats.get("videoCount", 0)),
+                    item.get("snippet", {}).get("country"), now_str, item.get("id")
+                ))
                 if progress_callback:
-                    progress_callback(i + 1, total)
+                    progress_callback(len(updates), len(channel_ids))
+        except YouTubeApiError as e:
+            # Keep whatever the batches before the failure returned
+            error = str(e)
+            print(f"API Error: {e}")
 
-            conn.commit()
+        with self.get_connection() as conn:
+            conn.executemany(CHANNEL_STATS_UPDATE_SQL, updates)
+
+        calls = math.ceil(len(channel_ids) / MAX_IDS_PER_CALL)
+        message = f"Updated {len(updates)} of {len(channel_ids)} channels ({calls} API calls)."
+        if error:
+            return bool(updates), f"{message}\nStopped early: {error}"
+        return True, message
+
+    def get_description_history(self, channel_pk):
+        """Every stored version of a channel's description, oldest first, with the text rebuilt."""
+        info = self.get_channel_details(channel_pk)
+        if not info:
+            return []
+        with self.get_connection() as conn:
+            versions = self.description_history.get_versions(conn, info.get("channel_id"))
+            for version in versions:
+                version["text"] = self.description_history.get_text(conn, info.get("channel_id"), version["version"])
+            return versions
+
+    @staticmethod
+    def _pace(pacer):
+        """Waits for the shared RequestPacer, if any, before one YouTube page request."""
+        if pacer is not None:
+            pacer.wait()
 
     # --- NEW: Channel Update, Description Versioning, and Playlist Archiving ---
-    def update_channel_metadata(self, channel_name: str):
-        old_info = self.get_channel_details(channel_name)
+    def update_channel_metadata(self, channel_pk: int, pacer=None, mark_lost=True):
+        """
+        Versions the channel description and refreshes its playlists. With a pacer every page request waits its
+        turn, not just the first. mark_lost=False (bulk syncs) reports an unreachable channel page as a failure
+        instead of flagging the channel as lost media, since a network blip would otherwise flag many at once.
+        """
+        old_info = self.get_channel_details(channel_pk)
         if not old_info:
             return False, "Channel not found in database."
 
         old_desc = old_info.get("description", "")
-        last_fetch_date = old_info.get("last_fetch_date") or "UnknownDate"
+        last_fetch_date = old_info.get("last_fetch_date")
         channel_url = old_info.get("url")
 
         if not channel_url:
             return False, "No URL found for this channel."
 
+        # One instance for the channel page, its playlists tab and every playlist. process=False only reads the
+        # first page of each, later pages are requested while entries are consumed.
         ydl_opts = {
             'quiet': True,
-            'extract_flat': True,
-            'playlistend': 1,
+            'extract_flat': 'in_playlist',
             'js_runtimes': {'deno': {'path': None}},
             'remote_components': ['ejs:github']
         }
 
-        # 1. Fetch Basic Channel Details
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore
-                raw_info = ydl.extract_info(channel_url, download=False)
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore
+            # 1. Fetch Basic Channel Details
+            try:
+                self._pace(pacer)
+                raw_info = ydl.extract_info(channel_url, download=False, process=False)
                 # Fixed type hinting warnings by casting to a standard dict
                 new_info: dict = dict(raw_info) if raw_info else {}
                 new_desc = new_info.get("description", "")
-        except DownloadError:
-            with self.get_connection() as conn:
-                conn.execute("UPDATE channels SET is_lost_media = 1 WHERE name = ?", (channel_name,))
-                conn.commit()
-            return False, "Channel is unreachable (Lost Media)."
-
-        cid = old_info.get("channel_id")
+            except DownloadError as e:
+                if not mark_lost:
+                    return False, f"Could not reach the channel page: {e}"
+                with self.get_connection() as conn:
+                    conn.execute("UPDATE channels SET is_lost_media = 1 WHERE id = ?", (channel_pk,))
+                    conn.commit()
+                return False, "Channel is unreachable (Lost Media)."
 
-        # Determine current handle from yt-dlp to ensure we use the latest one
-        new_handle = new_info.get("uploader_id", old_info.get("handle", ""))
-        safe_handle = new_handle if new_handle.startswith('@') else f"@{new_handle}"
+            cid = old_info.get("channel_id")
 
-        # Root folder is strictly the immutable Channel ID
-        desc_folder = self.metadata_folder / cid
+            # Determine current handle from yt-dlp to ensure we use the latest one
+            new_handle = new_info.get("uploader_id", old_info.get("handle", ""))
 
-        # 2. Version the Description if it changed
-        if old_desc and old_desc.strip() != new_desc.strip():
-            desc_folder.mkdir(parents=True, exist_ok=True)
-            safe_date = str(last_fetch_date).replace(":", "-").replace(".", "-")
+            now_str = datetime.now().isoformat()
 
-            # Use the new naming convention!
-            backup_path = desc_folder / f"({safe_handle}) description_{safe_date}.txt"
+            # 2. Fetch Playlists
+            playlists_url = channel_url + "/playlists" if not channel_url.endswith("/playlists") else channel_url
+            extracted_playlists = []
             try:
-                with open(backup_path, 'w', encoding='utf-8') as f:
-                    f.write(old_desc)
-            except OSError:
+                self._pace(pacer)
+                raw_pl = ydl.extract_info(playlists_url, download=False, process=False)
+                # Fixed type hinting warnings by casting to a standard dict
+                pl_info: dict = dict(raw_pl) if raw_pl else {}
+                extracted_playlists = [pl for pl in pl_info.get('entries') or [] if pl and pl.get('id')]
+            except DownloadError:  # Fixed broad exception
                 pass
 
+            # 3. Save to Database, versioning the description if it changed
+            with self.get_connection() as conn:
+                self.description_history.record_change(conn, cid, old_desc, new_desc, last_fetch_date, now_str)
+                conn.execute("""
+                    UPDATE channels 
+                    SET description = ?, last_fetch_date = ?, handle = ?, is_lost_media = 0
+                    WHERE id = ?
+                """, (new_desc, now_str, new_handle, channel_pk))
+
+                conn.executemany(PLAYLIST_UPSERT_SQL, [
+                    (channel_pk, pl['id'], pl.get('title'), pl.get('url'), now_str) for pl in extracted_playlists
+                ])
+                conn.commit()
+
+            # 4. Playlist contents, skipping playlists whose size and modification date are unchanged
+            refreshed = 0
+            for pl in extracted_playlists:
+                try:
+                    refreshed += self._sync_playlist_items(ydl, pl, pacer)
+                except DownloadError:
+                    continue
+
+        return True, (f"Channel metadata and {len(extracted_playlists)} playlists updated successfully "
+                      f"({refreshed} with new contents).")
+
+    def _sync_playlist_items(self, ydl, playlist_entry, pacer=None):
+        """
+        Stores the videos of one playlist in playlist_items. The playlist's first page is read to compare its
+        reported item count and modification date with the stored ones, and the remaining pages are only requested
+        when either changed. Returns 1 if the contents were re-read, 0 if the playlist was skipped.
+        """
+        with self.get_connection() as conn:
+            stored = conn.execute("""
+                SELECT id, item_count, modified_date, items_fetched_date FROM playlists WHERE playlist_id = ?
+            """, (playlist_entry['id'],)).fetchone()
+        if not stored:
+            return 0
+
+        def unchanged(item_count, modified_date):
+            # A reorder or swap keeps the size, so both have to be reported and match
+            return (stored["items_fetched_date"] is not None and item_count is not None
+                    and modified_date is not None and item_count == stored["item_count"]
+                    and modified_date == stored["modified_date"])
+
+        # The playlists tab sometimes reports both already, which saves opening the playlist at all
+        if unchanged(playlist_entry.get('playlist_count'), playlist_entry.get('modified_date')):
+            return 0
+
+        pl_url = playlist_entry.get('url') or f"https://www.youtube.com/playlist?list={playlist_entry['id']}"
+        self._pace(pacer)
+        raw_info = ydl.extract_info(pl_url, download=False, process=False)
+        info = dict(raw_info) if raw_info else {}
+        item_count = info.get('playlist_count')
+        modified_date = info.get('modified_date')
+        if unchanged(item_count, modified_date):
+            return 0
+
+        # Every page is read before the write transaction opens, so the lock is only held for the writes below
+        playlist_pk = stored["id"]
         now_str = datetime.now().isoformat()
+        rows = []
+        for entry in info.get('entries') or []:
+            if not entry or not entry.get('id'):
+                continue
+            rows.append((playlist_pk, entry['id'], len(rows) + 1, entry.get('title'),
+                         entry.get('channel') or entry.get('uploader'), now_str))
 
-        # 3. Fetch Playlists
-        playlists_url = channel_url + "/playlists" if not channel_url.endswith("/playlists") else channel_url
-        ydl_opts_pl = {
+        with self.get_connection() as conn:
+            conn.executemany(PLAYLIST_ITEM_UPSERT_SQL, rows)
+            # Videos that were taken out of the playlist since the last fetch
+            conn.execute("DELETE FROM playlist_items WHERE playlist_pk = ? AND fetched_at <> ?",
+                         (playlist_pk, now_str))
+            conn.execute("""
+                UPDATE playlists SET item_count = ?, modified_date = ?, items_fetched_date = ? WHERE id = ?
+            """, (item_count if item_count is not None else len(rows), modified_date, now_str, playlist_pk))
+            conn.commit()
+        return 1
+
+    @staticmethod
+    def _build_video_row(channel_pk, video_entry, index, safe_handle, channel_metadata_folder, channel_videos_folder,
+                         video_type=None, seen_at=None):
+        """Turns one flat playlist entry into a VIDEO_UPSERT_SQL parameter tuple. seen_at is the listing's time."""
+        seen_at = seen_at or datetime.now().isoformat()
+        url_chk = video_entry.get("url") or video_entry.get("webpage_url") or ""
+        video_id = video_entry.get("id") or f"unknown_{index}"
+
+        if not url_chk and video_id and not video_id.startswith("unknown"):
+            url_chk = f"https://www.youtube.com/watch?v={video_id}"
+
+        live_status = video_entry.get("live_status")
+
+        if live_status in ["is_live", "was_live", "is_upcoming"]:
+            v_type = "Lives"
+        elif video_type:
+            # The channel tab the entry was listed under
+            v_type = video_type
+        elif "/shorts/" in url_chk:
+            v_type = "Shorts"
+        else:
+            v_type = "Videos"
+
+        title = video_entry.get("title") or "Unknown Title"
+        view_count = video_entry.get("view_count") or 0
+        upload_date = video_entry.get("upload_date") or "00000000"
+        thumbnails_json = json.dumps(video_entry.get("thumbnails", []))
+
+        subfolder_name = f"({safe_handle}) {v_type}"
+
+        meta_subfolder = channel_metadata_folder / subfolder_name
+        video_subfolder = channel_videos_folder / subfolder_name
+
+        clean_title = sanitize_filename(title)
+        expected_filename_base = f"{upload_date}_{clean_title}"
+
+        filepath_base = video_subfolder / expected_filename_base
+
+        # One scandir per subfolder instead of six stat calls per video
+        media_path = DirectoryIndex.find(filepath_base, MEDIA_EXTENSIONS)
+        is_downloaded = 1 if media_path else 0
+        file_size = DirectoryIndex.size(media_path) if media_path else 0
+        is_metadata_downloaded = 1 if DirectoryIndex.exists(
+            meta_subfolder / f"{expected_filename_base}.info.json") else 0
+
+        return (channel_pk, video_id, title, url_chk, view_count, is_downloaded, is_metadata_downloaded, v_type,
+                upload_date, thumbnails_json, str(filepath_base), seen_at, seen_at, file_size)
+
+    def _find_vanished_videos(self, channel_pk, listing_started, listed_count):
+        """
+        Set difference between the channel's videos and the listing that just finished: every video that is not
+        already lost and wasn't seen since listing_started. Those are all scheduled for an immediate status check,
+        so the background checker confirms them at its own pace. Returns (vanished IDs, whether to confirm them
+        right away); a mass removal larger than the listing is left to the scheduler rather than checked in one go.
+        """
+        with self.get_connection() as conn:
+            vanished = [row[0] for row in conn.execute("""
+                SELECT video_id FROM videos
+                WHERE channel_pk = ? AND IFNULL(last_seen, '') < ? AND IFNULL(is_lost_media, 0) = 0
+            """, (channel_pk, listing_started)).fetchall()]
+            if not vanished:
+                return [], False
+            conn.execute("""
+                UPDATE videos SET next_status_check = ?
+                WHERE channel_pk = ? AND IFNULL(last_seen, '') < ? AND IFNULL(is_lost_media, 0) = 0
+            """, (listing_started, channel_pk, listing_started))
+            conn.commit()
+        return vanished, len(vanished) <= listed_count * MAX_VANISHED_RATIO
+
+    def quick_refresh_channel(self, channel_pk, stop_after=QUICK_REFRESH_STOP_AFTER, progress_callback=None):
+        """
+        Incremental refresh: reads each channel tab lazily, newest first, and stops once stop_after videos in a row
+        are already in the library. Only the new videos are inserted. fetch_channel_info is the full re-scan.
+        """
+        details = self.get_channel_details(channel_pk)
+        if not details:
+            return False, "Channel not found in database."
+
+        channel_id = details.get("channel_id")
+        if not channel_id:
+            return False, "Channel has no YouTube ID yet, run a full refresh first."
+        handle = details.get("handle") or ""
+        if handle and handle != "Unknown_Handle":
+            safe_handle = handle if handle.startswith('@') else f"@{handle}"
+        else:
+            safe_handle = f"@{channel_id}"
+
+        with self.get_connection() as conn:
+            known_ids = {row[0] for row in conn.execute(
+                "SELECT video_id FROM videos WHERE channel_pk = ?", (channel_pk,)).fetchall()}
+
+        channel_metadata_folder = self.metadata_folder / channel_id
+        channel_videos_folder = self.videos_folder / channel_id
+
+        ydl_opts = {
             'quiet': True,
-            'extract_flat': True,
+            'extract_flat': 'in_playlist',
             'js_runtimes': {'deno': {'path': None}},
             'remote_components': ['ejs:github']
         }
 
-        extracted_playlists = []
+        new_rows = []
+        seen_at = datetime.now().isoformat()
         try:
-            with yt_dlp.YoutubeDL(ydl_opts_pl) as ydl:  # type: ignore
-                raw_pl = ydl.extract_info(playlists_url, download=False)
-                # Fixed type hinting warnings by casting to a standard dict
-                pl_info: dict = dict(raw_pl) if raw_pl else {}
-                if 'entries' in pl_info:
-                    extracted_playlists = pl_info['entries']
-        except DownloadError:  # Fixed broad exception
-            pass
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore
+                for tab, v_type in QUICK_REFRESH_TABS:
+                    if progress_callback:
+                        progress_callback(f"Checking {v_type.lower()}...")
 
-        # 4. Save to Database
-        with self.get_connection() as conn:
-            conn.execute("""
-                UPDATE channels 
-                SET description = ?, last_fetch_date = ?, handle = ?, is_lost_media = 0
-                WHERE name = ?
-            """, (new_desc, now_str, new_handle, channel_name))
+                    subfolder_name = f"({safe_handle}) {v_type}"
+                    (channel_metadata_folder / subfolder_name).mkdir(parents=True, exist_ok=True)
+                    (channel_videos_folder / subfolder_name).mkdir(parents=True, exist_ok=True)
 
-            for pl in extracted_playlists:
-                if not pl: continue
-                pl_id = pl.get('id')
-                pl_title = pl.get('title')
-                pl_url = pl.get('url')
-
-                if not pl_id: continue
-
-                cursor = conn.cursor()
-                cursor.execute("SELECT id FROM playlists WHERE playlist_id = ?", (pl_id,))
-                if cursor.fetchone():
-                    cursor.execute("""
-                        UPDATE playlists SET title = ?, url = ?, last_updated = ? WHERE playlist_id = ?
-                    """, (pl_title, pl_url, now_str, pl_id))
-                else:
-                    cursor.execute("""
-                        INSERT INTO playlists (channel_name, playlist_id, title, url, last_updated)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (channel_name, pl_id, pl_title, pl_url, now_str))
+                    try:
+                        # process=False keeps "entries" a generator, so later pages are never requested
+                        tab_info = ydl.extract_info(f"https://www.youtube.com/channel/{channel_id}/{tab}",
+                                                    download=False, process=False) or {}
+                        known_streak = 0
+                        for i, entry in enumerate(tab_info.get("entries") or []):
+                            if not entry or not entry.get("id"):
+                                continue
+                            if entry["id"] in known_ids:
+                                known_streak += 1
+                                if known_streak >= stop_after:
+                                    break
+                                continue
+
+                            known_streak = 0
+                            known_ids.add(entry["id"])
+                            new_rows.append(self._build_video_row(
+                                channel_pk, entry, i, safe_handle, channel_metadata_folder, channel_videos_folder,
+                                video_type=v_type, seen_at=seen_at))
+                    except DownloadError as e:
+                        # Channels without a Shorts or Live tab end up here
+                        print(f"Quick refresh skipped {tab} for {channel_id}: {e}")
 
-            conn.commit()
+            with self.get_connection() as conn:
+                conn.executemany(VIDEO_UPSERT_SQL, new_rows)
+                conn.execute("UPDATE channels SET last_fetch_date = ? WHERE id = ?",
+                             (datetime.now().isoformat(), channel_pk))
 
-        return True, "Channel metadata and playlists updated successfully."
+        except DownloadError as e:
+            print(f"NETWORK/YTDLP ERROR: {e}")
+            return False, f"CONNECTION ERROR:\nCould not reach YouTube.\n\nDetails: {e}"
+        except sqlite3.Error as e:
+            print(f"DATABASE ERROR: {e}")
+            return False, f"DATABASE ERROR:\nFailed to save data to the library.\n\nDetails: {e}"
 
-    def fetch_channel_info(self, url, group, progress_callback=None):
+        return True, f"{len(new_rows)} new videos found."
+
+    @staticmethod
+    def _iter_video_entries(ydl, data, video_type=None, depth=0, pacer=None, failed_tabs=None):
+        """
+        Yields (entry, video_type) for every video under an unprocessed yt-dlp result. Channel tabs that come back
+        as unresolved URLs are extracted one at a time, also unprocessed, so only a page of entries is in memory.
+        A tab that fails to extract, or is nested too deep to follow, is skipped and its URL appended to
+        failed_tabs, so the listing is known to be incomplete.
+        """
+        for entry in data.get("entries") or []:
+            if not entry:
+                continue
+
+            if entry.get("_type") == "playlist":
+                yield from AddChannelService._iter_video_entries(ydl, entry, video_type, depth + 1, pacer,
+                                                                 failed_tabs)
+            elif entry.get("_type") in ("url", "url_transparent") and entry.get("ie_key") == "YoutubeTab":
+                tab_url = entry.get("url") or ""
+                if depth >= 2:
+                    # Not followed, so whatever that tab lists is missing from this listing
+                    print(f"Skipped nested tab {tab_url}")
+                    if failed_tabs is not None:
+                        failed_tabs.append(tab_url)
+                    continue
+                tab_type = next((v_type for tab, v_type in QUICK_REFRESH_TABS if tab_url.rstrip("/").endswith(tab)),
+                                video_type)
+                AddChannelService._pace(pacer)
+                try:
+                    tab_info = ydl.extract_info(tab_url, download=False, process=False) or {}
+                except DownloadError as e:
+                    print(f"Skipped tab {tab_url}: {e}")
+                    if failed_tabs is not None:
+                        failed_tabs.append(tab_url)
+                    continue
+                yield from AddChannelService._iter_video_entries(ydl, tab_info, tab_type, depth + 1, pacer,
+                                                                 failed_tabs)
+            elif entry.get("id") and entry.get("url"):
+                yield entry, video_type
+
+    def fetch_channel_info(self, url, group, progress_callback=None, use_api=True, pacer=None):
         url = url.strip()
 
         if not url.startswith("http"):
@@ -215,7 +535,6 @@ class AddChannelService:
         ydl_opts: dict[str, typing.Any] = {
             'quiet': True,
             'extract_flat': 'in_playlist',
-            'dump_single_json': True,
             'js_runtimes': {'deno': {'path': None}},
             'remote_components': ['ejs:github']
         }
@@ -225,11 +544,16 @@ class AddChannelService:
                 if progress_callback:
                     progress_callback("Fetching channel metadata via yt-dlp...")
 
-                raw_info = ydl.extract_info(url, download=False)
+                # process=False leaves "entries" as lazy generators that are consumed while rows are written
+                self._pace(pacer)
+                raw_info = ydl.extract_info(url, download=False, process=False)
                 info = dict(raw_info) if raw_info else {}
 
                 channel_name = info.get("uploader") or info.get("channel") or info.get("title") or "Unknown_Channel"
-                channel_id = info.get("channel_id") or "Unknown_ID"
+                channel_id = info.get("channel_id")
+                if not channel_id:
+                    # Channels are keyed on their ID; storing a placeholder would merge unrelated channels
+                    return False, f"Could not determine the channel ID of {url}."
                 handle = info.get("uploader_id") or "Unknown_Handle"
 
                 if handle and handle != "Unknown_Handle":
@@ -249,33 +573,32 @@ class AddChannelService:
 
                 now_str = datetime.now().isoformat()
 
-                api_key = self.settings.get_youtube_api_key() if self.settings else ""
                 api_data_full = None
+                video_count = None
 
-                if api_key and channel_id != "Unknown_ID":
+                if use_api and self.youtube_api.is_available():
                     if progress_callback: progress_callback("Pinging YouTube API for exact stats...")
-                    api_url = f"https://www.googleapis.com/youtube/v3/channels?part=snippet,statistics&id={channel_id}&key={api_key}"
                     try:
-                        req = urllib.request.Request(api_url)
-                        with urllib.request.urlopen(req) as response:
-                            api_data_full = json.loads(response.read().decode())
-
-                            if self.settings:
-                                self.settings.increment_quota_usage()
-
-                            if api_data_full.get("items"):
-                                item = api_data_full["items"][0]
-                                snippet = item.get("snippet", {})
-                                stats = item.get("statistics", {})
-
-                                pub_date = snippet.get("publishedAt", "")
-                                if pub_date:
-                                    creation_date = pub_date[:10].replace("-", "")
-
-                                country = snippet.get("country", country)
-                                channel_view_count = int(stats.get("viewCount", channel_view_count))
-                                description = snippet.get("description", description)
-                    except URLError as e:  # Fixed broad exception
+                        items = list(self.youtube_api.iter_channels([channel_id]))
+                        api_data_full = {"items": items}
+
+                        if items:
+                            item = items[0]
+                            snippet = item.get("snippet", {})
+                            stats = item.get("statistics", {})
+
+                            pub_date = snippet.get("publishedAt", "")
+                            if pub_date:
+                                creation_date = pub_date[:10].replace("-", "")
+
+                            country = snippet.get("country", country)
+                            channel_view_count = int(stats.get("viewCount", channel_view_count))
+                            description = snippet.get("description", description)
+                            if not stats.get("hiddenSubscriberCount") and "subscriberCount" in stats:
+                                follower_count = int(stats["subscriberCount"])
+                            if "videoCount" in stats:
+                                video_count = int(stats["videoCount"])
+                    except YouTubeApiError as e:
                         print(f"API Error: {e}")
 
                 info["channel_joined"] = creation_date
@@ -286,35 +609,34 @@ class AddChannelService:
                 with self.get_connection() as conn:
                     cursor = conn.cursor()
 
-                    cursor.execute("SELECT id FROM channels WHERE group_name = ? AND name = ?",
-                                   (group, channel_name))
-                    if cursor.fetchone():
-                        cursor.execute("""
-                            UPDATE channels SET handle=?, channel_id=?, url=?, title=?, follower_count=?, description=?, tags=?, thumbnails=?, creation_date=?, country=?, view_count=?, links=?, last_fetch_date=?
-                            WHERE group_name=? AND name=?
-                        """, (handle, channel_id, info.get("uploader_url") or url, info.get("title"),
-                              follower_count, description, tags_json, chan_thumbnails_json, creation_date, country,
-                              channel_view_count, links_json, now_str, group, channel_name))
-                    else:
-                        cursor.execute("""
-                            INSERT INTO channels (group_name, name, handle, channel_id, url, title, follower_count, description, tags, thumbnails, creation_date, country, view_count, links, is_lost_media, last_fetch_date)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)
-                        """, (group, channel_name, handle, channel_id, info.get("uploader_url") or url,
-                              info.get("title"), follower_count, description, tags_json, chan_thumbnails_json,
-                              creation_date, country, channel_view_count, links_json, now_str))
-
-                    def extract_all_videos(data):
-                        videos = []
-                        if not data: return videos
-                        if data.get("id") and data.get("_type") != "playlist" and data.get("url"):
-                            videos.append(data)
-                        if "entries" in data and data["entries"]:
-                            for entry_item in data["entries"]:
-                                videos.extend(extract_all_videos(entry_item))
-                        return videos
-
-                    all_videos = extract_all_videos(info)
-                    total = len(all_videos)
+                    group_row = cursor.execute("SELECT id FROM groups WHERE name = ?", (group,)).fetchone()
+                    if not group_row:
+                        return False, f"Group '{group}' does not exist."
+
+                    existing = cursor.execute("""
+                        SELECT c.description, c.last_fetch_date, g.id AS group_pk, g.name AS group_name
+                        FROM channels c JOIN groups g ON g.id = c.group_pk
+                        WHERE c.channel_id = ?
+                    """, (channel_id,)).fetchone()
+                    if existing:
+                        # The upsert never moves a channel between groups, so say where it already is
+                        if existing["group_pk"] != group_row["id"]:
+                            return False, f"{channel_name} is already in group '{existing['group_name']}'."
+                        # The upsert overwrites the description, so the one it replaces is versioned first
+                        self.description_history.record_change(conn, channel_id, existing["description"],
+                                                               description, existing["last_fetch_date"], now_str)
+
+                    # Single upsert keyed on the unique channel_id instead of SELECT + UPDATE/INSERT
+                    cursor.execute(CHANNEL_UPSERT_SQL, (
+                        group_row["id"], channel_name, handle, channel_id, info.get("uploader_url") or url,
+                        info.get("title"), follower_count, description, tags_json, chan_thumbnails_json,
+                        creation_date, country, channel_view_count, links_json, now_str, video_count,
+                        now_str if video_count is not None else None))
+                    channel_pk = cursor.execute("SELECT id FROM channels WHERE channel_id = ?",
+                                                (channel_id,)).fetchone()["id"]
+
+                    # The channel row is durable even if the video listing fails part way
+                    conn.commit()
 
                     # Use strictly channel_id for folder names to prevent breakage on handle changes!
                     channel_metadata_folder = self.metadata_folder / channel_id
@@ -342,102 +664,75 @@ class AddChannelService:
 
                     if banners: banner_url = banners[-1].get("url")
 
-                    req_headers = {'User-Agent': 'Mozilla/5.0'}
-
                     # --- NEW FILE NAMING CONVENTION ---
-                    if avatar_url:
-                        try:
-                            req = urllib.request.Request(avatar_url, headers=req_headers)
-                            with urllib.request.urlopen(req) as resp, open(
-                                    channel_metadata_folder / f"({safe_handle}) profile.jpg", 'wb') as f:
-                                f.write(resp.read())
-                        except (URLError, OSError):  # Fixed broad exception
-                            pass
-
-                    if banner_url:
-                        try:
-                            req = urllib.request.Request(banner_url, headers=req_headers)
-                            with urllib.request.urlopen(req) as resp, open(
-                                    channel_metadata_folder / f"({safe_handle}) banner.jpg", 'wb') as f:
-                                f.write(resp.read())
-                        except (URLError, OSError):  # Fixed broad exception
-                            pass
-
-                    for i, video_entry in enumerate(all_videos):
-                        if not video_entry: continue
-
-                        url_chk = video_entry.get("url") or video_entry.get("webpage_url") or ""
-                        video_id = video_entry.get("id") or f"unknown_{i}"
-
-                        if not url_chk and video_id and not video_id.startswith("unknown"):
-                            url_chk = f"https://www.youtube.com/watch?v={video_id}"
-
-                        live_status = video_entry.get("live_status")
-
-                        if live_status in ["is_live", "was_live", "is_upcoming"]:
-                            v_type = "Lives"
-                        elif "/shorts/" in url_chk:
-                            v_type = "Shorts"
-                        else:
-                            v_type = "Videos"
-
-                        title = video_entry.get("title") or "Unknown Title"
-                        view_count = video_entry.get("view_count") or 0
-                        upload_date = video_entry.get("upload_date") or "00000000"
-                        thumbnails_json = json.dumps(video_entry.get("thumbnails", []))
+                    # Both images are fetched at once and skipped when the server says they haven't changed
+                    HttpClient.download_many([
+                        (avatar_url, channel_metadata_folder / f"({safe_handle}) profile.jpg"),
+                        (banner_url, channel_metadata_folder / f"({safe_handle}) banner.jpg"),
+                    ])
+
+                    # Rows are committed chunk by chunk, so memory stays flat and an interrupted ingest keeps
+                    # everything written so far
+                    video_rows = []
+                    processed = 0
+                    listing_started = datetime.now().isoformat()
+                    failed_tabs = []
+                    video_entries = self._iter_video_entries(ydl, info, pacer=pacer, failed_tabs=failed_tabs)
+                    for i, (video_entry, v_type) in enumerate(video_entries):
+                        video_rows.append(self._build_video_row(
+                            channel_pk, video_entry, i, safe_handle, channel_metadata_folder, channel_videos_folder,
+                            video_type=v_type, seen_at=listing_started))
+
+                        if len(video_rows) >= UPSERT_CHUNK_SIZE:
+                            cursor.executemany(VIDEO_UPSERT_SQL, video_rows)
+                            conn.commit()
+                            processed += len(video_rows)
+                            video_rows = []
+                            if progress_callback:
+                                progress_callback(f"Saved {processed:,} videos...")
+
+                    if video_rows:
+                        cursor.executemany(VIDEO_UPSERT_SQL, video_rows)
+                        processed += len(video_rows)
 
-                        subfolder_name = f"({safe_handle}) {v_type}"
+                    conn.commit()
 
-                        meta_subfolder = channel_metadata_folder / subfolder_name
-                        video_subfolder = channel_videos_folder / subfolder_name
-
-                        clean_title = sanitize_filename(title)
-                        expected_filename_base = f"{upload_date}_{clean_title}"
-
-                        filepath_base = video_subfolder / expected_filename_base
-
-                        is_downloaded = 0
-                        for ext in ['.mp4', '.mkv', '.webm', '.avi', '.mov']:
-                            if (video_subfolder / f"{expected_filename_base}{ext}").exists():
-                                is_downloaded = 1
-                                break
-
-                        is_metadata_downloaded = 1 if (
-                                meta_subfolder / f"{expected_filename_base}.info.json").exists() else 0
-
-                        cursor.execute("SELECT id FROM videos WHERE video_id = ? AND channel_name = ?",
-                                       (video_id, channel_name))
-                        if cursor.fetchone():
-                            cursor.execute("""
-                                UPDATE videos SET title=?, url=?, view_count=?, video_type=?, upload_date=?, thumbnails=?, filepath=?, is_downloaded=?, is_metadata_downloaded=?
-                                WHERE video_id=? AND channel_name=?
-                            """, (title, url_chk, view_count, v_type, upload_date, thumbnails_json,
-                                  str(filepath_base),
-                                  is_downloaded, is_metadata_downloaded, video_id, channel_name))
-                        else:
-                            cursor.execute("""
-                                INSERT INTO videos (channel_name, video_id, title, url, view_count, is_downloaded, is_metadata_downloaded, video_type, upload_date, thumbnails, filepath)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """, (channel_name, video_id, title, url_chk, view_count, is_downloaded,
-                                  is_metadata_downloaded, v_type, upload_date, thumbnails_json, str(filepath_base)))
-
-                        if progress_callback and i % 10 == 0:
-                            progress_callback(f"Processing video {i}/{total}...")
+                    if progress_callback:
+                        progress_callback(f"Saved {processed:,} videos.")
 
-                    conn.commit()
+                # Whatever the complete listing no longer contains is only a candidate until confirmed. With a tab
+                # missing the listing isn't complete, so nothing can be said about what vanished
+                if failed_tabs:
+                    vanished, confirm_now = [], False
+                else:
+                    vanished, confirm_now = self._find_vanished_videos(channel_pk, listing_started, processed)
+                confirmed_lost = 0
+                if vanished and confirm_now and self.liveness:
+                    if progress_callback:
+                        progress_callback(f"{len(vanished):,} videos vanished from the listing, confirming...")
+                    confirmed_lost = self.liveness.check_videos_online_status(
+                        [{"video_id": video_id} for video_id in vanished])["lost"]
 
                 # --- NEW FILE NAMING CONVENTION FOR JSON ---
                 base_filename = f"({safe_handle})_{channel_id}"
 
-                ytdlp_save_path = channel_metadata_folder / f"{base_filename}.json"
-                with open(ytdlp_save_path, "w", encoding="utf-8") as f:
-                    json.dump(info, f, indent=4)
+                # Channel level metadata only; the entries were streamed into the database. Snapshots are
+                # gzipped and skipped when nothing changed since the last refresh
+                write_snapshot(channel_metadata_folder / base_filename,
+                               {k: v for k, v in info.items() if k != "entries"})
 
                 if api_data_full:
-                    api_save_path = channel_metadata_folder / f"{base_filename}_yt_data.json"
-                    with open(api_save_path, "w", encoding="utf-8") as f:
-                        json.dump(api_data_full, f, indent=4)
-
+                    write_snapshot(channel_metadata_folder / f"{base_filename}_yt_data", api_data_full)
+
+                if failed_tabs:
+                    return True, (f"Added {channel_name}, but {len(failed_tabs)} tab(s) could not be read; "
+                                  f"run the refresh again to complete the listing")
+                if vanished and not (confirm_now and self.liveness):
+                    return True, (f"Successfully added {channel_name}: {len(vanished):,} videos vanished from the "
+                                  f"listing and are queued for the background status check")
+                if vanished:
+                    return True, (f"Successfully added {channel_name}: {len(vanished):,} videos vanished from the "
+                                  f"listing, {confirmed_lost:,} confirmed lost")
                 return True, f"Successfully added {channel_name}"
 
             except DownloadError as net_err:
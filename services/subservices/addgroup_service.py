@@ -29,6 +29,5 @@ class AddGroupService:
     def delete_group(name: str):
         with DatabaseManager.get_connection() as conn:
             cursor = conn.cursor()
-            # Deleting a group also triggers cascades if foreign keys are ON
-            cursor.execute("DELETE FROM groups WHERE name = ?", (name,))
-            cursor.execute("DELETE FROM channels WHERE group_name = ?", (name,))
\ No newline at end of file
+            # Channels reference groups.id with ON DELETE CASCADE, so this removes the group's channels and videos too
+            cursor.execute("DELETE FROM groups WHERE name = ?", (name,))
\ No newline at end of file
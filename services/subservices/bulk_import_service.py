@@ -0,0 +1,228 @@
+import csv
+import re
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from services.db.db_manager import DatabaseManager
+from services.youtube_api import YouTubeApiError
+
+CHANNEL_ID_RE = re.compile(r"UC[0-9A-Za-z_-]{22}")
+
+DEFAULT_WORKERS = 4
+
+
+def normalize_channel_url(value):
+    """Turns a URL, @handle or bare channel ID into a channel URL. Returns None for anything else."""
+    value = value.strip().strip(",;")
+    if not value:
+        return None
+    if value.startswith("http"):
+        return value
+    if CHANNEL_ID_RE.fullmatch(value):
+        return f"https://www.youtube.com/channel/{value}"
+    if value.startswith("@") or re.fullmatch(r"[\w.-]+", value):
+        return f"https://www.youtube.com/@{value.lstrip('@')}"
+    return None
+
+
+class BulkImportService:
+    """
+    Imports many channels at once. Sources are parsed into (url, title) pairs and stored in the import_queue table;
+    run() then feeds the queue through AddChannelService on a small thread pool. Every request waits its turn on
+    the shared RequestPacer, and because the queue lives in the database an import that was cut short by closing
+    the app carries on from where it stopped the next time run() is called.
+    """
+
+    def __init__(self, add_channel_service, youtube_api, pacer):
+        self.add_channel_service = add_channel_service
+        self.youtube_api = youtube_api
+        self.pacer = pacer
+        self._run_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def get_connection():
+        return DatabaseManager.get_connection()
+
+    # --- Sources ---
+    @staticmethod
+    def parse_url_list(text):
+        entries = []
+        for line in text.splitlines():
+            for token in re.split(r"[\s,]+", line.split("#", 1)[0]):
+                url = normalize_channel_url(token)
+                if url:
+                    entries.append((url, None))
+        return entries
+
+    @staticmethod
+    def parse_opml(path):
+        """YouTube feed OPML exports list one outline per channel with its RSS feed in xmlUrl."""
+        entries = []
+        for outline in ET.parse(path).iter("outline"):
+            feed = outline.get("xmlUrl") or ""
+            match = CHANNEL_ID_RE.search(feed) or CHANNEL_ID_RE.search(outline.get("htmlUrl") or "")
+            if match:
+                entries.append((f"https://www.youtube.com/channel/{match.group(0)}",
+                                outline.get("title") or outline.get("text")))
+        return entries
+
+    @staticmethod
+    def parse_takeout_csv(path):
+        """Google Takeout subscriptions.csv: Channel Id, Channel Url, Channel Title (headers are localized)."""
+        entries = []
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.reader(f):
+                channel_ids = [cell.strip() for cell in row if CHANNEL_ID_RE.fullmatch(cell.strip())]
+                if not channel_ids:
+                    continue  # Header or blank line
+                title = row[2].strip() if len(row) > 2 else None
+                entries.append((f"https://www.youtube.com/channel/{channel_ids[0]}", title))
+        return entries
+
+    def parse_file(self, path):
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix in (".opml", ".xml"):
+            return self.parse_opml(path)
+        if suffix == ".csv":
+            return self.parse_takeout_csv(path)
+        return self.parse_url_list(path.read_text(encoding="utf-8", errors="replace"))
+
+    def fetch_account_subscriptions(self, channel_id):
+        """Public subscriptions of the My Account channel through the Data API (1 quota unit per 50 channels)."""
+        if not self.youtube_api.is_available():
+            raise ValueError("A YouTube Data API key is required to read the account's subscriptions.")
+        if not channel_id:
+            raise ValueError("Fetch the account's channel info in the My Account tab first.")
+
+        entries = []
+        try:
+            for item in self.youtube_api.iter_subscriptions(channel_id):
+                snippet = item.get("snippet", {})
+                sub_id = snippet.get("resourceId", {}).get("channelId")
+                if sub_id:
+                    entries.append((f"https://www.youtube.com/channel/{sub_id}", snippet.get("title")))
+        except YouTubeApiError as e:
+            raise ValueError(f"Could not read subscriptions (they must be public): {e}") from e
+        return entries
+
+    # --- Queue ---
+    def enqueue(self, group_name, entries, source):
+        """Adds entries to the queue for a group. Failed entries are retried, finished ones are left alone."""
+        now = datetime.now().isoformat()
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT id FROM groups WHERE name = ?", (group_name,)).fetchone()
+            if not row:
+                raise ValueError(f"Group '{group_name}' does not exist.")
+            before = conn.total_changes
+            conn.executemany("""
+                INSERT INTO import_queue (group_pk, url, title, source, status, created_at, updated_at)
+                VALUES (?, ?, ?, ?, 'pending', ?, ?)
+                ON CONFLICT(group_pk, url) DO UPDATE SET
+                    status = 'pending', message = NULL, updated_at = excluded.updated_at
+                WHERE import_queue.status = 'failed'
+            """, [(row["id"], url, title, source, now, now) for url, title in entries])
+            return conn.total_changes - before
+
+    def get_items(self):
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT q.id, q.url, q.title, q.status, q.message, q.attempts, g.name AS group_name
+                FROM import_queue q JOIN groups g ON g.id = q.group_pk
+                ORDER BY q.id
+            """).fetchall()
+            return [dict(row) for row in rows]
+
+    def get_counts(self):
+        with self.get_connection() as conn:
+            return {row["status"]: row["n"] for row in conn.execute(
+                "SELECT status, COUNT(*) AS n FROM import_queue GROUP BY status").fetchall()}
+
+    def has_pending(self):
+        counts = self.get_counts()
+        return bool(counts.get("pending") or counts.get("running"))
+
+    def clear_finished(self):
+        with self.get_connection() as conn:
+            conn.execute("DELETE FROM import_queue WHERE status = 'done'")
+
+    def _set_status(self, item_id, status, message=None):
+        with self.get_connection() as conn:
+            conn.execute("""
+                UPDATE import_queue SET status = ?, message = ?, updated_at = ?,
+                    attempts = attempts + (? = 'running')
+                WHERE id = ?
+            """, (status, message, datetime.now().isoformat(), status, item_id))
+
+    # --- Worker pool ---
+    def is_running(self):
+        return self._run_lock.locked()
+
+    def stop(self):
+        """Lets the channels already being imported finish and leaves the rest pending for the next run."""
+        self._stop_event.set()
+
+    def start(self, max_workers=DEFAULT_WORKERS, status_callback=None):
+        """Runs the queue on a background thread. Returns False if an import is already running."""
+        if not self._run_lock.acquire(blocking=False):
+            return False
+        threading.Thread(target=self._run_locked, args=(max_workers, status_callback), name="BulkImport",
+                         daemon=True).start()
+        return True
+
+    def run(self, max_workers=DEFAULT_WORKERS, status_callback=None):
+        """
+        Imports every pending entry. status_callback(item_id, status, message) is called from the worker threads.
+        Returns {status: count} once the queue is drained or stop() was called.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            return self.get_counts()
+        return self._run_locked(max_workers, status_callback)
+
+    def _run_locked(self, max_workers, status_callback):
+        stop_event = self._stop_event
+        stop_event.clear()
+        try:
+            with self.get_connection() as conn:
+                # Entries that were in flight when the app closed
+                conn.execute("UPDATE import_queue SET status = 'pending' WHERE status = 'running'")
+                items = [dict(row) for row in conn.execute("""
+                    SELECT q.id, q.url, g.name AS group_name FROM import_queue q
+                    JOIN groups g ON g.id = q.group_pk
+                    WHERE q.status = 'pending' ORDER BY q.id
+                """).fetchall()]
+
+            def import_one(item):
+                if stop_event.is_set():
+                    return
+
+                self._set_status(item["id"], "running")
+                if status_callback:
+                    status_callback(item["id"], "running", None)
+
+                try:
+                    # Statistics are fetched for all imported channels at once below. The pacer spaces out every
+                    # page request of the import, the channel tabs included.
+                    success, message = self.add_channel_service.fetch_channel_info(
+                        item["url"], item["group_name"], use_api=False, pacer=self.pacer)
+                except Exception as e:
+                    success, message = False, str(e)
+
+                status = "done" if success else "failed"
+                message = " ".join(message.split())[:300] if message else None
+                self._set_status(item["id"], status, message)
+                if status_callback:
+                    status_callback(item["id"], status, message)
+
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="BulkImport") as pool:
+                list(pool.map(import_one, items))
+
+            if self.youtube_api.is_available():
+                self.add_channel_service.refresh_channel_statistics(only_missing=True)
+
+            return self.get_counts()
+        finally:
+            self._run_lock.release()
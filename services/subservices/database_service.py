@@ -0,0 +1,123 @@
+import sqlite3
+from services.db.db_manager import DatabaseManager
+from services.db.query_profiler import QueryProfiler
+
+
+class DatabaseService:
+    """Backs the Settings -> Database tab: maintenance, query profiler, table sizes, pool and writer stats."""
+
+    def __init__(self, settings_service, db_writer, maintenance):
+        self.settings = settings_service
+        self.db_writer = db_writer
+        self.maintenance = maintenance
+        QueryProfiler.configure(self.settings.get_db_profiling(), self.settings.get_db_slow_query_ms())
+
+    @staticmethod
+    def get_connection():
+        return DatabaseManager.get_connection()
+
+    # --- Maintenance ---
+    def get_maintenance_status(self):
+        return self.maintenance.get_status()
+
+    def get_maintenance_settings(self):
+        return {
+            "wal_limit_mb": self.settings.get_db_wal_limit_mb(),
+            "backup_hours": self.settings.get_db_backup_hours(),
+            "backup_keep": self.settings.get_db_backup_keep(),
+        }
+
+    def set_maintenance_settings(self, wal_limit_mb, backup_hours, backup_keep):
+        self.settings.set_db_maintenance(wal_limit_mb, backup_hours, max(1, backup_keep))
+
+    def checkpoint(self):
+        return self.maintenance.checkpoint()
+
+    def optimize(self):
+        self.maintenance.optimize()
+        self.maintenance.analyze()
+
+    def vacuum(self):
+        self.maintenance.vacuum()
+
+    def backup(self, progress_callback=None):
+        return self.maintenance.backup(progress_callback)
+
+    # --- Profiler ---
+    def is_profiling(self):
+        return QueryProfiler.enabled
+
+    def get_slow_query_ms(self):
+        return QueryProfiler.threshold_ms
+
+    def set_profiling(self, enabled, threshold_ms):
+        QueryProfiler.configure(enabled, threshold_ms)
+        self.settings.set_db_profiling(bool(enabled))
+        self.settings.set_db_slow_query_ms(float(threshold_ms))
+
+    @staticmethod
+    def get_top_statements(limit=20):
+        return QueryProfiler.get_top_statements(limit)
+
+    @staticmethod
+    def get_slow_queries():
+        return QueryProfiler.get_slow_queries()
+
+    @staticmethod
+    def reset_profiler():
+        QueryProfiler.reset()
+
+    # --- Storage ---
+    def get_table_sizes(self):
+        """
+        Returns [{name, rows, estimated, bytes}] for every user table, largest first. Row counts come from the
+        sqlite_stat1 estimates that ANALYZE keeps (estimated=True); only tables it has no entry for are counted.
+        bytes is None without dbstat. Reads every page for the sizes, so call it off the UI thread.
+        """
+        with self.get_connection() as conn:
+            tables = [row["name"] for row in conn.execute("""
+                SELECT name FROM sqlite_master
+                WHERE type = 'table' AND name NOT LIKE 'sqlite_%' AND sql NOT LIKE 'CREATE VIRTUAL TABLE%'
+                ORDER BY name
+            """).fetchall()]
+
+            sizes = {}
+            try:
+                # Includes the table's indexes' pages under their own names, so sum them per table
+                for row in conn.execute("""
+                    SELECT IFNULL(m.tbl_name, s.name) AS tbl, SUM(s.pgsize) AS bytes
+                    FROM dbstat s LEFT JOIN sqlite_master m ON m.name = s.name
+                    GROUP BY tbl
+                """).fetchall():
+                    sizes[row["tbl"]] = row["bytes"]
+            except sqlite3.OperationalError:
+                # SQLite built without SQLITE_ENABLE_DBSTAT_VTAB
+                sizes = None
+
+            estimates = {}
+            try:
+                # The first number of each stat is the row count of the table (or of the index on it)
+                for row in conn.execute("SELECT tbl, stat FROM sqlite_stat1").fetchall():
+                    rows = int(row["stat"].split(" ", 1)[0])
+                    estimates[row["tbl"]] = max(rows, estimates.get(row["tbl"], 0))
+            except (sqlite3.OperationalError, ValueError):
+                # Never analyzed
+                estimates = {}
+
+            result = []
+            for name in tables:
+                estimated = name in estimates
+                rows = estimates[name] if estimated else conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+                result.append({"name": name, "rows": rows, "estimated": estimated,
+                               "bytes": sizes.get(name, 0) if sizes is not None else None})
+
+        result.sort(key=lambda t: (t["bytes"] or 0, t["rows"]), reverse=True)
+        return result
+
+    # --- Connections ---
+    @staticmethod
+    def get_pool_stats():
+        return DatabaseManager.get_pool_stats()
+
+    def get_writer_stats(self):
+        return self.db_writer.get_stats()
@@ -1,10 +1,9 @@
-import sqlite3
 import yt_dlp
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Any
 from config import METADATA_DIR
-from services.db.db_manager import DatabaseManager
+from services.db.db_writer import DatabaseWriter
 
 
 class DownloadLogger:
@@ -42,8 +41,20 @@ class DownloadLogger:
 
 
 class DlpDownloadService:
-    def __init__(self):
+    def __init__(self, db_writer=None):
         self.metadata_dir = METADATA_DIR
+        self.db_writer = db_writer or DatabaseWriter()
+
+    @staticmethod
+    def get_downloaded_size(info_dict):
+        """Size in bytes of the final (merged) media file yt-dlp wrote, or 0 if it can't be found."""
+        if not info_dict:
+            return 0
+        for download in info_dict.get('requested_downloads') or []:
+            filepath = download.get('filepath')
+            if filepath and Path(filepath).exists():
+                return Path(filepath).stat().st_size
+        return 0
 
     def fetch(self, videos: list, channel_name: str, params: dict, folder_name: str, handle: str, log_callback=None,
               status_callback=None, stop_event=None):
@@ -213,6 +224,7 @@ class DlpDownloadService:
                 with yt_dlp.YoutubeDL(ydl_opts) as ydl: # type: ignore
                     for video in video_group:
                         if stop_event and stop_event.is_set():
+                            self.db_writer.flush()
                             if log_callback: log_callback("Worker stopped by user.")
                             return False, "Stopped"
 
@@ -228,21 +240,16 @@ class DlpDownloadService:
 
                         try:
                             # Setting download=True pulls the actual heavy media file based on format!
-                            ydl.extract_info(url, download=True)
+                            info_dict = ydl.extract_info(url, download=True)
+                            file_size = self.get_downloaded_size(info_dict)
 
                             # --- Update Database to show MEDIA is downloaded ---
-                            with DatabaseManager.get_connection() as conn:
-                                fetch_date_iso = datetime.now().isoformat()
-                                try:
-                                    conn.execute("""
-                                        UPDATE videos SET is_downloaded = 1, last_download_date = ? WHERE video_id = ?
-                                    """, (fetch_date_iso, video_id))
-                                except sqlite3.OperationalError:  # Fixed: Catch specific database schema error
-                                    # Fallback if the last_download_date column doesn't exist in the database yet
-                                    conn.execute("""
-                                        UPDATE videos SET is_downloaded = 1 WHERE video_id = ?
-                                    """, (video_id,))
-                                conn.commit()
+                            # Queued on the shared writer thread instead of committing per video
+                            fetch_date_iso = datetime.now().isoformat()
+                            self.db_writer.submit("""
+                                UPDATE videos SET is_downloaded = 1, last_download_date = ?, file_size = ?
+                                WHERE video_id = ?
+                            """, (fetch_date_iso, file_size, video_id))
 
                             if log_callback:
                                 log_callback(f"SUCCESS: Completed {title} and cleaned up temp files.")
@@ -257,7 +264,13 @@ class DlpDownloadService:
                 if log_callback:
                     log_callback(f"Critical System Error processing folder {parent_dir}: {str(e)}")
 
+        # Make sure every queued update is on disk before reporting the channel as finished
+        self.db_writer.flush()
+
         if log_callback:
+            writer_stats = self.db_writer.get_stats()
+            log_callback(f"DB writer: {writer_stats['queue_depth']} queued, "
+                         f"avg commit {writer_stats['avg_commit_ms']:.1f} ms over {writer_stats['commits']} commits")
             log_callback(f"\n--- Finished {channel_name} ---")
 
         if status_callback:
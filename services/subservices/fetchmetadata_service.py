@@ -1,9 +1,13 @@
 import json
+import sqlite3
 import yt_dlp
 from pathlib import Path
 from datetime import datetime, timedelta
 from config import METADATA_DIR
 from services.db.db_manager import DatabaseManager
+from services.db.db_writer import DatabaseWriter
+from services.description_history import DescriptionHistory
+from services.youtube_api import MAX_IDS_PER_CALL, YouTubeApiError, parse_duration
 
 
 class FetchMetadataLogger:
@@ -41,8 +45,97 @@ class FetchMetadataLogger:
 
 
 class FetchMetadataService:
-    def __init__(self):
+    def __init__(self, db_writer=None, youtube_api=None):
         self.metadata_dir = METADATA_DIR
+        self.db_writer = db_writer or DatabaseWriter()
+        self.youtube_api = youtube_api
+        self.description_history = DescriptionHistory("video")
+
+    def _submit_update(self, sql, params, video_id, description):
+        """
+        Queues a video UPDATE on the writer, preceded by versioning the description it overwrites, so the history
+        rows land in the writer's batch commit instead of a transaction of their own.
+        """
+        def job(conn):
+            try:
+                row = conn.execute("SELECT description, last_metadata_fetch_date FROM videos WHERE video_id = ?",
+                                   (video_id,)).fetchone()
+                if row and row[0]:
+                    self.description_history.record_change(conn, video_id, row[0], description, row[1])
+            except sqlite3.Error as e:
+                # History is a nice-to-have, the metadata update itself must still go through
+                print(f"Could not version the description of {video_id}: {e}")
+            conn.execute(sql, params)
+
+        self.db_writer.submit_call(job)
+
+    def fetch_from_api(self, videos, log_callback=None, status_callback=None, stop_event=None, total=None):
+        """
+        Fast mode: fills duration, description, tags and counts from videos.list, 50 videos per quota unit, without
+        touching YouTube's web pages. No files are written, so is_metadata_downloaded (which tracks the info.json
+        on disk) is left alone and metadata_source records 'api' instead. Returns the IDs that were updated; the
+        rest still need yt-dlp.
+        """
+        by_id = {video['video_id']: video for video in videos if video.get('video_id')}
+        ids = list(by_id)
+        total = total or len(ids)
+        done = set()
+
+        for start in range(0, len(ids), MAX_IDS_PER_CALL):
+            if stop_event and stop_event.is_set():
+                break
+            batch = ids[start:start + MAX_IDS_PER_CALL]
+            try:
+                items = list(self.youtube_api.iter_videos(batch))
+            except YouTubeApiError as e:
+                if log_callback:
+                    log_callback(f"YouTube API unavailable ({e}), falling back to yt-dlp for the remaining videos.")
+                break
+
+            fetch_date_iso = datetime.now().isoformat()
+            rows = []
+            for item in items:
+                video = by_id.get(item.get('id'))
+                if not video:
+                    continue
+                snippet = item.get('snippet', {})
+                stats = item.get('statistics', {})
+                published = (snippet.get('publishedAt') or '')[:10].replace('-', '')
+                rows.append((
+                    parse_duration(item.get('contentDetails', {}).get('duration')),
+                    snippet.get('description') or '',
+                    json.dumps(snippet.get('tags') or []),
+                    int(stats.get('likeCount', 0)),
+                    int(stats.get('commentCount', 0)),
+                    published or video.get('upload_date', '00000000'),
+                    int(stats.get('viewCount', video.get('view_count') or 0)),
+                    fetch_date_iso,
+                    item['id'],
+                ))
+                done.add(item['id'])
+
+            for row in rows:
+                self._submit_update("""
+                    UPDATE videos
+                    SET duration = ?,
+                        description = ?,
+                        tags = ?,
+                        like_count = ?,
+                        comment_count = ?,
+                        upload_date = ?,
+                        view_count = ?,
+                        last_metadata_fetch_date = ?,
+                        metadata_source = CASE WHEN is_metadata_downloaded = 1 THEN 'file' ELSE 'api' END
+                    WHERE video_id = ?
+                """, row, row[-1], row[1])
+
+            if status_callback:
+                status_callback("Fetching metadata from the YouTube API...", len(done), total)
+
+        if log_callback:
+            log_callback(f"YouTube API: updated {len(done)} of {len(ids)} videos "
+                         f"({-(-len(ids) // MAX_IDS_PER_CALL)} quota units at most).")
+        return done
 
     def fetch(self, videos: list, channel_name: str, params: dict, folder_name: str, handle: str, log_callback=None,
               status_callback=None, stop_event=None):
@@ -91,9 +184,13 @@ class FetchMetadataService:
             threshold_date = now - timedelta(days=365)
         # ------------------------------------------------
 
+        # Fast mode is satisfied by metadata from either source, the full mode only by an info.json on disk
+        fast_mode = bool(params.get("fast_metadata") and self.youtube_api and self.youtube_api.is_available())
+
         groups = {}
         for video in videos:
-            is_downloaded = video.get('is_metadata_downloaded') == 1
+            is_downloaded = video.get('is_metadata_downloaded') == 1 or (
+                fast_mode and video.get('metadata_source') == 'api')
             last_fetch_str = video.get('last_metadata_fetch_date')
 
             # Determine whether to skip based on selected policy
@@ -140,6 +237,19 @@ class FetchMetadataService:
             if status_callback: status_callback("Finished", 0, 0)
             return True, "Success"
 
+        if fast_mode:
+            all_videos = [video for group in groups.values() for video in group]
+            api_done = self.fetch_from_api(all_videos, log_callback, status_callback, stop_event, total_videos)
+            processed_count = len(api_done)
+            # Only videos the API could not describe (removed, private, quota ran out) go through yt-dlp
+            groups = {parent_dir: [video for video in group if video.get('video_id') not in api_done]
+                      for parent_dir, group in groups.items()}
+            groups = {parent_dir: group for parent_dir, group in groups.items() if group}
+            if stop_event and stop_event.is_set():
+                self.db_writer.flush()
+                if log_callback: log_callback("Worker stopped by user.")
+                return False, "Stopped"
+
         for parent_dir, video_group in groups.items():
             ydl_opts['outtmpl'] = {'default': parent_dir + "/%(upload_date|00000000)s_%(title)s.%(ext)s"}
 
@@ -147,6 +257,7 @@ class FetchMetadataService:
                 with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                     for video in video_group:
                         if stop_event and stop_event.is_set():
+                            self.db_writer.flush()
                             if log_callback: log_callback("Worker stopped by user.")
                             return False, "Stopped"
 
@@ -186,25 +297,26 @@ class FetchMetadataService:
                                 view_count = info_dict.get('view_count') or video.get('view_count', 0)
                                 fetch_date_iso = datetime.now().isoformat()
 
-                                with DatabaseManager.get_connection() as conn:
-                                    # Removed `filepath = ?` so we don't accidentally overwrite the media path
-                                    # which properly points to the Videos directory!
-                                    conn.execute("""
-                                        UPDATE videos 
-                                        SET is_metadata_downloaded = 1, 
-                                            duration = ?, 
-                                            description = ?, 
-                                            tags = ?, 
-                                            like_count = ?, 
-                                            comment_count = ?, 
-                                            thumb_filepath = ?,
-                                            upload_date = ?,
-                                            view_count = ?,
-                                            last_metadata_fetch_date = ?
-                                        WHERE video_id = ?
-                                    """, (duration, description, tags_json, like_count, comment_count, thumb_path,
-                                          upload_date, view_count, fetch_date_iso, video_id))
-                                    conn.commit()
+                                # Removed `filepath = ?` so we don't accidentally overwrite the media path
+                                # which properly points to the Videos directory!
+                                # Queued on the shared writer thread instead of committing per video, together
+                                # with the versioning of the description it replaces
+                                self._submit_update("""
+                                    UPDATE videos 
+                                    SET is_metadata_downloaded = 1, 
+                                        metadata_source = 'file',
+                                        duration = ?, 
+                                        description = ?, 
+                                        tags = ?, 
+                                        like_count = ?, 
+                                        comment_count = ?, 
+                                        thumb_filepath = ?,
+                                        upload_date = ?,
+                                        view_count = ?,
+                                        last_metadata_fetch_date = ?
+                                    WHERE video_id = ?
+                                """, (duration, description, tags_json, like_count, comment_count, thumb_path,
+                                      upload_date, view_count, fetch_date_iso, video_id), video_id, description)
 
                                 if log_callback:
                                     log_callback(f"Updated database values for {title}")
@@ -219,7 +331,13 @@ class FetchMetadataService:
                 if log_callback:
                     log_callback(f"Critical System Error processing folder {parent_dir}: {str(e)}")
 
+        # Make sure every queued update is on disk before reporting the channel as finished
+        self.db_writer.flush()
+
         if log_callback:
+            writer_stats = self.db_writer.get_stats()
+            log_callback(f"DB writer: {writer_stats['queue_depth']} queued, "
+                         f"avg commit {writer_stats['avg_commit_ms']:.1f} ms over {writer_stats['commits']} commits")
             log_callback(f"\n--- Finished {channel_name} ---")
 
         if status_callback:
@@ -0,0 +1,241 @@
+import re
+import sqlite3
+from services.db.db_manager import DatabaseManager
+from services.description_history import DescriptionHistory
+
+# Columns a VideoCard needs. Leaves out descriptions, tags and thumbnail JSON.
+VIDEO_CARD_COLUMNS = (
+    "id", "channel_pk", "video_id", "title", "url", "view_count", "video_type", "upload_date",
+    "is_downloaded", "is_metadata_downloaded", "is_lost_media", "is_restricted", "filepath", "thumb_filepath"
+)
+
+# Columns the fetch and download workers read when deciding what to process
+WORKER_COLUMNS = (
+    "video_id", "title", "url", "view_count", "video_type", "upload_date", "filepath", "is_downloaded",
+    "is_metadata_downloaded", "metadata_source", "last_metadata_fetch_date", "last_download_date"
+)
+
+# Sort key -> SQL expression. NULLs are folded to a value so keyset comparisons never see them.
+SORT_EXPRESSIONS = {
+    "date": "IFNULL(v.upload_date, '')",
+    "views": "IFNULL(v.view_count, 0)",
+    "title": "IFNULL(v.title, '') COLLATE NOCASE",
+    "duration": "IFNULL(v.duration, 0)",
+    "likes": "IFNULL(v.like_count, 0)",
+    "id": "v.id",
+}
+
+# Columns that don't live on the videos table itself
+COLUMN_EXPRESSIONS = {
+    "channel_name": "(SELECT c.name FROM channels c WHERE c.id = v.channel_pk) AS channel_name",
+}
+
+DEFAULT_PAGE_SIZE = 200
+
+# bm25 weights for the (title, description, tags) columns of videos_fts
+SEARCH_RANK_WEIGHTS = (10.0, 1.0, 3.0)
+
+
+def build_fts_query(text):
+    """Turns free text into an FTS5 query where every word must match as a prefix."""
+    terms = re.findall(r"\w+", text)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+class LibraryService:
+    """Read side of the library: searches and listings used by the GUI and the workers."""
+
+    def __init__(self):
+        self._has_fts = None
+        self.description_history = DescriptionHistory("video")
+
+    @staticmethod
+    def get_connection():
+        return DatabaseManager.get_connection()
+
+    def has_full_text_search(self):
+        if self._has_fts is None:
+            with self.get_connection() as conn:
+                row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'videos_fts'").fetchone()
+                self._has_fts = row is not None
+        return self._has_fts
+
+    @staticmethod
+    def _status_filters(channel_pk=None, video_type=None, downloaded=None, lost=None, metadata_downloaded=None):
+        clauses, params = [], []
+        if channel_pk is not None:
+            clauses.append("v.channel_pk = ?")
+            params.append(channel_pk)
+        if video_type is not None:
+            clauses.append("v.video_type = ?")
+            params.append(video_type)
+        if downloaded is not None:
+            clauses.append("v.is_downloaded = ?")
+            params.append(1 if downloaded else 0)
+        if metadata_downloaded is not None:
+            clauses.append("v.is_metadata_downloaded = ?")
+            params.append(1 if metadata_downloaded else 0)
+        if lost is not None:
+            clauses.append("v.is_lost_media = 1" if lost else "IFNULL(v.is_lost_media, 0) = 0")
+        return clauses, params
+
+    def query_videos(self, columns=VIDEO_CARD_COLUMNS, sort="date", descending=True, cursor=None,
+                     limit=DEFAULT_PAGE_SIZE, **filters):
+        """
+        Returns one page of videos as (rows, next_cursor). Only the requested columns are read, filtering and
+        sorting happen in SQL, and pages are keyset based: pass the returned cursor back in to get the next page.
+        next_cursor is None once the last page has been returned.
+
+        Filters: channel_pk, video_type, downloaded, metadata_downloaded, lost.
+        Sort keys: date, views, title, duration, likes, id.
+        """
+        if sort not in SORT_EXPRESSIONS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        sort_expr = SORT_EXPRESSIONS[sort]
+
+        clauses, params = self._status_filters(**filters)
+        if cursor is not None:
+            # Row value comparison continues right after the last row of the previous page. SQLite can't seek an
+            # index with a row value on an expression, so the plain bound in front gives it the range to start at.
+            clauses.append(f"{sort_expr} {'<=' if descending else '>='} ?")
+            clauses.append(f"({sort_expr}, v.id) {'<' if descending else '>'} (?, ?)")
+            params.extend((cursor[0], *cursor))
+
+        direction = "DESC" if descending else "ASC"
+        projection = ", ".join(COLUMN_EXPRESSIONS.get(col, f"v.{col}") for col in columns)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"""
+            SELECT {projection}, {sort_expr} AS _sort_value, v.id AS _row_id FROM videos v
+            {where}
+            ORDER BY {sort_expr} {direction}, v.id {direction}
+            LIMIT ?
+        """
+        params.append(limit)
+
+        with self.get_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        page = []
+        for row in rows:
+            item = dict(row)
+            item.pop("_sort_value")
+            item.pop("_row_id")
+            page.append(item)
+
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_cursor = (last["_sort_value"], last["_row_id"])
+        return page, next_cursor
+
+    def iter_videos(self, columns=VIDEO_CARD_COLUMNS, sort="id", descending=False, page_size=1000, **filters):
+        """Yields every matching video, reading one keyset page at a time."""
+        cursor = None
+        while True:
+            page, cursor = self.query_videos(columns, sort, descending, cursor, page_size, **filters)
+            yield from page
+            if cursor is None:
+                return
+
+    def get_channel_videos(self, channel_pk, columns=WORKER_COLUMNS, **filters):
+        """Lightweight list of a channel's videos for the workers (no descriptions or thumbnail JSON)."""
+        return list(self.iter_videos(columns, channel_pk=channel_pk, **filters))
+
+    def get_channel_stats(self, channel_pk):
+        """Trigger-maintained summary for one channel (counts, duration, bytes on disk)."""
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT * FROM channel_stats WHERE channel_pk = ?", (channel_pk,)).fetchone()
+            return dict(row) if row else {}
+
+    def get_library_totals(self):
+        """Sums the per-channel summaries for the whole library."""
+        with self.get_connection() as conn:
+            row = conn.execute("""
+                SELECT COUNT(*) AS channel_count,
+                       TOTAL(video_count) AS video_count, TOTAL(short_count) AS short_count,
+                       TOTAL(live_count) AS live_count, TOTAL(downloaded_count) AS downloaded_count,
+                       TOTAL(metadata_count) AS metadata_count, TOTAL(lost_count) AS lost_count,
+                       TOTAL(total_duration) AS total_duration, TOTAL(total_bytes) AS total_bytes
+                FROM channel_stats
+            """).fetchone()
+            return {key: int(row[key]) for key in row.keys()}
+
+    def get_channel_playlists(self, channel_pk):
+        """A channel's playlists with their stored size, read from the database only."""
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT p.id, p.playlist_id, p.title, p.url, p.item_count, p.modified_date, p.items_fetched_date,
+                       (SELECT COUNT(*) FROM playlist_items i WHERE i.playlist_pk = p.id) AS stored_count
+                FROM playlists p WHERE p.channel_pk = ?
+                ORDER BY p.title COLLATE NOCASE
+            """, (channel_pk,)).fetchall()
+            return [dict(row) for row in rows]
+
+    def get_playlist_items(self, playlist_pk):
+        """
+        The videos of a playlist in playlist order. Items that are also in the library carry the local video's
+        columns (download state, file path, ...); videos from channels that aren't followed only have the title,
+        uploader and video_id.
+        """
+        columns = ", ".join(f"v.{col} AS {col}" for col in VIDEO_CARD_COLUMNS if col not in ("video_id", "title"))
+        with self.get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT i.position, i.video_id, IFNULL(v.title, i.title) AS title, i.uploader, {columns}
+                FROM playlist_items i
+                LEFT JOIN videos v ON v.id = (SELECT MIN(v2.id) FROM videos v2 WHERE v2.video_id = i.video_id)
+                WHERE i.playlist_pk = ?
+                ORDER BY i.position
+            """, (playlist_pk,)).fetchall()
+            return [dict(row) for row in rows]
+
+    def get_description_history(self, video_id):
+        """Every stored version of a video's description, oldest first, with the text rebuilt."""
+        with self.get_connection() as conn:
+            versions = self.description_history.get_versions(conn, video_id)
+            for version in versions:
+                version["text"] = self.description_history.get_text(conn, video_id, version["version"])
+            return versions
+
+    def search_videos(self, text, channel_pk=None, video_type=None, downloaded=None, lost=None, limit=500):
+        """
+        Ranked search across every video in the library. Each word is prefix matched against the title,
+        description and tags. The optional filters narrow the results to a channel, a video type, a download
+        state or an online state.
+        """
+        fts_query = build_fts_query(text)
+        if not fts_query:
+            return []
+
+        columns = ", ".join(f"v.{col}" for col in VIDEO_CARD_COLUMNS)
+        clauses, params = self._status_filters(channel_pk, video_type, downloaded, lost)
+
+        if self.has_full_text_search():
+            weights = ", ".join(str(w) for w in SEARCH_RANK_WEIGHTS)
+            sql = f"""
+                SELECT {columns} FROM videos_fts
+                JOIN videos v ON v.id = videos_fts.rowid
+                WHERE videos_fts MATCH ? {"".join(f" AND {c}" for c in clauses)}
+                ORDER BY bm25(videos_fts, {weights})
+                LIMIT ?
+            """
+            params = [fts_query] + params + [limit]
+        else:
+            # Slow path for SQLite builds without FTS5
+            word_clauses = []
+            for term in re.findall(r"\w+", text):
+                word_clauses.append("(v.title LIKE ? OR v.description LIKE ? OR v.tags LIKE ?)")
+                params.extend([f"%{term}%"] * 3)
+            sql = f"""
+                SELECT {columns} FROM videos v
+                WHERE {" AND ".join(clauses + word_clauses)}
+                ORDER BY v.upload_date DESC
+                LIMIT ?
+            """
+            params.append(limit)
+
+        try:
+            with self.get_connection() as conn:
+                return [dict(row) for row in conn.execute(sql, params).fetchall()]
+        except sqlite3.OperationalError as e:
+            print(f"Search failed for {text!r}: {e}")
+            return []
@@ -0,0 +1,88 @@
+import math
+import sqlite3
+import threading
+from datetime import datetime
+from services.db.db_manager import DatabaseManager
+from services.http_client import HttpError
+from services.youtube_api import MAX_IDS_PER_CALL
+
+# The background check wakes up this often and spends the matching share of the hourly budget
+CHECK_INTERVAL = 300
+BACKGROUND_WORKERS = 2
+
+
+class LivenessScheduler:
+    """
+    Keeps the online status of the whole library current in the background. Videos that were never checked come
+    first (newest uploads first), then those whose next_status_check has passed, oldest due date first.
+    LivenessService sets next_status_check with an exponential back-off, so videos that have been online for a
+    long time are rarely re-checked. At most liveness_hourly_budget requests are sent per hour; with a Data API
+    key one request covers 50 videos. Checks started by hand count against the same budget, so the background
+    check holds back after them, but they are never refused since the user asked for them.
+    """
+
+    def __init__(self, settings, liveness_service, check_interval=CHECK_INTERVAL):
+        self.settings = settings
+        self.liveness = liveness_service
+        self.check_interval = check_interval
+
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="LivenessScheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop_event.wait(self.check_interval):
+            try:
+                self.run_once()
+            except (sqlite3.Error, HttpError) as e:
+                print(f"LIVENESS SCHEDULER ERROR: {e}")
+
+    def _requests_left(self):
+        budget = self.settings.get_liveness_hourly_budget()
+        if budget <= 0:
+            return 0
+        spent = self.liveness.requests_sent_last_hour()
+        per_tick = math.ceil(budget * self.check_interval / 3600)
+        return max(0, min(per_tick, budget - spent))
+
+    @staticmethod
+    def get_due_videos(limit):
+        now = datetime.now().isoformat(timespec="seconds")
+        with DatabaseManager.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT video_id FROM videos WHERE next_status_check IS NULL
+                ORDER BY IFNULL(upload_date, '') DESC LIMIT ?
+            """, (limit,)).fetchall()
+            if len(rows) < limit:
+                rows += conn.execute("""
+                    SELECT video_id FROM videos WHERE next_status_check <= ?
+                    ORDER BY next_status_check LIMIT ?
+                """, (now, limit - len(rows))).fetchall()
+        return [{"video_id": row[0]} for row in rows]
+
+    def run_once(self):
+        """Checks the most urgent videos that fit in what is left of this hour's budget."""
+        requests_left = self._requests_left()
+        if not requests_left:
+            return None
+
+        per_request = MAX_IDS_PER_CALL if self.liveness.youtube_api and self.liveness.youtube_api.is_available() else 1
+        videos = self.get_due_videos(requests_left * per_request)
+        if not videos:
+            return None
+
+        # The cap keeps an API failure from turning a batch of 50 x requests_left videos into as many oEmbed calls
+        result = self.liveness.check_videos_online_status(videos, stop_event=self._stop_event,
+                                                          max_workers=BACKGROUND_WORKERS, max_requests=requests_left)
+        return result
@@ -0,0 +1,196 @@
+import threading
+import time
+import urllib.parse
+from collections import deque
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from services.http_client import HttpClient, HttpError
+from services.request_pacer import RequestPacer
+from services.youtube_api import MAX_IDS_PER_CALL, YouTubeApiError
+
+OEMBED_URL = "https://www.youtube.com/oembed"
+
+# Outcomes of a check. Restricted videos (private, or embedding disabled) still exist but can't be watched
+# from outside; they are stored as online with is_restricted set and re-checked on the normal back-off.
+ONLINE, LOST, RESTRICTED = "online", "lost", "restricted"
+
+# oEmbed answers 404 for removed videos and those of terminated channels, 401 when embedding is disabled and 403
+# for private videos
+LOST_STATUSES = (404,)
+RESTRICTED_STATUSES = (401, 403)
+
+# Pacing shared by every oEmbed check, whichever worker or run sends it
+OEMBED_MIN_INTERVAL = 0.05
+OEMBED_JITTER = 0.05
+RATE_LIMIT_BACKOFF = 30
+
+# videos.list only returns videos that can still be watched; these upload states count as gone as well
+GONE_UPLOAD_STATUSES = ("deleted", "failed", "rejected")
+
+# Re-check intervals. A video is checked again after half the time its status has been unchanged, so the gap
+# grows by half with every check, between these bounds. Recent uploads and videos whose status just changed
+# are always re-checked after the minimum.
+MIN_RECHECK_DAYS = 1
+MAX_RECHECK_DAYS = 90
+RECENT_UPLOAD_DAYS = 30
+UNKNOWN_RETRY_HOURS = 6
+
+# All right-hand sides see the row as it was before the update
+STATUS_UPDATE_SQL = """
+    UPDATE videos SET
+        is_lost_media = :lost,
+        is_restricted = :restricted,
+        last_status_check = :now,
+        status_stable_since = CASE WHEN is_lost_media IS :lost AND IFNULL(is_restricted, 0) = :restricted
+                                        AND status_stable_since IS NOT NULL
+                                   THEN status_stable_since ELSE :now END,
+        next_status_check = strftime('%Y-%m-%dT%H:%M:%S', :now, '+' || CAST(86400 * CASE
+            WHEN is_lost_media IS NOT :lost OR IFNULL(is_restricted, 0) != :restricted
+                 OR status_stable_since IS NULL THEN :min_days
+            WHEN IFNULL(upload_date, '') >= :recent_cutoff THEN :min_days
+            ELSE MIN(:max_days, MAX(:min_days, (julianday(:now) - julianday(status_stable_since)) / 2))
+        END AS INTEGER) || ' seconds')
+    WHERE video_id = :video_id
+"""
+
+
+class LivenessService:
+    """
+    Checks whether videos are still online. Requests go out on a small thread pool over the shared keep-alive
+    transport, each with its own timeout, and are spaced by one pacer for the whole app. Results are queued on the
+    DatabaseWriter as they come in, so they are committed in batches during the run and a cancelled run keeps
+    everything it already checked.
+
+    With a Data API key, videos are checked 50 at a time through videos.list instead (1 quota unit per call).
+    videos.list leaves out removed and private videos alike, so the IDs missing from its response go through
+    oEmbed as well, which tells the two apart. oEmbed is also used without a key, and for whatever is left once
+    the API fails or the daily quota runs out.
+    """
+
+    def __init__(self, settings, db_writer, youtube_api=None):
+        self.settings = settings
+        self.db_writer = db_writer
+        self.youtube_api = youtube_api
+        self.pacer = RequestPacer(OEMBED_MIN_INTERVAL, OEMBED_JITTER)
+        # (monotonic time, requests sent) per run over the last hour, background and manual runs alike
+        self._spent = deque()
+        self._spent_lock = threading.Lock()
+
+    def requests_sent_last_hour(self):
+        hour_ago = time.monotonic() - 3600
+        with self._spent_lock:
+            while self._spent and self._spent[0][0] < hour_ago:
+                self._spent.popleft()
+            return sum(n for _, n in self._spent)
+
+    def _check_api(self, video_ids, record, stop_event):
+        """
+        Checks video_ids in batches of 50 through videos.list. Returns the IDs it did not settle, those it did not
+        get to followed by the ones missing from the responses, and the number of calls made, failed ones included.
+        """
+        missing = []
+        calls = 0
+        for start in range(0, len(video_ids), MAX_IDS_PER_CALL):
+            if stop_event.is_set():
+                return video_ids[start:] + missing, calls
+            batch = video_ids[start:start + MAX_IDS_PER_CALL]
+            calls += 1
+            try:
+                items = list(self.youtube_api.iter_videos(batch, parts="status",
+                                                          fields="items(id,status(uploadStatus))"))
+            except YouTubeApiError as e:
+                print(f"Liveness check falling back to oEmbed: {e}")
+                return video_ids[start:] + missing, calls
+
+            statuses = {item.get("id"): item.get("status", {}).get("uploadStatus") for item in items}
+            for video_id in batch:
+                if video_id not in statuses:
+                    missing.append(video_id)
+                else:
+                    record(video_id, LOST if statuses[video_id] in GONE_UPLOAD_STATUSES else ONLINE)
+        return missing, calls
+
+    def _check_oembed(self, video_id, timeout):
+        """Returns ONLINE, LOST, RESTRICTED or None when the answer says nothing about the video."""
+        watch_url = f"https://www.youtube.com/watch?v={video_id}"
+        url = f"{OEMBED_URL}?{urllib.parse.urlencode({'url': watch_url, 'format': 'json'})}"
+        try:
+            status = HttpClient.request(url, timeout=timeout).status
+        except HttpError:
+            return None
+        if status == 429:
+            self.pacer.backoff(RATE_LIMIT_BACKOFF)
+            return None
+        if status in LOST_STATUSES:
+            return LOST
+        if status in RESTRICTED_STATUSES:
+            return RESTRICTED
+        return ONLINE if status == 200 else None
+
+    def check_videos_online_status(self, videos, progress_callback=None, stop_event=None, max_workers=None,
+                                   max_requests=None):
+        """
+        Updates is_lost_media and is_restricted for the given videos (dicts with a video_id).
+        progress_callback(done, total) is called on the thread that called this method, as results come in.
+        max_requests caps the HTTP requests sent, API calls included; videos past the cap are left unchecked. Returns {"online": n, "lost": n, "restricted": n, "unknown": n, "api": n,
+        "oembed": n, "requests": n, "cancelled": bool}, where api / oembed count the videos checked by each backend.
+        """
+        video_ids = list(dict.fromkeys(video["video_id"] for video in videos if video.get("video_id")))
+        total = len(video_ids)
+        max_workers = max_workers or self.settings.get_liveness_workers()
+        timeout = self.settings.get_liveness_timeout()
+        stop_event = stop_event or threading.Event()
+        counts = {"online": 0, "lost": 0, "restricted": 0, "unknown": 0, "api": 0, "oembed": 0, "requests": 0}
+        progress_lock = threading.Lock()
+        recent_cutoff = (datetime.now() - timedelta(days=RECENT_UPLOAD_DAYS)).strftime("%Y%m%d")
+
+        def record(video_id, status):
+            now = datetime.now().isoformat(timespec="seconds")
+            with progress_lock:
+                if status is None:
+                    counts["unknown"] += 1
+                    retry_at = (datetime.now() + timedelta(hours=UNKNOWN_RETRY_HOURS)).isoformat(timespec="seconds")
+                    self.db_writer.submit("UPDATE videos SET next_status_check = ? WHERE video_id = ?",
+                                          (retry_at, video_id))
+                else:
+                    counts[status] += 1
+                    self.db_writer.submit(STATUS_UPDATE_SQL, {
+                        "lost": int(status == LOST), "restricted": int(status == RESTRICTED), "now": now, "video_id": video_id, "recent_cutoff": recent_cutoff,
+                        "min_days": MIN_RECHECK_DAYS, "max_days": MAX_RECHECK_DAYS,
+                    })
+                done = counts["online"] + counts["lost"] + counts["restricted"] + counts["unknown"]
+            if progress_callback:
+                progress_callback(done, total)
+
+        remaining = video_ids
+        if self.youtube_api and self.youtube_api.is_available():
+            remaining, counts["requests"] = self._check_api(video_ids, record, stop_event)
+            counts["api"] = len(video_ids) - len(remaining)
+        if max_requests is not None:
+            # oEmbed costs one request per video, so a failed API run must not hand over the whole batch
+            remaining = remaining[:max(0, max_requests - counts["requests"])]
+
+        def check(video_id):
+            if not self.pacer.wait(stop_event):
+                return video_id, None, False
+            return video_id, self._check_oembed(video_id, timeout), True
+
+        if remaining and not stop_event.is_set():
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Liveness") as pool:
+                futures = [pool.submit(check, video_id) for video_id in remaining]
+                for future in as_completed(futures):
+                    video_id, status, sent = future.result()
+                    if sent:
+                        counts["oembed"] += 1
+                        counts["requests"] += 1
+                        record(video_id, status)
+                    if stop_event.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                        break
+
+        with self._spent_lock:
+            self._spent.append((time.monotonic(), counts["requests"]))
+        self.db_writer.flush()
+        counts["cancelled"] = stop_event.is_set()
+        return counts
@@ -0,0 +1,116 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from services.db.db_manager import DatabaseManager
+
+DEFAULT_WORKERS = 3
+
+
+class SyncService:
+    """
+    Runs AddChannelService.update_channel_metadata (description versioning and playlists) for the whole library or
+    one group. Channels are listed in the sync_queue table first and ticked off as they finish, so a sync that was
+    interrupted by closing the app resumes with the channels it had not reached. Every page request, not just the
+    first one per channel, is spaced out by the shared RequestPacer.
+    """
+
+    def __init__(self, add_channel_service, pacer):
+        self.add_channel_service = add_channel_service
+        self.pacer = pacer
+        self._run_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def get_connection():
+        return DatabaseManager.get_connection()
+
+    # --- Queue ---
+    def prepare(self, group_name=None):
+        """Starts a new sync of every channel, or of one group's channels. Returns the number of channels queued."""
+        with self.get_connection() as conn:
+            conn.execute("DELETE FROM sync_queue")
+            if group_name:
+                cursor = conn.execute("""
+                    INSERT INTO sync_queue (channel_pk, status)
+                    SELECT c.id, 'pending' FROM channels c JOIN groups g ON g.id = c.group_pk
+                    WHERE g.name = ?
+                """, (group_name,))
+            else:
+                cursor = conn.execute("INSERT INTO sync_queue (channel_pk, status) SELECT id, 'pending' FROM channels")
+            return cursor.rowcount
+
+    def get_counts(self):
+        with self.get_connection() as conn:
+            return {row["status"]: row["n"] for row in conn.execute(
+                "SELECT status, COUNT(*) AS n FROM sync_queue GROUP BY status").fetchall()}
+
+    def has_pending(self):
+        counts = self.get_counts()
+        return bool(counts.get("pending") or counts.get("running"))
+
+    def get_failures(self):
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT s.channel_pk, c.name, s.message, s.attempts FROM sync_queue s
+                JOIN channels c ON c.id = s.channel_pk
+                WHERE s.status = 'failed' ORDER BY c.name COLLATE NOCASE
+            """).fetchall()
+            return [dict(row) for row in rows]
+
+    def retry_failed(self):
+        with self.get_connection() as conn:
+            return conn.execute("UPDATE sync_queue SET status = 'pending', message = NULL "
+                                "WHERE status = 'failed'").rowcount
+
+    def _set_status(self, channel_pk, status, message=None):
+        with self.get_connection() as conn:
+            conn.execute("""
+                UPDATE sync_queue SET status = ?, message = ?, updated_at = ?,
+                    attempts = attempts + (? = 'running')
+                WHERE channel_pk = ?
+            """, (status, message, datetime.now().isoformat(), status, channel_pk))
+
+    # --- Worker pool ---
+    def is_running(self):
+        return self._run_lock.locked()
+
+    def stop(self):
+        """Lets the channels already syncing finish and leaves the rest pending for the next run."""
+        self._stop_event.set()
+
+    def start(self, max_workers=DEFAULT_WORKERS):
+        """Works through the pending channels on a background thread. Returns False if a sync is already running."""
+        if not self._run_lock.acquire(blocking=False):
+            return False
+        threading.Thread(target=self._run_locked, args=(max_workers,), name="ChannelSync", daemon=True).start()
+        return True
+
+    def _run_locked(self, max_workers):
+        stop_event = self._stop_event
+        stop_event.clear()
+        try:
+            with self.get_connection() as conn:
+                # Channels that were in flight when the app closed
+                conn.execute("UPDATE sync_queue SET status = 'pending' WHERE status = 'running'")
+                channel_pks = [row["channel_pk"] for row in conn.execute(
+                    "SELECT channel_pk FROM sync_queue WHERE status = 'pending' ORDER BY channel_pk").fetchall()]
+
+            def sync_one(channel_pk):
+                if stop_event.is_set():
+                    return
+                self._set_status(channel_pk, "running")
+                try:
+                    # Every page request of the channel is paced, and an unreachable channel is a failed sync
+                    # here rather than lost media
+                    success, message = self.add_channel_service.update_channel_metadata(
+                        channel_pk, pacer=self.pacer, mark_lost=False)
+                except Exception as e:
+                    success, message = False, str(e)
+                message = " ".join(message.split())[:300] if message else None
+                self._set_status(channel_pk, "done" if success else "failed", None if success else message)
+
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ChannelSync") as pool:
+                list(pool.map(sync_one, channel_pks))
+            return self.get_counts()
+        finally:
+            self._run_lock.release()
@@ -0,0 +1,102 @@
+import re
+import urllib.parse
+from services.http_client import HttpClient, HttpError
+
+API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+
+# channels.list and videos.list accept up to 50 comma separated IDs for the same 1 unit of quota
+MAX_IDS_PER_CALL = 50
+
+
+_DURATION_RE = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?")
+
+
+def parse_duration(value):
+    """ISO 8601 durations as used by contentDetails.duration ("PT1H2M3S") to seconds."""
+    match = _DURATION_RE.fullmatch(value or "")
+    if not match:
+        return 0
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+class YouTubeApiError(Exception):
+    def __init__(self, message, status=None, reason=None):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+
+class YouTubeApiClient:
+    """
+    Thin YouTube Data API v3 client. Every call is charged to the daily quota kept by SettingsService, and list
+    endpoints that take IDs are called with batches of up to 50 IDs so a library refresh costs one unit per 50
+    channels or videos instead of one per item.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+
+    def get_api_key(self):
+        return self.settings.get_youtube_api_key() if self.settings else ""
+
+    def is_available(self):
+        return bool(self.get_api_key())
+
+    def _get(self, endpoint, params, cost=1):
+        api_key = self.get_api_key()
+        if not api_key:
+            raise YouTubeApiError("No YouTube Data API key configured.")
+        if self.settings and self.settings.get_remaining_quota() < cost:
+            raise YouTubeApiError("Daily YouTube API quota used up.", reason="quotaExceeded")
+
+        url = f"{API_BASE_URL}/{endpoint}?{urllib.parse.urlencode({**params, 'key': api_key})}"
+        try:
+            response = HttpClient.request(url, timeout=30)
+        except HttpError as e:
+            raise YouTubeApiError(f"Could not reach the YouTube API: {e}") from e
+
+        # Failed requests are still charged
+        if self.settings:
+            self.settings.increment_quota_usage(cost)
+
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        if not response.ok:
+            error = data.get("error", {}) if isinstance(data, dict) else {}
+            reason = (error.get("errors") or [{}])[0].get("reason")
+            message = error.get("message") or f"HTTP {response.status}"
+            raise YouTubeApiError(message, status=response.status, reason=reason)
+        return data
+
+    def _list_by_ids(self, endpoint, ids, parts, fields=None):
+        ids = list(dict.fromkeys(i for i in ids if i))
+        for start in range(0, len(ids), MAX_IDS_PER_CALL):
+            params = {"part": parts, "id": ",".join(ids[start:start + MAX_IDS_PER_CALL]),
+                      "maxResults": MAX_IDS_PER_CALL}
+            if fields:
+                params["fields"] = fields
+            yield from self._get(endpoint, params).get("items", [])
+
+    def iter_channels(self, channel_ids, parts="snippet,statistics"):
+        """Yields channel resources, 50 IDs per call. Deleted or terminated channels are simply missing."""
+        yield from self._list_by_ids("channels", channel_ids, parts)
+
+    def iter_videos(self, video_ids, parts="snippet,contentDetails,statistics", fields=None):
+        """Yields video resources, 50 IDs per call. Removed and private videos are missing from the results."""
+        yield from self._list_by_ids("videos", video_ids, parts, fields)
+
+    def iter_subscriptions(self, channel_id):
+        """Public subscriptions of a channel, 50 per call."""
+        page_token = ""
+        while True:
+            params = {"part": "snippet", "channelId": channel_id, "maxResults": MAX_IDS_PER_CALL}
+            if page_token:
+                params["pageToken"] = page_token
+            data = self._get("subscriptions", params)
+            yield from data.get("items", [])
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                return
@@ -0,0 +1,34 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.db import database_initializer
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """A fully migrated database in a temporary folder."""
+    path = tmp_path / "database.db"
+    monkeypatch.setattr(database_initializer, "DB_PATH", path)
+    database_initializer.initialize_database()
+    return path
+
+
+@pytest.fixture
+def conn(db_path):
+    connection = sqlite3.connect(db_path)
+    connection.execute("PRAGMA foreign_keys = ON")
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def channel_pk(conn):
+    conn.execute("INSERT INTO groups(name) VALUES ('Group')")
+    cursor = conn.execute("INSERT INTO channels(group_pk, name, channel_id) VALUES (1, 'Channel', 'UC_channel')")
+    conn.commit()
+    return cursor.lastrowid
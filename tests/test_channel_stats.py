@@ -0,0 +1,51 @@
+import pytest
+
+VIDEO_UPSERT_SQL = """
+    INSERT INTO videos (channel_pk, video_id, title, video_type, is_downloaded, file_size)
+    VALUES (?, ?, ?, 'Videos', ?, ?)
+    ON CONFLICT(channel_pk, video_id) DO UPDATE SET
+        title=excluded.title, is_downloaded=excluded.is_downloaded, file_size=excluded.file_size
+"""
+
+
+def _stats(conn, channel_pk):
+    return conn.execute("""
+        SELECT video_count, downloaded_count, total_bytes FROM channel_stats WHERE channel_pk = ?
+    """, (channel_pk,)).fetchone()
+
+
+def test_upserting_an_existing_video_twice_keeps_the_counters(conn, channel_pk):
+    conn.execute(VIDEO_UPSERT_SQL, (channel_pk, "v1", "First", 0, 0))
+    conn.commit()
+    conn.execute(VIDEO_UPSERT_SQL, (channel_pk, "v1", "Second", 1, 100))
+    conn.execute(VIDEO_UPSERT_SQL, (channel_pk, "v1", "Third", 1, 250))
+    conn.commit()
+
+    assert conn.execute("SELECT title FROM videos WHERE video_id = 'v1'").fetchone() == ("Third",)
+    assert _stats(conn, channel_pk) == (1, 1, 250)
+
+
+def test_refresh_upsert_of_an_existing_channel(conn, channel_pk):
+    addchannel_service = pytest.importorskip("services.subservices.addchannel_service")
+    row = [channel_pk, "v1", "Title", "https://youtu.be/v1", 10, 0, 0, "Videos", "20240101", "[]", None,
+           "2024-01-01T00:00:00", "2024-01-01T00:00:00", 0]
+    conn.executemany(addchannel_service.VIDEO_UPSERT_SQL, [row])
+    conn.commit()
+
+    # A second full refresh lists the same video again
+    row[-2] = "2024-02-01T00:00:00"
+    conn.executemany(addchannel_service.VIDEO_UPSERT_SQL, [row])
+    conn.commit()
+
+    assert conn.execute("SELECT first_seen, last_seen FROM videos").fetchone() == (
+        "2024-01-01T00:00:00", "2024-02-01T00:00:00")
+    assert _stats(conn, channel_pk) == (1, 0, 0)
+
+
+def test_deleting_videos_updates_the_counters(conn, channel_pk):
+    conn.execute(VIDEO_UPSERT_SQL, (channel_pk, "v1", "One", 1, 100))
+    conn.execute(VIDEO_UPSERT_SQL, (channel_pk, "v2", "Two", 0, 0))
+    conn.execute("DELETE FROM videos WHERE video_id = 'v1'")
+    conn.commit()
+
+    assert _stats(conn, channel_pk) == (1, 0, 0)
@@ -0,0 +1,38 @@
+from services.db.db_writer import DatabaseWriter
+from services.description_history import DescriptionHistory
+
+
+def _insert_video(conn, channel_pk, video_id, description):
+    conn.execute("INSERT INTO videos(channel_pk, video_id, description) VALUES (?, ?, ?)",
+                 (channel_pk, video_id, description))
+    conn.commit()
+
+
+def test_jobs_commit_with_the_batch(conn, channel_pk):
+    _insert_video(conn, channel_pk, "v1", "Old text")
+    history = DescriptionHistory("video")
+
+    def job(job_conn):
+        old = job_conn.execute("SELECT description FROM videos WHERE video_id = 'v1'").fetchone()[0]
+        history.record_change(job_conn, "v1", old, "New text")
+        job_conn.execute("UPDATE videos SET description = 'New text' WHERE video_id = 'v1'")
+
+    DatabaseWriter()._commit(conn, [(job, None), ("UPDATE videos SET title = 'Title' WHERE video_id = 'v1'", ())])
+
+    assert conn.execute("SELECT title, description FROM videos").fetchone() == ("Title", "New text")
+    assert [history.get_text(conn, "v1", v["version"]) for v in history.get_versions(conn, "v1")] == [
+        "Old text", "New text"]
+
+
+def test_failing_job_is_rolled_back_on_its_own(conn, channel_pk):
+    _insert_video(conn, channel_pk, "v1", "Text")
+
+    def job(job_conn):
+        job_conn.execute("UPDATE videos SET title = 'Half done' WHERE video_id = 'v1'")
+        job_conn.execute("INSERT INTO no_such_table VALUES (1)")
+
+    writer = DatabaseWriter()
+    writer._commit(conn, [(job, None), ("UPDATE videos SET description = 'After' WHERE video_id = 'v1'", ())])
+
+    assert conn.execute("SELECT title, description FROM videos").fetchone() == (None, "After")
+    assert writer.get_stats()["errors"] == 1
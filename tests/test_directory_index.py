@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from services import directory_index
+from services.directory_index import DirectoryIndex
+
+
+@pytest.fixture(autouse=True)
+def empty_index():
+    DirectoryIndex.invalidate()
+    yield
+    DirectoryIndex.invalidate()
+
+
+def _age(path, seconds):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_lookups_and_sizes(tmp_path):
+    (tmp_path / "video.info.json").write_text("{}")
+    (tmp_path / "video.mp4").write_bytes(b"x" * 10)
+
+    assert DirectoryIndex.exists(tmp_path / "video.mp4")
+    assert DirectoryIndex.find(tmp_path / "video", (".MKV", ".MP4")) == tmp_path / "video.mp4"
+    assert DirectoryIndex.size(tmp_path / "video.mp4") == 10
+    assert DirectoryIndex.size(tmp_path / "missing.mp4") == 0
+
+
+def test_recently_changed_folder_is_rescanned(tmp_path):
+    (tmp_path / "a.mp4").write_text("")
+    assert not DirectoryIndex.exists(tmp_path / "b.mp4")
+
+    # Same second, so a coarse mtime would not have moved
+    (tmp_path / "b.mp4").write_text("")
+    assert DirectoryIndex.exists(tmp_path / "b.mp4")
+
+
+def test_settled_folder_is_trusted_until_its_mtime_changes(tmp_path):
+    (tmp_path / "a.mp4").write_text("")
+    _age(tmp_path, 60)
+    assert DirectoryIndex.exists(tmp_path / "a.mp4")
+
+    (tmp_path / "a.mp4").unlink()
+    _age(tmp_path, 60)
+    assert DirectoryIndex.exists(tmp_path / "a.mp4")  # Within REVALIDATE_SECONDS
+
+    DirectoryIndex.invalidate(tmp_path)
+    assert not DirectoryIndex.exists(tmp_path / "a.mp4")
+
+
+def test_least_recently_used_folders_are_dropped(tmp_path, monkeypatch):
+    monkeypatch.setattr(directory_index, "MAX_LISTINGS", 2)
+    folders = [tmp_path / name for name in ("one", "two", "three")]
+    for folder in folders:
+        folder.mkdir()
+        DirectoryIndex.get_stems(folder)
+    DirectoryIndex.get_stems(folders[1])
+
+    assert list(DirectoryIndex._listings) == [os.fspath(folders[2]), os.fspath(folders[1])]
@@ -0,0 +1,26 @@
+import json
+
+from services import http_client
+from services.http_client import HttpClient
+
+
+def test_validator_saves_are_batched_until_flushed(tmp_path, monkeypatch):
+    cache_path = tmp_path / "http_cache.json"
+    monkeypatch.setattr(http_client, "HTTP_CACHE_PATH", cache_path)
+    monkeypatch.setattr(http_client, "VALIDATORS_SAVE_DELAY", 3600)
+    monkeypatch.setattr(HttpClient, "_validators", {})
+
+    for i in range(3):
+        with HttpClient._lock:
+            HttpClient._validators[f"https://example.com/{i}"] = {"etag": str(i), "last_modified": None}
+            HttpClient._schedule_save()
+    assert not cache_path.exists()
+
+    HttpClient.flush_validators()
+    assert len(json.loads(cache_path.read_text())) == 3
+    assert HttpClient._save_timer is None
+
+    # Nothing changed since, so nothing is written
+    cache_path.unlink()
+    HttpClient.flush_validators()
+    assert not cache_path.exists()
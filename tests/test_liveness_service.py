@@ -0,0 +1,121 @@
+import pytest
+
+from services.http_client import HttpResponse
+from services.subservices import liveness_service
+from services.subservices.liveness_service import LivenessService
+
+# oEmbed answer per video ID
+OEMBED_STATUSES = {"online": 200, "removed": 404, "embed_off": 401, "private": 403, "flaky": 500}
+
+
+class FakeSettings:
+    def get_liveness_workers(self):
+        return 2
+
+    def get_liveness_timeout(self):
+        return 5
+
+
+class FakeWriter:
+    def __init__(self):
+        self.updates = {}
+
+    def submit(self, sql, params=()):
+        if isinstance(params, dict):
+            self.updates[params["video_id"]] = (params["lost"], params["restricted"])
+        else:
+            self.updates[params[1]] = None
+
+    def flush(self, timeout=30):
+        return True
+
+
+class FakeApi:
+    """videos.list: answers for "online" only, the way removed and private videos are left out."""
+
+    def is_available(self):
+        return True
+
+    def iter_videos(self, video_ids, parts=None, fields=None):
+        for video_id in video_ids:
+            if video_id == "online":
+                yield {"id": video_id, "status": {"uploadStatus": "processed"}}
+
+
+@pytest.fixture
+def oembed(monkeypatch):
+    sent = []
+
+    def request(url, timeout=None, **_kwargs):
+        video_id = url.split("v%3D")[1].split("&")[0]
+        sent.append(video_id)
+        return HttpResponse(OEMBED_STATUSES[video_id], {}, b"", url)
+
+    monkeypatch.setattr(liveness_service.HttpClient, "request", staticmethod(request))
+    monkeypatch.setattr(liveness_service, "OEMBED_MIN_INTERVAL", 0)
+    monkeypatch.setattr(liveness_service, "OEMBED_JITTER", 0)
+    return sent
+
+
+def _check(youtube_api=None):
+    writer = FakeWriter()
+    service = LivenessService(FakeSettings(), writer, youtube_api)
+    result = service.check_videos_online_status([{"video_id": video_id} for video_id in OEMBED_STATUSES])
+    return result, writer.updates
+
+
+EXPECTED_UPDATES = {
+    "online": (0, 0),
+    "removed": (1, 0),
+    "embed_off": (0, 1),
+    "private": (0, 1),
+    "flaky": None,  # Unknown, only rescheduled
+}
+
+
+def test_oembed_status_mapping(oembed):
+    result, updates = _check()
+
+    assert updates == EXPECTED_UPDATES
+    assert (result["online"], result["lost"], result["restricted"], result["unknown"]) == (1, 1, 2, 1)
+
+
+def test_api_path_settles_missing_videos_the_same_way(oembed):
+    result, updates = _check(FakeApi())
+
+    assert updates == EXPECTED_UPDATES
+    assert sorted(oembed) == ["embed_off", "flaky", "private", "removed"]
+    assert (result["api"], result["oembed"], result["requests"]) == (1, 4, 5)
+
+
+def test_restricted_videos_back_off_like_online_ones(conn, channel_pk):
+    conn.execute("""
+        INSERT INTO videos(channel_pk, video_id, upload_date, is_lost_media, is_restricted, status_stable_since)
+        VALUES (?, 'v1', '20200101', 0, 1, '2024-01-01T00:00:00')
+    """, (channel_pk,))
+    params = {"lost": 0, "restricted": 1, "now": "2024-01-21T00:00:00", "video_id": "v1",
+              "recent_cutoff": "20231222", "min_days": 1, "max_days": 90}
+    conn.execute(liveness_service.STATUS_UPDATE_SQL, params)
+    assert conn.execute("SELECT status_stable_since, next_status_check FROM videos").fetchone() == (
+        "2024-01-01T00:00:00", "2024-01-31T00:00:00")
+
+    # Becoming public again is a change of status, re-checked after the minimum
+    conn.execute(liveness_service.STATUS_UPDATE_SQL, dict(params, restricted=0))
+    assert conn.execute("SELECT is_restricted, status_stable_since, next_status_check FROM videos").fetchone() == (
+        0, "2024-01-21T00:00:00", "2024-01-22T00:00:00")
+
+
+def test_manual_checks_count_against_the_hourly_budget(oembed):
+    from services.subservices.liveness_scheduler import LivenessScheduler
+
+    class BudgetSettings(FakeSettings):
+        def get_liveness_hourly_budget(self):
+            return 10
+
+    settings = BudgetSettings()
+    service = LivenessService(settings, FakeWriter())
+    scheduler = LivenessScheduler(settings, service, check_interval=3600)
+    assert scheduler._requests_left() == 10
+
+    service.check_videos_online_status([{"video_id": video_id} for video_id in OEMBED_STATUSES])
+    assert scheduler._requests_left() == 10 - len(OEMBED_STATUSES)
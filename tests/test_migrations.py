@@ -0,0 +1,79 @@
+import sqlite3
+
+import pytest
+
+from services.db import database_initializer
+from services.db.database_initializer import MIGRATIONS
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    """A database with the original, pre-migration schema and a few rows, as older builds left it."""
+    path = tmp_path / "database.db"
+    monkeypatch.setattr(database_initializer, "DB_PATH", path)
+    monkeypatch.setattr(database_initializer, "METADATA_DIR", tmp_path / "Metadata")
+    with monkeypatch.context() as patch:
+        patch.setattr(database_initializer, "run_migrations", lambda conn: False)
+        database_initializer.initialize_database()
+
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        INSERT INTO groups(name) VALUES ('Group');
+        INSERT INTO channels(group_name, name, channel_id) VALUES
+            ('Group', 'NoIdA', 'Unknown_ID'), ('Group', 'NoIdB', 'Unknown_ID'),
+            ('Group', 'Renamed', 'UC1'), ('Group', 'RenamedAgain', 'UC1');
+        INSERT INTO videos(channel_name, video_id, title, video_type, is_downloaded, duration) VALUES
+            ('NoIdA', 'a1', 'First', 'Videos', 1, 60), ('NoIdB', 'b1', 'Second', 'Shorts', 0, 30),
+            ('Renamed', 'c1', 'Third', 'Videos', 0, 10), ('RenamedAgain', 'c2', 'Fourth', 'Lives', 0, 20);
+    """)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _migrate(path):
+    database_initializer.initialize_database()
+    return sqlite3.connect(path)
+
+
+def test_legacy_database_reaches_the_latest_version(legacy_db):
+    conn = _migrate(legacy_db)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    assert conn.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+
+
+def test_channels_are_keyed_on_their_youtube_id(legacy_db):
+    conn = _migrate(legacy_db)
+    # Channels without an ID stay apart, the two names of UC1 become one channel
+    assert conn.execute("SELECT name, channel_id FROM channels ORDER BY id").fetchall() == [
+        ("NoIdA", None), ("NoIdB", None), ("RenamedAgain", "UC1")]
+    assert conn.execute("""
+        SELECT c.name, v.video_id FROM videos v JOIN channels c ON c.id = v.channel_pk ORDER BY v.video_id
+    """).fetchall() == [("NoIdA", "a1"), ("NoIdB", "b1"), ("RenamedAgain", "c1"), ("RenamedAgain", "c2")]
+
+
+def test_channel_stats_are_counted_from_existing_rows(legacy_db):
+    conn = _migrate(legacy_db)
+    assert conn.execute("""
+        SELECT c.name, s.video_count, s.short_count, s.live_count, s.downloaded_count, s.total_duration
+        FROM channel_stats s JOIN channels c ON c.id = s.channel_pk ORDER BY c.id
+    """).fetchall() == [("NoIdA", 1, 0, 0, 1, 60), ("NoIdB", 0, 1, 0, 0, 30), ("RenamedAgain", 1, 0, 1, 0, 30)]
+
+
+def test_full_text_index_covers_existing_rows(legacy_db):
+    conn = _migrate(legacy_db)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'videos_fts'").fetchone() is None:
+        pytest.skip("SQLite build without FTS5")
+    assert conn.execute("SELECT rowid FROM videos_fts WHERE videos_fts MATCH 'third'").fetchall() == [
+        conn.execute("SELECT id FROM videos WHERE video_id = 'c1'").fetchone()]
+
+
+def test_migrating_again_changes_nothing(legacy_db):
+    conn = _migrate(legacy_db)
+    schema = conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall()
+    conn.close()
+
+    conn = _migrate(legacy_db)
+    assert conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall() == schema
+